@@ -0,0 +1,61 @@
+"""
+Pages-per-second of each NewsScraper extraction backend on saved HTML pages.
+
+Usage:
+    python -m benchmarks.bench_extraction [--pages DIR] [--repeat N]
+
+Every backend is also checked against the reference BeautifulSoup output;
+a backend that differs on a page is reported as a mismatch.
+"""
+import argparse
+import glob
+import os
+import time
+
+from src.scrapers.extract import BACKENDS, available_backends
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_pages(directory: str) -> dict:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def bench_backend(extract, pages: dict, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in pages.values():
+            extract(content)
+    elapsed = time.perf_counter() - start
+    return repeat * len(pages) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default=FIXTURE_DIR, help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        raise SystemExit(f"No .html pages found in {args.pages}")
+
+    reference = {name: BACKENDS['bs4'](content) for name, content in pages.items()}
+    print(f"{len(pages)} pages, {args.repeat} rounds")
+    print(f"{'backend':<10} {'pages/s':>10} {'speedup':>8}  mismatches")
+
+    baseline = None
+    for backend in available_backends():
+        extract = BACKENDS[backend]
+        mismatches = [name for name, content in pages.items() if extract(content) != reference[name]]
+        rate = bench_backend(extract, pages, args.repeat)
+        baseline = baseline or rate
+        print(f"{backend:<10} {rate:>10.1f} {rate / baseline:>7.2f}x  {', '.join(mismatches) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
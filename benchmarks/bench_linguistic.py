@@ -0,0 +1,58 @@
+"""
+Throughput of scalar vs batch LinguisticValidator script scoring.
+
+Usage:
+    python -m benchmarks.bench_linguistic [--rows N]
+
+The batch results are checked against the scalar path before timing.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.processing.linguistic import LinguisticValidator
+
+SAMPLES = [
+    "খুব ভাল 👍", "অসমৰ মানুহে এনেকুৱা কথা নকৰে", "ৱাহ! কি সুন্দৰ গান",
+    "আমার সোনার বাংলা", "রাজ্যের খবর", "nice video bro", "Jai Aai Axom 🙏",
+    "ধন্যবাদ", "মুখ্যমন্ত্ৰীয়ে আজি ঘোষণা কৰিলে।", "😂😂😂", "", "১২৩ টকা",
+    "Assam ৰ খবৰ 2024", "বহুত ভাল লাগিল dada ❤️",
+]
+
+
+def make_texts(rows: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(SAMPLES, k=rng.randint(1, 4))) for _ in range(rows)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    texts = make_texts(args.rows)
+
+    start = time.perf_counter()
+    scalar = [LinguisticValidator.get_script_stats(t) for t in texts]
+    scalar_accept = [LinguisticValidator.is_assamese_script(t, threshold=0.4) for t in texts]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = LinguisticValidator.get_script_stats_batch(texts)
+    batch_accept = LinguisticValidator.is_assamese_script_batch(texts, threshold=0.4)
+    batch_time = time.perf_counter() - start
+
+    for key in ("indic_ratio", "has_assamese_unique", "has_bengali_unique"):
+        expected = np.array([s[key] for s in scalar])
+        assert np.array_equal(expected, batch[key]), f"batch {key} differs from scalar path"
+    assert np.array_equal(np.array(scalar_accept), batch_accept), "batch acceptance differs from scalar path"
+
+    print(f"{args.rows} rows (stats + acceptance), results identical")
+    print(f"scalar: {scalar_time:.2f}s  ({args.rows / scalar_time:,.0f} rows/s)")
+    print(f"batch:  {batch_time:.2f}s  ({args.rows / batch_time:,.0f} rows/s)  {scalar_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Sentence segmentation: the original split-and-reassemble loops vs src.processing.segmenter.
+
+Usage:
+    python -m benchmarks.bench_segmenter [--rows N]
+
+Splitting compares the original `combine` loop (regex.split keeping the
+delimiters, regex.match on every part, string +=) and the previous
+str.findall pass with segmenter.split_batch; counting compares the original
+`stats` loop (regex.split on Danda / '?') and the previous str.count pass
+with segmenter.count_batch. The engines follow different rules (see
+segmenter.py), so sentence totals are reported rather than asserted equal.
+"""
+import argparse
+import time
+
+import pandas as pd
+import regex
+
+from src.processing.segmenter import split_batch, count_batch
+from benchmarks.corpus import make_corpus
+
+SPLIT_PATTERN = r'([।?!|])'
+FINDALL_PATTERN = r'[^।?!|]*[।?!|]|[^।?!|]+'
+COUNT_PATTERN = r'[^।?]*[^।?\s][^।?]*'
+
+
+def loop_split(texts: list) -> list:
+    out = []
+    for doc in texts:
+        parts = regex.split(SPLIT_PATTERN, doc)
+        current_sent = ""
+        for part in parts:
+            if regex.match(SPLIT_PATTERN, part):
+                current_sent += part
+                out.append(current_sent.strip())
+                current_sent = ""
+            else:
+                current_sent += part
+        if current_sent.strip():
+            out.append(current_sent.strip())
+    return out
+
+
+def findall_split(texts: list) -> list:
+    sentences = pd.Series(texts).str.findall(FINDALL_PATTERN).explode().dropna().str.strip()
+    return sentences[sentences != ''].tolist()
+
+
+def loop_count(texts: list) -> int:
+    return sum(len([s for s in regex.split(r'[।?]', doc) if s.strip()]) for doc in texts)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    texts = make_corpus(args.rows)['text'].tolist()
+    print(f"{args.rows} documents")
+
+    print(f"\n{'split':<28} {'seconds':>8} {'docs/s':>12} {'sentences':>10} {'speedup':>8}")
+    runs = [("regex.split loop (original)", loop_split),
+            ("str.findall", findall_split),
+            ("segmenter.split_batch", lambda t: split_batch(t)[1])]
+    baseline = None
+    for name, fn in runs:
+        seconds, sentences = timed(fn, texts)
+        baseline = baseline or seconds
+        print(f"{name:<28} {seconds:8.2f} {args.rows / seconds:12,.0f} {len(sentences):10} {baseline / seconds:7.1f}x")
+
+    print(f"\n{'count':<28} {'seconds':>8} {'docs/s':>12} {'sentences':>10} {'speedup':>8}")
+    runs = [("regex.split loop (original)", loop_count),
+            ("str.count", lambda t: int(pd.Series(t).str.count(COUNT_PATTERN).sum())),
+            ("segmenter.count_batch", lambda t: int(count_batch(t).sum()))]
+    baseline = None
+    for name, fn in runs:
+        seconds, total = timed(fn, texts)
+        baseline = baseline or seconds
+        print(f"{name:<28} {seconds:8.2f} {args.rows / seconds:12,.0f} {total:10} {baseline / seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Random sentence access: parsing the combined CSV / Parquet vs memory-mapped shards.
+
+Usage:
+    python -m benchmarks.bench_shards [--rows N] [--lookups N] [--batch N]
+
+A sentence table like the output of `combine` is written as CSV, Parquet
+and a sharded corpus (src.utils.shards). For each, the time to get the
+first sentence from a cold start (open + load) is reported next to the cost
+of `--lookups` random single-sentence reads and of random batches of
+`--batch` sentences, as an annotation tool or a training DataLoader would
+issue them.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utils.file_io import read_table, write_table
+from src.utils.shards import ShardedCorpus, export_shards
+from benchmarks.corpus import make_corpus
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--shard_size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-shards-')
+    corpus = make_corpus(args.rows, seed=args.seed)
+    table = pd.DataFrame({'sentence_no_emoji': corpus['text'], 'source_type': corpus['source_type'],
+                          'source_url': corpus['source_url']})
+    csv_path = os.path.join(workdir, 'sentences.csv')
+    parquet_path = os.path.join(workdir, 'sentences.parquet')
+    shard_dir = os.path.join(workdir, 'shards')
+    write_table(table, csv_path)
+    write_table(table, parquet_path)
+    export_seconds, _ = timed(lambda: export_shards([parquet_path], shard_dir, shard_size=args.shard_size))
+    print(f"{args.rows} sentences; export-shards took {export_seconds:.2f}s")
+
+    rng = np.random.default_rng(args.seed)
+    singles = rng.integers(0, args.rows, args.lookups).tolist()
+    batches = [rng.integers(0, args.rows, args.batch) for _ in range(max(1, args.lookups // args.batch))]
+    expected = table['sentence_no_emoji'].tolist()
+
+    def loaded(path):
+        return lambda: read_table(path, columns=['sentence_no_emoji'])['sentence_no_emoji'].to_numpy()
+
+    print(f"\n{'format':<10} {'first sentence s':>17} {'lookup us':>10} {'batch us':>9} {'disk MB':>8}")
+    for name, path, opener in [('csv', csv_path, loaded(csv_path)),
+                               ('parquet', parquet_path, loaded(parquet_path)),
+                               ('shards', shard_dir, lambda: ShardedCorpus(shard_dir))]:
+        cold, data = timed(lambda: (lambda d: (d, d[singles[0]]))(opener()))
+        data = data[0]
+        if isinstance(data, ShardedCorpus):
+            single, got = timed(lambda: [data[i] for i in singles])
+            batch, _ = timed(lambda: [data.get_batch(b) for b in batches])
+        else:
+            single, got = timed(lambda: [data[i] for i in singles])
+            batch, _ = timed(lambda: [data[b].tolist() for b in batches])
+        assert got == [expected[i] for i in singles], f"{name} returned wrong sentences"
+        size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files) \
+            if os.path.isdir(path) else os.path.getsize(path)
+        print(f"{name:<10} {cold:17.3f} {1e6 * single / len(singles):10.2f} "
+              f"{1e6 * batch / len(batches):9.1f} {size / 2**20:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Start-up time of the run_pipeline CLI, and a guard against heavy top-level imports.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [--max_ms MS]
+
+Each command line runs `--runs` times in a fresh interpreter and the median
+wall time is reported next to a bare `python -c pass`. The check fails
+(exit code 1) when one of the heavy libraries below is imported just to
+print the help, or when a median exceeds `--max_ms`.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'run_pipeline.py')
+
+# Must not be loaded before a subcommand actually runs
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'requests', 'bs4', 'lxml', 'tqdm', 'regex',
+                 'youtube_comment_downloader', 'dateparser')
+
+COMMANDS = [
+    ['--help'],
+    ['stats', '--help'],
+    ['scrape', '--help'],
+    ['run', '--help'],
+]
+
+# Runs the CLI's --help in-process and reports which heavy modules got imported
+_PROBE = f"""
+import json, os, runpy, sys
+sys.argv = ['run_pipeline.py', '--help']
+sys.stdout = open(os.devnull, 'w')
+try:
+    runpy.run_path({SCRIPT!r}, run_name='__main__')
+except SystemExit:
+    pass
+sys.stdout = sys.__stdout__
+print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))
+"""
+
+
+def median_ms(argv: list, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max_ms", type=float, help="Fail if a command's median start-up exceeds this")
+    args = parser.parse_args()
+
+    loaded = json.loads(subprocess.run([sys.executable, '-c', _PROBE], cwd=ROOT, capture_output=True,
+                                       text=True, check=True).stdout.strip().splitlines()[-1])
+
+    interpreter = median_ms([sys.executable, '-c', 'pass'], args.runs)
+    print(f"{'command':<24} {'median ms':>10} {'over python':>12}")
+    print(f"{'python -c pass':<24} {interpreter:10.1f} {'':>12}")
+    slow = []
+    for command in COMMANDS:
+        ms = median_ms([sys.executable, SCRIPT] + command, args.runs)
+        print(f"{' '.join(command):<24} {ms:10.1f} {ms - interpreter:12.1f}")
+        if args.max_ms is not None and ms > args.max_ms:
+            slow.append(' '.join(command))
+
+    failed = False
+    if loaded:
+        print(f"Heavy modules imported by --help: {', '.join(loaded)}")
+        failed = True
+    if slow:
+        print(f"Slower than {args.max_ms:.0f} ms: {', '.join(slow)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK: no heavy module is imported at start-up")
+
+
+if __name__ == "__main__":
+    main()
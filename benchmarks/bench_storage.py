@@ -0,0 +1,90 @@
+"""
+Load time and disk size of the CSV and Parquet storage paths.
+
+Usage:
+    python -m benchmarks.bench_storage [--rows N] [--workdir DIR]
+
+A synthetic sentence-level table (the `combine` output layout) is written
+in both formats through src.utils.file_io, then read back whole, with only
+the text column, and streamed in chunks.
+
+Before timing, a chunked CSV whose `votes` column holds plain counts in
+the first chunks and text like "1.2K" later is streamed into Parquet; the
+check fails if the writer cannot take the type change or loses values.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+from src.utils.file_io import read_table, iter_table, write_table, TableWriter
+from benchmarks.bench_linguistic import make_texts
+
+
+def make_table(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    urls = [f"https://www.youtube.com/watch?v=video{i:05d}" for i in range(rows // 200 + 1)]
+    texts = make_texts(rows, seed)
+    return pd.DataFrame({
+        'sentence_original': texts,
+        'sentence_no_emoji': texts,
+        'source_type': [rng.choice(['youtube_comment', 'news', 'social_media']) for _ in range(rows)],
+        'source_url': [rng.choice(urls) for _ in range(rows)],
+    })
+
+
+def check_mixed_chunks(workdir: str):
+    votes = [str(i) for i in range(250)] + ['', '1.2K', '3.5'] + [str(i) for i in range(47)]
+    df = pd.DataFrame({'text': [f"row {i}" for i in range(len(votes))], 'votes': votes})
+    csv_path = os.path.join(workdir, 'mixed.csv')
+    parquet_path = os.path.join(workdir, 'mixed.parquet')
+    df.to_csv(csv_path, index=False)
+    with TableWriter(parquet_path) as writer:
+        for chunk in iter_table(csv_path, chunksize=100):
+            writer.write(chunk)
+    loaded = read_table(parquet_path)
+    assert loaded['votes'].fillna('').tolist() == votes, \
+        "mixed-type chunks changed the votes column"
+    assert loaded['text'].tolist() == df['text'].tolist()
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workdir", help="Where to write the files (default: a temp dir)")
+    args = parser.parse_args()
+
+    df = make_table(args.rows)
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench-storage-')
+    os.makedirs(workdir, exist_ok=True)
+    check_mixed_chunks(workdir)
+
+    print(f"{args.rows} rows, files in {workdir}")
+    print(f"{'format':8} {'size MB':>8} {'write s':>8} {'load s':>8} {'text only s':>12} {'stream s':>9}")
+    for ext in ('csv', 'parquet'):
+        path = os.path.join(workdir, f'sentences.{ext}')
+        write_time = timed(lambda: write_table(df, path), repeat=1)
+        loaded = read_table(path)
+        assert loaded['sentence_original'].fillna('').astype(str).tolist() == df['sentence_original'].tolist(), \
+            f"{ext} round trip changed the text column"
+        load_time = timed(lambda: read_table(path))
+        text_time = timed(lambda: read_table(path, columns=['sentence_no_emoji']))
+        stream_time = timed(lambda: sum(len(c) for c in iter_table(path, chunksize=50_000)))
+        size = os.path.getsize(path) / 2**20
+        print(f"{ext:8} {size:8.1f} {write_time:8.2f} {load_time:8.2f} {text_time:12.2f} {stream_time:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+News scraper politeness: fixed per-host delay vs the adaptive HostThrottle,
+against local stub servers (benchmarks.fixture_server).
+
+Usage:
+    python -m benchmarks.bench_throttle [--pages N] [--max_rate R] [--crawl_delay S]
+
+Two hosts are served: one enforces `--max_rate` requests per second and
+answers 429 + Retry-After above it; the other publishes a robots.txt with
+`--crawl_delay` and a disallowed /private/ section, which a quarter of its
+URLs point into. Each mode scrapes the same URLs:
+
+    fixed     the original behaviour: one delay for every host, no robots.txt,
+              no retries (a 429 loses the article)
+    adaptive  starts at the same delay, speeds up on successes, backs off on
+              429, honours Retry-After, Crawl-delay and Disallow
+
+The check fails (exit code 1) if the adaptive mode fetches a disallowed URL,
+requests the robots.txt host faster than its Crawl-delay, or loses articles.
+"""
+import argparse
+import sys
+import time
+
+from src.scrapers.news import NewsScraper
+from src.scrapers.throttle import HostThrottle
+from benchmarks.fixture_server import FixtureServer
+
+
+def run(mode: str, args) -> dict:
+    robots_txt = f"User-agent: *\nCrawl-delay: {args.crawl_delay}\nDisallow: /private/\n"
+    with FixtureServer(max_rate=args.max_rate) as limited, FixtureServer(robots_txt=robots_txt) as polite:
+        urls = limited.urls(args.pages)
+        polite_urls = polite.urls(args.pages)
+        private = set(polite_urls[::4])
+        urls += [url.replace('/article/', '/private/') if url in private else url for url in polite_urls]
+
+        if mode == 'fixed':
+            scraper = NewsScraper(retries=0, respect_robots=False)
+            scraper.throttle = HostThrottle(delay=args.delay, jitter=(0, 0))
+        else:
+            scraper = NewsScraper(retries=args.retries)
+            scraper.throttle = HostThrottle(delay=args.delay, jitter=(0, 0), min_delay=0.0)
+
+        start = time.perf_counter()
+        articles = sum(len(result) for _, result, _ in scraper.scrape_many(urls, max_workers=4))
+        seconds = time.perf_counter() - start
+
+        page_hits = sorted(hit.start for hit in polite.log if hit.path != '/robots.txt')
+        gaps = [b - a for a, b in zip(page_hits, page_hits[1:])]
+        return {
+            'mode': mode,
+            'seconds': seconds,
+            'articles': articles,
+            'expected': args.pages + args.pages - len(private),
+            'throttled': limited.status_counts[429],
+            'disallowed_hits': sum(1 for hit in polite.log if hit.path.startswith('/private/')),
+            'min_gap': min(gaps) if gaps else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40, help="Article URLs per host")
+    parser.add_argument("--max_rate", type=float, default=10.0, help="Requests/s accepted by the rate-limited host")
+    parser.add_argument("--crawl_delay", type=float, default=0.2, help="Crawl-delay of the robots.txt host")
+    parser.add_argument("--delay", type=float, default=0.5, help="Starting per-host delay of both modes")
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args()
+
+    results = [run(mode, args) for mode in ('fixed', 'adaptive')]
+    print(f"{results[0]['expected']} articles allowed by robots.txt")
+    print(f"{'mode':<9} {'seconds':>8} {'articles':>9} {'429s':>6} {'disallowed':>11} {'min gap s':>10}")
+    for r in results:
+        gap = f"{r['min_gap']:.3f}" if r['min_gap'] is not None else '-'
+        print(f"{r['mode']:<9} {r['seconds']:8.2f} {r['articles']:9} {r['throttled']:6} "
+              f"{r['disallowed_hits']:11} {gap:>10}")
+
+    adaptive = results[1]
+    failures = []
+    if adaptive['disallowed_hits']:
+        failures.append("fetched URLs disallowed by robots.txt")
+    if adaptive['min_gap'] is not None and adaptive['min_gap'] < 0.95 * args.crawl_delay:
+        failures.append(f"requested faster than Crawl-delay ({adaptive['min_gap']:.3f}s < {args.crawl_delay}s)")
+    if adaptive['articles'] < adaptive['expected']:
+        failures.append(f"lost {adaptive['expected'] - adaptive['articles']} articles")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK: robots.txt honoured and every article fetched")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Deterministic synthetic corpus of mixed Assamese / Bengali / English / emoji text.
+
+The same (rows, seed) always produces the same records, whatever chunk size
+they are read back in: records are generated in fixed blocks, each from its
+own RNG seeded with (seed, block number).
+
+Usage:
+    python -m benchmarks.corpus --rows N --output corpus.parquet [--seed S]
+"""
+import argparse
+import random
+
+import numpy as np
+import pandas as pd
+
+from src.utils.file_io import TableWriter
+
+# Records per generator block (the unit of determinism, not of I/O)
+BLOCK = 10_000
+
+ASSAMESE_WORDS = [
+    "অসমৰ", "মানুহে", "এনেকুৱা", "কথা", "নকৰে", "ৱাহ", "সুন্দৰ", "গান", "ধন্যবাদ",
+    "মুখ্যমন্ত্ৰীয়ে", "আজি", "ঘোষণা", "কৰিলে", "বহুত", "ভাল", "লাগিল", "আমাৰ", "ৰাজ্য",
+    "চৰকাৰ", "বৰষুণ", "হ'ল", "খবৰ", "গুৱাহাটী", "নৈ", "পানী", "বিহু", "উৎসৱ", "ল'ৰা",
+    "ছোৱালী", "শিক্ষা", "বিদ্যালয়", "কাম", "মই", "তুমি", "তেওঁ", "আমি", "কিয়", "কেনেকৈ",
+]
+BENGALI_WORDS = [
+    "আমার", "সোনার", "বাংলা", "রাজ্যের", "খবর", "সরকার", "আজকে", "অনেক", "ভালো",
+    "লাগলো", "কলকাতা", "নদী", "বৃষ্টি", "পরীক্ষা", "ছেলে", "মেয়ে", "তোমার", "কেমন",
+]
+ENGLISH_WORDS = [
+    "nice", "video", "bro", "Assam", "Jai", "Aai", "Axom", "news", "today", "great",
+    "song", "please", "share", "subscribe", "thanks", "very", "good", "dada", "love", "2024",
+]
+EMOJIS = ["👍", "🙏", "😂", "❤️", "🔥", "😍", "👏", "😢"]
+# Short comments repeated verbatim across the whole corpus, as on real channels
+VIRAL = ["খুব ভাল 👍", "ধন্যবাদ", "Jai Aai Axom 🙏", "😂😂😂", "বহুত ভাল লাগিল dada ❤️", "nice video bro"]
+NOISE = [
+    "https://youtu.be/abc123", "www.example.com/news", "contact me at someone@example.com",
+    "call 9876543210", "১২৩ টকা",
+]
+
+# Document kinds and their probabilities
+KINDS = ('assamese', 'bengali', 'english', 'mixed')
+KIND_WEIGHTS = (0.6, 0.12, 0.13, 0.15)
+SOURCES = ('youtube_comment', 'news_article')
+POOLS = {'assamese': ASSAMESE_WORDS, 'bengali': BENGALI_WORDS, 'english': ENGLISH_WORDS}
+MIXED_AS = ASSAMESE_WORDS + ENGLISH_WORDS
+MIXED_BN = BENGALI_WORDS + ENGLISH_WORDS
+
+
+def _sentence(rng, words: list, low: int, high: int, end: str) -> str:
+    return " ".join(rng.choices(words, k=rng.randint(low, high))) + end
+
+
+def _document(rng, kind: str, source: str) -> str:
+    # News articles are several long sentences; comments one or two short ones
+    sentences = rng.randint(3, 8) if source == 'news_article' else rng.randint(1, 2)
+    low, high = (8, 20) if source == 'news_article' else (2, 9)
+    parts = []
+    for _ in range(sentences):
+        if kind == 'mixed':
+            pool = MIXED_AS if rng.random() < 0.8 else MIXED_BN
+        else:
+            pool = POOLS[kind]
+        end = "." if kind == 'english' else ("?" if rng.random() < 0.1 else "।")
+        parts.append(_sentence(rng, pool, low, high, end))
+    text = " ".join(parts)
+    if rng.random() < 0.25:
+        text += " " + "".join(rng.choices(EMOJIS, k=rng.randint(1, 3)))
+    if rng.random() < 0.03:
+        text += " " + rng.choice(NOISE)
+    return text
+
+
+def generate_block(block: int, rows: int, seed: int = 0, dup_rate: float = 0.1) -> pd.DataFrame:
+    """
+    Records of one generator block.
+
+    Args:
+        block (int): Block number (selects the RNG stream and the record ids).
+        rows (int): Records in the block (BLOCK except for the last one).
+        seed (int): Corpus seed.
+        dup_rate (float): Share of records that repeat an earlier record or a viral comment.
+
+    Returns:
+        pd.DataFrame: text, source_type, source_url, timestamp.
+    """
+    vec = np.random.RandomState([seed, block])
+    sources = np.array(SOURCES)[(vec.rand(rows) < 0.2).astype(int)]
+    kinds = vec.choice(len(KINDS), size=rows, p=KIND_WEIGHTS)
+    dups = vec.rand(rows) < dup_rate
+    # Per-record draws go through random.Random, much cheaper than NumPy scalar calls
+    rng = random.Random(f"{seed}:{block}")
+
+    texts = []
+    for i in range(rows):
+        if dups[i]:
+            # Half repeat a record of this block, half a corpus-wide viral comment
+            if i and rng.random() < 0.5:
+                texts.append(texts[rng.randrange(i)])
+            else:
+                texts.append(rng.choice(VIRAL))
+        else:
+            texts.append(_document(rng, KINDS[kinds[i]], sources[i]))
+
+    ids = np.arange(block * BLOCK, block * BLOCK + rows)
+    urls = np.where(sources == 'news_article',
+                    [f"https://news.example.com/article/{i // 40}" for i in ids],
+                    [f"https://www.youtube.com/watch?v=video{i // 200:06d}" for i in ids])
+    timestamps = pd.Timestamp('2024-01-01') + pd.to_timedelta(ids * 37, unit='s')
+    return pd.DataFrame({
+        'text': texts,
+        'source_type': sources,
+        'source_url': urls,
+        'timestamp': timestamps.strftime('%Y-%m-%dT%H:%M:%SZ'),
+    })
+
+
+def iter_corpus(rows: int, seed: int = 0, dup_rate: float = 0.1):
+    """
+    Yields the corpus as DataFrame blocks of up to BLOCK records.
+    """
+    for block, start in enumerate(range(0, rows, BLOCK)):
+        yield generate_block(block, min(BLOCK, rows - start), seed=seed, dup_rate=dup_rate)
+
+
+def make_corpus(rows: int, seed: int = 0, dup_rate: float = 0.1) -> pd.DataFrame:
+    """
+    The whole corpus in memory (use write_corpus for large row counts).
+    """
+    return pd.concat(list(iter_corpus(rows, seed, dup_rate)), ignore_index=True)
+
+
+def write_corpus(path: str, rows: int, seed: int = 0, dup_rate: float = 0.1) -> int:
+    """
+    Streams the corpus to a CSV or Parquet file (format by extension).
+
+    Returns:
+        int: Number of records written.
+    """
+    with TableWriter(path) as writer:
+        for block in iter_corpus(rows, seed, dup_rate):
+            writer.write(block)
+    return writer.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--output", required=True, help="CSV or Parquet file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dup_rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    written = write_corpus(args.output, args.rows, seed=args.seed, dup_rate=args.dup_rate)
+    print(f"Wrote {written} records to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Local HTTP server replaying recorded article HTML, so NewsScraper can be
+benchmarked (and tested) without touching real news sites.
+
+Any path ending in the name of a page in the fixture directory serves that
+page (e.g. /article/17/article_clean.html), so a benchmark can request many
+distinct URLs from a handful of recordings. Each of `hosts` servers listens
+on its own port, i.e. counts as its own host for the scraper's per-host
+throttle.
+
+`routes` overrides single paths with a fixed (status, body, headers)
+response; robots.txt is a 404 (allow everything) unless routed. Every
+response is recorded in `log` as a Hit, and the highest number of requests
+a host had in flight at once is kept per port in `max_in_flight`.
+
+To exercise the scraper's adaptive throttle, a server can also publish a
+robots.txt (`robots_txt`) and enforce a rate limit (`max_rate` requests per
+second): requests arriving faster get 429 with a Retry-After header.
+
+Usage:
+    python -m benchmarks.fixture_server [--pages DIR] [--port N] [--latency S]
+                                        [--robots FILE] [--max_rate R]
+"""
+import argparse
+import itertools
+import math
+import threading
+import time
+from collections import Counter, namedtuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from benchmarks.bench_extraction import FIXTURE_DIR, load_pages
+
+# One served request: monotonic start/end times and the request headers
+Hit = namedtuple('Hit', 'port path status start end headers')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Set per server class in FixtureServer.start
+    owner = None
+
+    def do_GET(self):
+        owner = self.owner
+        port = self.server.server_address[1]
+        start = owner._enter(port)
+        path = self.path.split('?', 1)[0]
+        status, body, headers = owner._response(port, path)
+        if owner.latency and path != '/robots.txt' and status != 429:
+            time.sleep(owner.latency)
+        self.send_response(status)
+        headers = {'Content-Type': 'text/plain' if path == '/robots.txt' else 'text/html', **headers}
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        owner._leave(Hit(port, path, status, start, None, dict(self.headers)))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Serves the recorded pages on 127.0.0.1 from background threads.
+
+    Use as a context manager; `urls(count)` gives article URLs spread
+    round-robin over the pages and hosts. `pages` replaces the recordings
+    with a {name: body} dict, and `default_page` is served for any path
+    that names no page (otherwise a 404).
+    """
+
+    def __init__(self, pages_dir: str = FIXTURE_DIR, latency: float = 0.0, hosts: int = 1, port: int = 0,
+                 pages: dict = None, default_page: bytes = None, robots_txt: str = None, max_rate: float = None):
+        self.pages = load_pages(pages_dir) if pages is None else pages
+        if not self.pages and default_page is None:
+            raise ValueError(f"No .html pages found in {pages_dir}")
+        self.default_page = default_page
+        self.latency = latency
+        self.hosts = hosts
+        self.port = port
+        self.routes = {'/robots.txt': (404, b'', {}) if robots_txt is None
+                       else (200, robots_txt.encode('utf-8'), {})}
+        self.max_rate = max_rate
+        self.log = []
+        self.max_in_flight = {}
+        self._in_flight = {}
+        self._last_admitted = {}
+        self._lock = threading.Lock()
+        self._servers = []
+
+    def _response(self, port: int, path: str) -> tuple:
+        if path in self.routes:
+            return self.routes[path]
+        if self.max_rate:
+            retry_after = self._admit(port)
+            if retry_after:
+                return 429, b'', {'Retry-After': str(math.ceil(retry_after))}
+        body = self.pages.get(path.rsplit('/', 1)[-1], self.default_page)
+        if body is None:
+            return 404, b'', {}
+        return 200, body, {}
+
+    def _admit(self, port: int) -> float:
+        # Seconds the client should have waited, or 0 if the request is within the rate
+        with self._lock:
+            now = time.monotonic()
+            earliest = self._last_admitted.get(port, float('-inf')) + 1.0 / self.max_rate
+            if now < earliest:
+                return earliest - now
+            self._last_admitted[port] = now
+            return 0.0
+
+    def _enter(self, port: int) -> float:
+        with self._lock:
+            self._in_flight[port] = self._in_flight.get(port, 0) + 1
+            self.max_in_flight[port] = max(self.max_in_flight.get(port, 0), self._in_flight[port])
+            return time.monotonic()
+
+    def _leave(self, hit: Hit):
+        with self._lock:
+            self._in_flight[hit.port] -= 1
+            self.log.append(hit._replace(end=time.monotonic()))
+
+    def start(self):
+        handler = type('FixtureHandler', (_Handler,), {'owner': self})
+        for i in range(self.hosts):
+            server = ThreadingHTTPServer(('127.0.0.1', self.port + i if self.port else 0), handler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers.append(server)
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def status_counts(self) -> Counter:
+        return Counter(hit.status for hit in self.log)
+
+    @property
+    def ports(self) -> list:
+        return [server.server_address[1] for server in self._servers]
+
+    @property
+    def base_urls(self) -> list:
+        return [f"http://127.0.0.1:{port}" for port in self.ports]
+
+    def urls(self, count: int) -> list:
+        names = itertools.cycle(sorted(self.pages))
+        bases = itertools.cycle(self.base_urls)
+        return [f"{next(bases)}/article/{i}/{next(names)}" for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default=FIXTURE_DIR, help="Directory of recorded .html pages")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--hosts", type=int, default=1, help="Servers on consecutive ports")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--robots", help="File served as /robots.txt (default: 404)")
+    parser.add_argument("--max_rate", type=float, help="Requests per second per host; faster ones get 429")
+    args = parser.parse_args()
+
+    robots_txt = None
+    if args.robots:
+        with open(args.robots, encoding='utf-8') as f:
+            robots_txt = f.read()
+    with FixtureServer(args.pages, latency=args.latency, hosts=args.hosts, port=args.port,
+                       robots_txt=robots_txt, max_rate=args.max_rate) as server:
+        for url in server.urls(len(server.pages)):
+            print(url)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
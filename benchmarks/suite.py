@@ -0,0 +1,236 @@
+"""
+Benchmark suite for the pipeline hot paths, with machine-readable results.
+
+Usage:
+    python -m benchmarks.suite [--scales 10k 1m 10m] [--only NAME ...]
+                               [--output results.json] [--baseline baseline.json]
+
+For every scale a synthetic corpus (benchmarks.corpus) is written once to
+the work directory and reused by later runs, then each benchmark runs
+`--repeat` times and the best time is kept:
+
+    linguistic  LinguisticValidator.is_assamese_script_batch over the corpus texts
+    clean       clean_dataset (corpus -> cleaned file)
+    aggregate   aggregate_and_split (cleaned file -> sentences)
+    dedup       deduplicate_dataset (cleaned file, exact)
+    news        NewsScraper.scrape_many against benchmarks.fixture_server
+                (`--pages` URLs, independent of the scale)
+
+Results are written as JSON. With `--baseline`, every result is compared
+with the baseline entry of the same benchmark and scale, and the exit code
+is 1 if any of them got slower by more than `--tolerance`.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.processing.linguistic import LinguisticValidator
+from src.processing.cleaning import clean_dataset
+from src.processing.aggregation import aggregate_and_split
+from src.processing.deduplication import deduplicate_dataset
+from src.scrapers.news import NewsScraper
+from src.scrapers.throttle import HostThrottle
+from src.utils.file_io import iter_table
+from benchmarks.corpus import write_corpus
+from benchmarks.fixture_server import FixtureServer
+
+BENCHMARKS = ('linguistic', 'clean', 'aggregate', 'dedup', 'news')
+SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_scale(value: str) -> int:
+    """
+    '10k' -> 10000, '1m' -> 1000000, '2500' -> 2500.
+    """
+    value = value.strip().lower()
+    if value and value[-1] in SUFFIXES:
+        return int(float(value[:-1]) * SUFFIXES[value[-1]])
+    return int(value)
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'git': git_revision(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+class Workspace:
+    """
+    Corpus and intermediate files of one scale, created on first use.
+    """
+
+    def __init__(self, workdir: str, rows: int, seed: int, ext: str, workers: int):
+        self.rows = rows
+        self.workers = workers
+        self.prefix = os.path.join(workdir, f'{rows}-s{seed}')
+        self.corpus = f'{self.prefix}-corpus.{ext}'
+        self.cleaned = f'{self.prefix}-cleaned.{ext}'
+        self.ext = ext
+        if not os.path.exists(self.corpus):
+            print(f"Generating {rows} records -> {self.corpus}", flush=True)
+            tmp = f'{self.prefix}-corpus.tmp.{ext}'
+            write_corpus(tmp, rows, seed=seed)
+            os.replace(tmp, self.corpus)
+
+    def output(self, name: str) -> str:
+        return f'{self.prefix}-{name}.{self.ext}'
+
+    def ensure_cleaned(self):
+        if not os.path.exists(self.cleaned):
+            clean_dataset(self.corpus, self.cleaned, workers=self.workers)
+
+
+def bench_linguistic(ws: Workspace) -> callable:
+    def run():
+        for chunk in iter_table(ws.corpus, columns=['text'], chunksize=200_000):
+            LinguisticValidator.is_assamese_script_batch(chunk['text'].tolist(), threshold=0.4)
+    return run
+
+
+def bench_clean(ws: Workspace) -> callable:
+    return lambda: clean_dataset(ws.corpus, ws.cleaned, workers=ws.workers)
+
+
+def bench_aggregate(ws: Workspace) -> callable:
+    ws.ensure_cleaned()
+    return lambda: aggregate_and_split([ws.cleaned], ws.output('sentences'))
+
+
+def bench_dedup(ws: Workspace) -> callable:
+    ws.ensure_cleaned()
+    return lambda: deduplicate_dataset(ws.cleaned, ws.output('dedup'))
+
+
+def bench_news(urls: list, workers: int) -> callable:
+    def run():
+        scraper = NewsScraper(delay=0, max_per_host=workers)
+        # No politeness delay against the local fixtures
+        scraper.throttle = HostThrottle(delay=0, jitter=(0, 0), max_per_host=workers)
+        articles = sum(len(result) for _, result, _ in scraper.scrape_many(urls, max_workers=workers))
+        assert articles, "no article extracted from the fixture pages"
+    return run
+
+
+SCALED = {'linguistic': bench_linguistic, 'clean': bench_clean,
+          'aggregate': bench_aggregate, 'dedup': bench_dedup}
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    Annotates results with their baseline ratio.
+
+    Returns:
+        list: Results slower than (1 + tolerance) x baseline.
+    """
+    reference = {(r['benchmark'], r['rows']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        base = reference.get((result['benchmark'], result['rows']))
+        if base is None:
+            continue
+        result['baseline_seconds'] = base['seconds']
+        result['ratio'] = round(result['seconds'] / base['seconds'], 3) if base['seconds'] else None
+        if result['ratio'] is not None and result['ratio'] > 1 + tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def print_table(results: list):
+    print(f"{'benchmark':<11} {'rows':>10} {'seconds':>9} {'rows/s':>12} {'vs base':>8}")
+    for r in results:
+        ratio = f"{r['ratio']:.2f}x" if r.get('ratio') is not None else '-'
+        print(f"{r['benchmark']:<11} {r['rows']:>10} {r['seconds']:>9.3f} {r['throughput']:>12,.0f} {ratio:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs='+', default=['10k'], help="Corpus sizes, e.g. 10k 1m 10m")
+    parser.add_argument("--only", nargs='+', choices=BENCHMARKS, help="Benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best is kept")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--format", choices=['parquet', 'csv'], default='parquet', help="Corpus file format")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for clean (default: CPU count)")
+    parser.add_argument("--pages", type=int, default=200, help="Fixture article URLs for the news benchmark")
+    parser.add_argument("--fetch_workers", type=int, default=8, help="Concurrent fetches for the news benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixture server delay per response (s)")
+    parser.add_argument("--workdir", help="Corpus and output files, reused across runs (default: a temp dir)")
+    parser.add_argument("--output", help="Write the results JSON here")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown vs the baseline")
+    args = parser.parse_args()
+
+    selected = args.only or list(BENCHMARKS)
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench-suite-')
+    os.makedirs(workdir, exist_ok=True)
+
+    results = []
+    def record(name: str, rows: int, seconds: float):
+        results.append({'benchmark': name, 'rows': rows, 'seconds': round(seconds, 4),
+                        'throughput': round(rows / seconds, 1) if seconds else None})
+        print(f"  {name:<11} {rows:>10} rows  {seconds:8.3f}s", flush=True)
+
+    for rows in [parse_scale(s) for s in args.scales]:
+        scaled = [name for name in selected if name in SCALED]
+        if not scaled:
+            break
+        ws = Workspace(workdir, rows, args.seed, args.format, args.workers)
+        for name in scaled:
+            record(name, rows, best_of(SCALED[name](ws), args.repeat))
+
+    if 'news' in selected:
+        with FixtureServer(latency=args.latency, hosts=2) as server:
+            run = bench_news(server.urls(args.pages), args.fetch_workers)
+            record('news', args.pages, best_of(run, args.repeat))
+
+    report = {'environment': environment(), 'config': vars(args), 'results': results}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report['regressions'] = [f"{r['benchmark']}@{r['rows']}" for r in regressions]
+
+    print()
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    if regressions:
+        print(f"Slower than baseline by more than {args.tolerance:.0%}: {', '.join(report['regressions'])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,22 +8,24 @@ This script handles the command-line interface for:
 """
 
 import argparse
+import hashlib
+import json
 import logging
-import pandas as pd
 import os
-import time
-from tqdm import tqdm
+from functools import partial
 from urllib.parse import urlparse, parse_qs
 
-from src.scrapers.youtube import YoutubeScraper
-from src.scrapers.news import NewsScraper
-from src.processing.linguistic import LinguisticValidator
-from src.processing.text import clean_text
-from src.processing.deduplication import deduplicate_dataset
-from src.processing.aggregation import aggregate_and_split
-from src.utils.stats import generate_stats
+# Standard library only: the pipeline modules (and pandas, NumPy, requests,
+# BeautifulSoup, youtube-comment-downloader behind them) are imported inside
+# the functions that need them, so `--help` and short jobs start quickly.
+# bench_startup.py checks this.
+from src.utils import metrics
+
+# Comments checked against the seen index per lookup (about ten pages of comments)
+SEEN_CHECK_BATCH = 200
 
 def setup_logging():
+    os.makedirs("logs", exist_ok=True)
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -44,7 +46,33 @@ def extract_video_id(url):
         pass
     return None
 
-def run_scraping_job(input_csv, output_file):
+def default_manifest_path(output_file):
+    """Job manifest lives next to the output it describes."""
+    return os.path.splitext(output_file)[0] + '.manifest.db'
+
+def comment_item_id(comment):
+    """Stable per-comment key (the truncated cid alone is shared by a comment and its replies)."""
+    digest = hashlib.blake2b(comment.get('text', '').encode('utf-8'), digest_size=8).hexdigest()
+    return f"{comment.get('source_item_id', '')}:{digest}"
+
+def flush_callback(manifest, seen):
+    """Commits the manifest and the seen-text index together after each output flush."""
+    def commit():
+        manifest.commit()
+        if seen is not None:
+            seen.commit()
+    return commit
+
+def run_scraping_job(input_csv, output_file, workers=1, max_failures=2, batch_size=1000,
+                     manifest_path=None, seen_index=None, delta=False, max_comments=None, time_budget=None):
+    import pandas as pd
+    from tqdm import tqdm
+    from src.scrapers.youtube import harvest_videos, CAP_STOP_REASONS
+    from src.processing.linguistic import LinguisticValidator
+    from src.processing.text import clean_text
+    from src.processing.seen_index import SeenIndex
+    from src.utils.file_io import open_batch_writer
+    from src.utils.manifest import JobManifest
     logger = logging.getLogger(__name__)
     
     if not os.path.exists(input_csv):
@@ -62,65 +90,156 @@ def run_scraping_job(input_csv, output_file):
         logger.error("CSV must have a 'Video Links' column")
         return
 
-    scraper = YoutubeScraper()
-    all_comments = []
-    
-    # Iterate through videos
-    for _, row in tqdm(df.iterrows(), total=len(df), desc="Processing Videos"):
+    manifest = JobManifest(manifest_path or default_manifest_path(output_file))
+    jobs = []
+    skipped = 0
+    unmarked = 0
+    for _, row in df.iterrows():
         url = row["Video Links"]
-        category = row.get("Channel Category", "Unknown")
-        channel = row.get("Youtube Channel", "Unknown")
-        
         video_id = extract_video_id(url)
         if not video_id:
             logger.warning(f"Could not extract ID from {url}")
             continue
-            
-        logger.info(f"Scraping video {video_id} ({channel})")
-        
-        # Scrape
-        raw_comments = scraper.scrape(video_id)
-        
-        count = 0
-        for comment in raw_comments:
-            text = comment.get('text', '')
-            
-            # 1. Processing: Unicode Normalization & Cleaning
-            processed_text = clean_text(text)
-            
+        entry = manifest.get(video_id)
+        done = entry is not None and entry['status'] == JobManifest.DONE
+        if done and not delta:
+            skipped += 1
+            continue
+        since = manifest.watermark(video_id) if done else None
+        # Finished before high-water marks were kept: a full re-harvest would write every
+        # comment again, unless the seen index drops the ones already collected
+        if done and since is None and not seen_index:
+            unmarked += 1
+            continue
+        jobs.append({
+            'video_id': video_id,
+            'url': url,
+            'category': row.get("Channel Category", "Unknown"),
+            'channel': row.get("Youtube Channel", "Unknown"),
+            # Interrupted videos resume: keep their count and skip comments already written
+            'written': manifest.seen_items(video_id) if entry else set(),
+            'prior_count': entry['record_count'] if entry else 0,
+            # Finished videos are revisited for comments newer than their high-water mark
+            'since': since,
+        })
+    if skipped:
+        logger.info(f"Skipping {skipped} videos already completed according to {manifest.path}")
+    if unmarked:
+        logger.warning(f"Skipping {unmarked} completed videos without a high-water mark in {manifest.path}; "
+                       f"pass --seen_index to re-harvest them without duplicate rows")
+
+    counts = {job['video_id']: job['prior_count'] for job in jobs}
+    seen = SeenIndex(seen_index) if seen_index else None
+    duplicates = 0
+    
+    # Harvest videos concurrently; cleaning, validation and writing stay on this thread
+    progress = tqdm(total=len(jobs), desc="Processing Videos")
+    results = harvest_videos(jobs, workers=workers, max_failures=max_failures,
+                             max_comments=max_comments, time_budget=time_budget)
+    with manifest, open_batch_writer(output_file, batch_size=batch_size,
+                                     on_flush=flush_callback(manifest, seen)) as writer:
+        def process(pending):
+            nonlocal duplicates
             # 2. Filtering: Check if Assamese
-            is_assamese = LinguisticValidator.is_assamese_script(processed_text, threshold=0.4)
-            
-            if is_assamese:
+            valid = []
+            for job, comment, processed_text in pending:
+                with metrics.timer('validate_seconds', stage='youtube_comments'):
+                    is_assamese = LinguisticValidator.is_assamese_script(processed_text, threshold=0.4)
+                if is_assamese:
+                    valid.append((job, comment, processed_text))
+                else:
+                    metrics.incr('records_rejected_total', stage='scrape', reason='not_assamese')
+
+            # Texts collected by an earlier run (or earlier in this one) are not processed again;
+            # one seen-index lookup per batch, and only for valid texts so rejects are never recorded
+            keep = seen.filter_new([text for _, _, text in valid]) if seen is not None else None
+            for i, (job, comment, processed_text) in enumerate(valid):
+                video_id = job['video_id']
+                if keep is not None and not keep[i]:
+                    duplicates += 1
+                    metrics.incr('records_rejected_total', stage='scrape', reason='previously_seen')
+                    continue
+
+                item_id = comment_item_id(comment)
+                if item_id in job['written']:
+                    continue
+
                 # Enrich record
                 comment['processed_text'] = processed_text
                 comment['video_id'] = video_id
-                comment['source_url'] = url
-                comment['channel_category'] = category
-                comment['channel_name'] = channel
+                comment['source_url'] = job['url']
+                comment['channel_category'] = job['category']
+                comment['channel_name'] = job['channel']
                 comment['is_assamese'] = True
-                
-                all_comments.append(comment)
-                count += 1
-        
-        logger.info(f"Found {count} valid Assamese comments for video {video_id}")
+
+                counts[video_id] += 1
+                metrics.incr('records_accepted_total', stage='scrape')
+                manifest.stage_items(video_id, [item_id])
+                manifest.stage(video_id, 'youtube', JobManifest.PARTIAL, counts[video_id])
+                writer.write(comment)
+            pending.clear()
+
+        pending = []
+        for event, job, payload in results:
+            video_id = job['video_id']
+            if event == 'done' or event == 'failed':
+                # A video's comments are written before it is marked finished
+                process(pending)
+                progress.update(1)
+                status = JobManifest.DONE if event == 'done' else JobManifest.FAILED
+                # A first harvest cut short by a cap has no mark to continue from; it stays
+                # partial until a run without the cap (or with a larger one) reaches the end
+                if event == 'done' and not job['since'] and job.get('stop_reason') in CAP_STOP_REASONS:
+                    status = JobManifest.PARTIAL
+                manifest.stage(video_id, 'youtube', status, counts[video_id])
+                if event == 'done' and job.get('watermark'):
+                    manifest.stage_watermark(video_id, job['watermark'])
+                logger.info(f"Found {counts[video_id]} valid Assamese comments for video {video_id}")
+                continue
+
+            comment = payload
+            text = comment.get('text', '')
+
+            # 1. Processing: Unicode Normalization & Cleaning
+            processed_text = clean_text(text)
+
+            metrics.records('scrape', 1)
+            pending.append((job, comment, processed_text))
+            if len(pending) >= SEEN_CHECK_BATCH:
+                process(pending)
+        process(pending)
+    progress.close()
+    if seen is not None:
+        seen.close()
+        logger.info(f"Dropped {duplicates} comments already in {seen_index}")
         
-    # Save Results
-    if all_comments:
-        out_df = pd.DataFrame(all_comments)
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        # Append if file exists, else create new
-        if os.path.exists(output_file):
-             out_df.to_csv(output_file, mode='a', header=False, index=False, encoding='utf-8-sig')
-        else:
-             out_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-        logger.info(f"Successfully saved {len(all_comments)} comments to {output_file}")
+    if writer.count:
+        logger.info(f"Successfully saved {writer.count} comments to {output_file}")
     else:
         logger.warning("No comments collected.")
 
-def run_news_scraping_job(input_csv, output_file):
+def run_news_scraping_job(input_csv, output_file, workers=1, max_per_host=1, batch_size=1000,
+                          manifest_path=None, cache_dir=None, cache_ttl_days=7.0, cache_max_mb=2048,
+                          replay=False, extractor='stream', seen_index=None, delay=2.0, min_delay=None,
+                          retries=3):
+    import pandas as pd
+    from src.scrapers.cache import ResponseCache
     logger = logging.getLogger(__name__)
     
+    cache = None
+    if cache_dir:
+        cache = ResponseCache(cache_dir, ttl=cache_ttl_days * 86400, max_bytes=cache_max_mb * 1024 * 1024)
+    elif replay:
+        logger.error("--replay needs --cache_dir")
+        return
+    
+    # Replay without a seed list re-extracts everything in the cache
+    if replay and not input_csv:
+        run_news_extraction(cache.urls(), output_file, workers, batch_size, manifest_path, cache, replay,
+                            extractor=extractor, seen_index=seen_index, delay=delay, min_delay=min_delay,
+                            retries=retries)
+        return
+    
     if not os.path.exists(input_csv):
         logger.error(f"Input file not found: {input_csv}")
         return
@@ -138,46 +257,225 @@ def run_news_scraping_job(input_csv, output_file):
         logger.error("CSV must have a 'News Link', 'URL', or 'Link' column")
         return
 
-    scraper = NewsScraper()
-    all_articles = []
+    urls = df[url_col].dropna().astype(str).tolist()
+    run_news_extraction(urls, output_file, workers, batch_size, manifest_path, cache, replay,
+                        max_per_host=max_per_host, extractor=extractor, seen_index=seen_index,
+                        delay=delay, min_delay=min_delay, retries=retries)
 
-    for _, row in tqdm(df.iterrows(), total=len(df), desc="Processing News Articles"):
-        url = row[url_col]
-        
-        # Scrape
-        articles = scraper.scrape(url)
-        
-        for article in articles:
-            text = article.get('text', '')
-            
+def run_news_extraction(all_urls, output_file, workers, batch_size, manifest_path, cache, replay,
+                        max_per_host=1, extractor='stream', seen_index=None, delay=2.0, min_delay=None,
+                        retries=3):
+    from tqdm import tqdm
+    from src.scrapers.news import NewsScraper, FINAL_SKIP_REASONS
+    from src.processing.linguistic import LinguisticValidator
+    from src.processing.text import clean_text
+    from src.processing.seen_index import SeenIndex
+    from src.utils.file_io import open_batch_writer
+    from src.utils.manifest import JobManifest
+    logger = logging.getLogger(__name__)
+    scraper = NewsScraper(delay=delay, max_per_host=max_per_host, cache=cache, offline=replay,
+                          extractor=extractor, min_delay=min_delay, retries=retries)
+    manifest = JobManifest(manifest_path or default_manifest_path(output_file))
+    seen = SeenIndex(seen_index) if seen_index else None
+    duplicates = 0
+    if replay:
+        # Re-extraction is the point of a replay, so completed targets are not skipped
+        urls = all_urls
+    else:
+        urls = [url for url in all_urls if not manifest.is_final(url)]
+        if len(urls) < len(all_urls):
+            logger.info(f"Skipping {len(all_urls) - len(urls)} articles already completed or skipped "
+                        f"according to {manifest.path}")
+
+    # Scrape (hosts in parallel, politeness delay kept per host)
+    results = scraper.scrape_many(urls, max_workers=workers)
+    with manifest, open_batch_writer(output_file, batch_size=batch_size,
+                                     on_flush=flush_callback(manifest, seen)) as writer:
+        for url, articles, reason in tqdm(results, total=len(urls), desc="Processing News Articles"):
+            # Disallowed by robots.txt or no Assamese text: fetching again would not help
+            if reason in FINAL_SKIP_REASONS:
+                manifest.stage(url, 'news', JobManifest.SKIPPED, 0)
+                continue
+            # Otherwise nothing extracted means a fetch error or a transient skip (robots.txt
+            # unavailable); leave it for the next run
+            if not articles:
+                manifest.stage(url, 'news', JobManifest.FAILED, 0)
+                continue
+            accepted = 0
             # 1. Processing
-            processed_text = clean_text(text)
+            processed = [clean_text(article.get('text', '')) for article in articles]
+            metrics.records('scrape', len(articles))
             
             # 2. Filtering
             # News articles are longer, so we can be stricter with threshold
-            is_assamese = LinguisticValidator.is_assamese_script(processed_text, threshold=0.6)
+            valid = []
+            for article, processed_text in zip(articles, processed):
+                with metrics.timer('validate_seconds', stage='news_articles'):
+                    is_assamese = LinguisticValidator.is_assamese_script(processed_text, threshold=0.6)
+                if is_assamese:
+                    valid.append((article, processed_text))
+                else:
+                    metrics.incr('records_rejected_total', stage='scrape', reason='not_assamese')
             
-            if is_assamese:
+            # Articles collected by an earlier run are dropped; only valid texts are looked up (and recorded)
+            new = seen.filter_new([text for _, text in valid]) if seen is not None else [True] * len(valid)
+            duplicates += len(valid) - int(sum(new))
+            metrics.incr('records_rejected_total', len(valid) - int(sum(new)),
+                         stage='scrape', reason='previously_seen')
+            for (article, processed_text), is_new in zip(valid, new):
+                if not is_new:
+                    continue
                 article['processed_text'] = processed_text
                 article['is_assamese'] = True
-                all_articles.append(article)
-    
-    # Save
-    if all_articles:
-        out_df = pd.DataFrame(all_articles)
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        if os.path.exists(output_file):
-             out_df.to_csv(output_file, mode='a', header=False, index=False, encoding='utf-8-sig')
-        else:
-             out_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-        logger.info(f"Successfully saved {len(all_articles)} articles to {output_file}")
+                writer.write(article)
+                accepted += 1
+            metrics.incr('records_accepted_total', accepted, stage='scrape')
+            manifest.stage(url, 'news', JobManifest.DONE, accepted)
+    
+    if cache:
+        cache.close()
+    if seen is not None:
+        seen.close()
+        logger.info(f"Dropped {duplicates} paragraphs already in {seen_index}")
+    
+    if writer.count:
+        logger.info(f"Successfully saved {writer.count} articles to {output_file}")
     else:
         logger.warning("No articles collected.")
 
 
+def youtube_records(input_csv, workers=1, max_failures=2, max_comments=None, time_budget=None):
+    """Yields enriched comment records for every video in the seed CSV."""
+    import pandas as pd
+    from src.scrapers.youtube import harvest_videos
+    logger = logging.getLogger(__name__)
+    df = pd.read_csv(input_csv)
+    jobs = []
+    for _, row in df.iterrows():
+        video_id = extract_video_id(row["Video Links"])
+        if not video_id:
+            logger.warning(f"Could not extract ID from {row['Video Links']}")
+            continue
+        jobs.append({'video_id': video_id, 'url': row["Video Links"],
+                     'category': row.get("Channel Category", "Unknown"),
+                     'channel': row.get("Youtube Channel", "Unknown"), 'written': set()})
+    for event, job, payload in harvest_videos(jobs, workers=workers, max_failures=max_failures,
+                                              max_comments=max_comments, time_budget=time_budget):
+        if event != 'comment':
+            continue
+        payload['video_id'] = job['video_id']
+        payload['source_url'] = job['url']
+        payload['channel_category'] = job['category']
+        payload['channel_name'] = job['channel']
+        yield payload
+
+def news_records(input_csv, workers=1, max_per_host=1, cache_dir=None, extractor='stream',
+                 delay=2.0, min_delay=None, retries=3):
+    """Yields one record per article URL in the seed CSV, its Assamese paragraphs joined in 'text'."""
+    import pandas as pd
+    from src.scrapers.cache import ResponseCache
+    from src.scrapers.news import NewsScraper
+    df = pd.read_csv(input_csv)
+    url_col = next((col for col in ['News Link', 'URL', 'Link'] if col in df.columns), None)
+    if not url_col:
+        raise ValueError("CSV must have a 'News Link', 'URL', or 'Link' column")
+    cache = ResponseCache(cache_dir) if cache_dir else None
+    scraper = NewsScraper(delay=delay, max_per_host=max_per_host, cache=cache, extractor=extractor,
+                          min_delay=min_delay, retries=retries)
+    try:
+        for _, articles, _ in scraper.scrape_many(df[url_col].dropna().astype(str).tolist(), max_workers=workers):
+            yield from articles
+    finally:
+        if cache:
+            cache.close()
+
+def file_records(inputs, chunksize=50000):
+    """Yields chunks of existing CSV/Parquet datasets, tagged with their file."""
+    from src.utils.file_io import iter_table
+    for fp in inputs:
+        for chunk in iter_table(fp, chunksize=chunksize):
+            chunk['source_file'] = fp
+            yield chunk
+
+def run_fused_pipeline(source, output_file, input_csv=None, inputs=None, stats_output=None, taps=None,
+                       workers=1, max_failures=2, max_per_host=1, batch_size=1000, queue_size=8,
+                       chunksize=50000, cache_dir=None, extractor='stream', seen_index=None, delay=2.0,
+                       min_delay=None, retries=3, max_comments=None, time_budget=None):
+    """
+    Streams records from a source through clean -> validate -> dedup -> split -> stats,
+    each stage in its own thread with bounded queues in between. Only the final
+    sentences (and optionally the stats and tapped intermediates) are written.
+
+    Args:
+        source (str): 'youtube' or 'news' (scrape from `input_csv`) or 'files' (`inputs`).
+        taps (dict): Stage name ('scrape', 'clean', 'validate', 'dedup') -> path to persist its output.
+
+    Returns:
+        dict: Statistics of the final sentences.
+    """
+    from src.processing import streaming
+    from src.processing.seen_index import SeenIndex
+    from src.utils.stats import StatsPartial
+    from src.utils.file_io import TableWriter
+    from src.utils.parallel import pipeline
+    logger = logging.getLogger(__name__)
+    taps = taps or {}
+    unknown = set(taps) - {'scrape', 'clean', 'validate', 'dedup'}
+    if unknown:
+        logger.error(f"Unknown tap points: {', '.join(sorted(unknown))}")
+        return None
+
+    if source == 'youtube':
+        records = youtube_records(input_csv, workers=workers, max_failures=max_failures,
+                                  max_comments=max_comments, time_budget=time_budget)
+    elif source == 'news':
+        records = news_records(input_csv, workers=workers, max_per_host=max_per_host,
+                               cache_dir=cache_dir, extractor=extractor, delay=delay,
+                               min_delay=min_delay, retries=retries)
+    else:
+        records = file_records(inputs, chunksize=chunksize)
+
+    seen = SeenIndex(seen_index) if seen_index else None
+    stats = StatsPartial()
+
+    def with_tap(name, stage):
+        stage = metrics.instrument_stage(name, stage)
+        return [stage] + ([metrics.instrument_stage(f'tap_{name}', streaming.tap(taps[name]))] if name in taps else [])
+
+    stages = (with_tap('scrape', partial(streaming.batch_records, batch_size=batch_size))
+              + with_tap('clean', streaming.clean_stage)
+              + with_tap('validate', partial(streaming.validate_stage, default_source=source))
+              + with_tap('dedup', partial(streaming.dedup_stage, seen_index=seen))
+              + [metrics.instrument_stage('split', partial(streaming.split_stage, label=source)),
+                 metrics.instrument_stage('stats', partial(streaming.stats_stage, stats=stats))])
+
+    with TableWriter(output_file) as writer:
+        for chunk in pipeline(records, stages, queue_size=queue_size):
+            writer.write(chunk)
+    # Texts only count as seen once the output holding them is complete
+    if seen is not None:
+        seen.close()
+
+    result = stats.result()
+    logger.info(f"Wrote {writer.count} sentences to {output_file}")
+    if stats_output:
+        os.makedirs(os.path.dirname(stats_output) or '.', exist_ok=True)
+        with open(stats_output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        logger.info(f"Saved statistics to {stats_output}")
+    return result
+
+
 def main():
     setup_logging()
     parser = argparse.ArgumentParser(description="Assamese Sentiment Data Pipeline")
+    parser.add_argument("--metrics_json", type=str, help="Write per-stage timings and counts as JSON when done")
+    parser.add_argument("--metrics_prom", type=str,
+                        help="Write the metrics as a Prometheus textfile (node_exporter textfile collector)")
+    parser.add_argument("--profile", type=str, help="Profile the command and write the profile here")
+    parser.add_argument("--profiler", choices=["cprofile", "sample"], default="cprofile",
+                        help="cprofile: exact, main thread only (pstats file); sample: all threads (collapsed stacks)")
+    parser.add_argument("--profile_interval", type=float, default=5.0, help="Sampling period in ms (--profiler sample)")
     
     subparsers = parser.add_subparsers(dest="command", help="Available pipeline stages")
     
@@ -186,58 +484,256 @@ def main():
     scrape_parser.add_argument("--source", choices=["youtube", "news", "all"], default="youtube")
     scrape_parser.add_argument("--input_csv", type=str, help="Path to CSV with links")
     scrape_parser.add_argument("--output", type=str, default="data/processed/assamese_dataset.csv")
+    scrape_parser.add_argument("--workers", type=int, default=1, help="Concurrent videos (youtube) or requests across hosts (news)")
+    scrape_parser.add_argument("--max_failures", type=int, default=2, help="Retries allowed per video before it is skipped")
+    scrape_parser.add_argument("--delta", action="store_true",
+                               help="Revisit finished videos for comments newer than their last harvest (youtube)")
+    scrape_parser.add_argument("--max_comments", type=int,
+                               help="Per-video cap on fetched comments (youtube; a capped first harvest stays partial)")
+    scrape_parser.add_argument("--time_budget", type=float,
+                               help="Per-video cap on seconds spent paginating (youtube; a capped first harvest stays partial)")
+    scrape_parser.add_argument("--max_per_host", type=int, default=1, help="Concurrent requests per host (news)")
+    scrape_parser.add_argument("--delay", type=float, default=2.0, help="Starting delay between requests to a host (news)")
+    scrape_parser.add_argument("--min_delay", type=float,
+                                help="Let a host that keeps answering speed up to this delay (news; default: never below --delay); robots.txt Crawl-delay wins if larger")
+    scrape_parser.add_argument("--retries", type=int, default=3, help="Retries after 429/5xx or connection errors, with backoff (news)")
+    scrape_parser.add_argument("--batch_size", type=int, default=1000, help="Records per flushed output batch")
+    scrape_parser.add_argument("--manifest", type=str, help="Job manifest for resuming (default: next to --output)")
+    scrape_parser.add_argument("--cache_dir", type=str, help="On-disk HTTP response cache for news pages")
+    scrape_parser.add_argument("--cache_ttl_days", type=float, default=7.0, help="Serve cached pages without revalidation for this long")
+    scrape_parser.add_argument("--cache_max_mb", type=int, default=2048, help="Evict least recently used pages above this size")
+    scrape_parser.add_argument("--replay", action="store_true", help="Re-extract news from the cache only, no network")
+    scrape_parser.add_argument("--extractor", choices=["stream", "strained", "lxml", "bs4", "auto"], default="stream",
+                               help="HTML extraction backend for news pages ('strained' and 'lxml' can differ from bs4 on malformed markup)")
+    scrape_parser.add_argument("--seen_index", type=str, help="Persistent index of collected texts; known texts are dropped")
     
     # Filter command
     filter_parser = subparsers.add_parser("filter", help="Filter non-Assamese text")
+    filter_parser.add_argument("--input", type=str, required=True, help="Input CSV/Parquet")
+    filter_parser.add_argument("--output", type=str, required=True, help="Accepted rows")
+    filter_parser.add_argument("--rejected", type=str, help="Rejected rows, with reject_reason and indic_ratio")
+    filter_parser.add_argument("--text_column", type=str, help="Column to check (default: processed_text, else text)")
+    filter_parser.add_argument("--threshold", action="append", default=[], metavar="SOURCE=RATIO",
+                               help="Indic-ratio threshold per source, e.g. youtube=0.4 news=0.6; repeatable")
+    filter_parser.add_argument("--default_threshold", type=float, default=0.4, help="Threshold for other sources")
+    filter_parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk")
+    filter_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    
+    # Clean command
+    clean_parser = subparsers.add_parser("clean", help="Normalize text, strip URLs and mask PII")
+    clean_parser.add_argument("--input", type=str, required=True, help="Input CSV")
+    clean_parser.add_argument("--output", type=str, required=True, help="Output CSV")
+    clean_parser.add_argument("--text_column", type=str, default="text", help="Column with the raw text")
+    clean_parser.add_argument("--output_column", type=str, default="processed_text", help="Column for the cleaned text")
+    clean_parser.add_argument("--remove_emojis", action="store_true", help="Also strip emoji characters")
+    clean_parser.add_argument("--keep_pii", action="store_true", help="Do not mask emails and phone numbers")
+    clean_parser.add_argument("--drop_empty", action="store_true", help="Drop rows that are empty after cleaning")
+    clean_parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk")
+    clean_parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
     
     # Sort/Dedup command
     dedup_parser = subparsers.add_parser("dedup", help="Deduplicate a dataset")
-    dedup_parser.add_argument("--input", type=str, required=True, help="Input CSV")
+    dedup_parser.add_argument("--input", nargs='+', required=True, help="Input CSV file(s)")
     dedup_parser.add_argument("--output", type=str, required=True, help="Output CSV")
+    dedup_parser.add_argument("--near", action="store_true", help="Also remove near-duplicates (MinHash/LSH)")
+    dedup_parser.add_argument("--threshold", type=float, default=0.8, help="Jaccard threshold for near-duplicates")
+    dedup_parser.add_argument("--num_perm", type=int, default=64, help="MinHash permutations")
+    dedup_parser.add_argument("--shingle_size", type=int, default=4, help="Characters per shingle")
+    dedup_parser.add_argument("--workers", type=int, default=1, help="Processes for signature computation")
+    dedup_parser.add_argument("--stream", action="store_true",
+                              help="Stream exact dedup in chunks (implied by several inputs)")
+    dedup_parser.add_argument("--chunksize", type=int, default=50000, help="Rows read per chunk when streaming")
+    dedup_parser.add_argument("--memory_mb", type=int, default=1024, help="Fingerprint set budget before spilling to disk")
+    dedup_parser.add_argument("--fingerprint_bits", type=int, choices=[64, 128], default=64, help="Fingerprint size")
+    dedup_parser.add_argument("--spill_dir", type=str, help="Directory for spill files (default: system temp)")
+    dedup_parser.add_argument("--seen_index", type=str, help="Persistent index of collected texts; known texts are dropped")
+    dedup_parser.add_argument("--compact_index", action="store_true", help="Compact --seen_index after deduplicating")
+    dedup_parser.add_argument("--index_max_age_days", type=float, help="When compacting, forget texts older than this")
     
     # Combine command
     combine_parser = subparsers.add_parser("combine", help="Split sentences and combine datasets")
     combine_parser.add_argument("--inputs", nargs='+', required=True, help="Input CSV files")
     combine_parser.add_argument("--output", type=str, required=True, help="Final Output CSV")
+    combine_parser.add_argument("--chunksize", type=int, default=50000, help="Rows read per chunk")
+    
+    # Export-shards command
+    shards_parser = subparsers.add_parser("export-shards", help="Write sentences as memory-mapped shards for random access")
+    shards_parser.add_argument("--inputs", nargs='+', required=True, help="Sentence-level CSV/Parquet files (e.g. combine output)")
+    shards_parser.add_argument("--output", type=str, required=True, help="Corpus directory")
+    shards_parser.add_argument("--text_column", type=str, default="sentence_no_emoji", help="Column stored in the shard blobs")
+    shards_parser.add_argument("--columns", nargs='+', help="Metadata columns to keep (default: all others)")
+    shards_parser.add_argument("--shard_size", type=int, default=1_000_000, help="Sentences per shard")
+    shards_parser.add_argument("--meta_format", choices=["parquet", "csv"], default="parquet", help="Metadata table format")
+    shards_parser.add_argument("--chunksize", type=int, default=50000, help="Rows read per chunk")
+    
+    # Sample command
+    sample_parser = subparsers.add_parser("sample", help="Stratified random sample for annotation (single pass)")
+    sample_parser.add_argument("--inputs", nargs='+', required=True, help="Input CSV/Parquet files")
+    sample_parser.add_argument("--output", type=str, required=True, help="Sample table (random order)")
+    sample_parser.add_argument("--per_stratum", type=int, required=True, help="Rows drawn per stratum")
+    sample_parser.add_argument("--strata", nargs='+', default=["source_type", "channel_category"],
+                               help="Columns whose value combination defines a stratum")
+    sample_parser.add_argument("--seed", type=int, default=0, help="Random seed (same inputs + seed = same sample)")
+    sample_parser.add_argument("--exclude", nargs='+', help="Tables (or .txt lists) of already-annotated IDs to skip")
+    sample_parser.add_argument("--exclude_column", type=str, default="sample_id", help="ID column of the --exclude tables")
+    sample_parser.add_argument("--id_column", type=str, help="Input column with row IDs (default: text fingerprint)")
+    sample_parser.add_argument("--text_column", type=str, help="Text column for fingerprint IDs")
+    sample_parser.add_argument("--chunksize", type=int, default=50000, help="Rows read per chunk")
+    
+    # Run command (all stages fused, no intermediate files)
+    run_parser = subparsers.add_parser("run", help="Stream scrape/input -> clean -> validate -> dedup -> split -> stats")
+    run_parser.add_argument("--source", choices=["youtube", "news", "files"], default="youtube")
+    run_parser.add_argument("--input_csv", type=str, help="Seed CSV with links (youtube/news)")
+    run_parser.add_argument("--inputs", nargs='+', help="Existing CSV/Parquet datasets (files)")
+    run_parser.add_argument("--output", type=str, required=True, help="Final sentence-level dataset")
+    run_parser.add_argument("--stats_output", type=str, help="Write statistics as JSON")
+    run_parser.add_argument("--tap", action="append", default=[], metavar="STAGE=PATH",
+                            help="Persist a stage's output (scrape, clean, validate, dedup); repeatable")
+    run_parser.add_argument("--workers", type=int, default=1, help="Concurrent videos (youtube) or requests across hosts (news)")
+    run_parser.add_argument("--max_failures", type=int, default=2, help="Retries allowed per video before it is skipped")
+    run_parser.add_argument("--max_comments", type=int, help="Per-video cap on fetched comments (youtube)")
+    run_parser.add_argument("--time_budget", type=float, help="Per-video cap on seconds spent paginating (youtube)")
+    run_parser.add_argument("--max_per_host", type=int, default=1, help="Concurrent requests per host (news)")
+    run_parser.add_argument("--delay", type=float, default=2.0, help="Starting delay between requests to a host (news)")
+    run_parser.add_argument("--min_delay", type=float,
+                            help="Let a host that keeps answering speed up to this delay (news; default: never below --delay); robots.txt Crawl-delay wins if larger")
+    run_parser.add_argument("--retries", type=int, default=3, help="Retries after 429/5xx or connection errors, with backoff (news)")
+    run_parser.add_argument("--batch_size", type=int, default=1000, help="Records per chunk passed between stages")
+    run_parser.add_argument("--queue_size", type=int, default=8, help="Chunks buffered between two stages")
+    run_parser.add_argument("--chunksize", type=int, default=50000, help="Rows read per chunk (files)")
+    run_parser.add_argument("--cache_dir", type=str, help="On-disk HTTP response cache for news pages")
+    run_parser.add_argument("--extractor", choices=["stream", "strained", "lxml", "bs4", "auto"], default="stream",
+                            help="HTML extraction backend for news pages ('strained' and 'lxml' can differ from bs4 on malformed markup)")
+    run_parser.add_argument("--seen_index", type=str, help="Persistent index of collected texts; known texts are dropped")
     
     # Stats command
     stats_parser = subparsers.add_parser("stats", help="Generate dataset statistics")
     stats_parser.add_argument("--inputs", nargs='+', required=True, help="List of CSV files to analyze")
+    stats_parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    stats_parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk")
+    stats_parser.add_argument("--approximate", action="store_true",
+                              help="Bounded-memory vocabulary sketches (HyperLogLog, Count-Min) instead of exact counts")
+    stats_parser.add_argument("--top_k", type=int, default=20, help="Most frequent words to report")
     
     args = parser.parse_args()
     
+    try:
+        with metrics.profiled(args.profile, mode=args.profiler, interval=args.profile_interval / 1000):
+            with metrics.stage(args.command or "help"):
+                run_command(args, parser)
+    finally:
+        write_metrics(args)
+
+def write_metrics(args):
+    """Exports the run's metrics to the files requested on the command line."""
+    if args.metrics_json:
+        metrics.REGISTRY.write_json(args.metrics_json)
+        logging.info(f"Saved metrics to {args.metrics_json}")
+    if args.metrics_prom:
+        metrics.REGISTRY.write_prometheus(args.metrics_prom)
+        logging.info(f"Saved Prometheus metrics to {args.metrics_prom}")
+
+def run_command(args, parser):
+    """Runs the subcommand selected on the command line."""
     if args.command == "scrape":
         logging.info(f"Starting scrape for source: {args.source}")
         if args.source == "youtube" and args.input_csv:
-            run_scraping_job(args.input_csv, args.output)
-        elif args.source == "news" and args.input_csv:
-             run_news_scraping_job(args.input_csv, args.output)
+            run_scraping_job(args.input_csv, args.output, workers=args.workers,
+                             max_failures=args.max_failures, batch_size=args.batch_size,
+                             manifest_path=args.manifest, seen_index=args.seen_index, delta=args.delta,
+                             max_comments=args.max_comments, time_budget=args.time_budget)
+        elif args.source == "news" and (args.input_csv or args.replay):
+             run_news_scraping_job(args.input_csv, args.output, workers=args.workers,
+                                   max_per_host=args.max_per_host, batch_size=args.batch_size,
+                                   manifest_path=args.manifest, cache_dir=args.cache_dir,
+                                   cache_ttl_days=args.cache_ttl_days, cache_max_mb=args.cache_max_mb,
+                                   replay=args.replay, extractor=args.extractor, seen_index=args.seen_index,
+                                   delay=args.delay, min_delay=args.min_delay, retries=args.retries)
         else:
             logging.warning("Please provide --input_csv")
             
     elif args.command == "dedup":
+        from src.processing.deduplication import deduplicate_dataset, deduplicate_files
+        from src.processing.seen_index import SeenIndex
         logging.info(f"Deduplicating {args.input}")
-        deduplicate_dataset(args.input, args.output)
+        if args.stream or len(args.input) > 1:
+            if args.near:
+                logging.warning("--near needs the whole dataset in memory; streaming mode removes exact duplicates only")
+            deduplicate_files(args.input, args.output, chunksize=args.chunksize, memory_mb=args.memory_mb,
+                              bits=args.fingerprint_bits, spill_dir=args.spill_dir, seen_index=args.seen_index)
+        else:
+            deduplicate_dataset(args.input[0], args.output, near_duplicates=args.near, threshold=args.threshold,
+                                num_perm=args.num_perm, shingle_size=args.shingle_size, workers=args.workers,
+                                seen_index=args.seen_index)
+        if args.seen_index and args.compact_index:
+            with SeenIndex(args.seen_index) as index:
+                index.compact(max_age_days=args.index_max_age_days)
         
     elif args.command == "combine":
+        from src.processing.aggregation import aggregate_and_split
         logging.info(f"Combining and splitting sentences...")
-        aggregate_and_split(args.inputs, args.output)
+        aggregate_and_split(args.inputs, args.output, chunksize=args.chunksize)
+        
+    elif args.command == "run":
+        if args.source == "files" and not args.inputs or args.source != "files" and not args.input_csv:
+            logging.warning("Please provide --inputs (files) or --input_csv (youtube/news)")
+        else:
+            taps = dict(tap.split("=", 1) for tap in args.tap)
+            run_fused_pipeline(args.source, args.output, input_csv=args.input_csv, inputs=args.inputs,
+                               stats_output=args.stats_output, taps=taps, workers=args.workers,
+                               max_failures=args.max_failures, max_per_host=args.max_per_host,
+                               batch_size=args.batch_size, queue_size=args.queue_size,
+                               chunksize=args.chunksize, cache_dir=args.cache_dir,
+                               extractor=args.extractor, seen_index=args.seen_index, delay=args.delay,
+                               min_delay=args.min_delay, retries=args.retries, max_comments=args.max_comments,
+                               time_budget=args.time_budget)
         
     elif args.command == "stats":
+        from src.utils.stats import generate_stats
         logging.info("Generating Statistics...")
-        stats = generate_stats(args.inputs)
+        stats = generate_stats(args.inputs, workers=args.workers, chunksize=args.chunksize,
+                               approximate=args.approximate, top_k=args.top_k)
         print("\n=== Dataset Statistics ===")
         for k, v in stats.items():
-            print(f"{k}: {v}")
+            if isinstance(v, dict):
+                print(f"{k}:")
+                for source, value in v.items():
+                    print(f"  {source}: {value}")
+            else:
+                print(f"{k}: {v}")
         print("==========================\n")
             
     elif args.command == "filter":
+        from src.processing.filtering import filter_dataset
         logging.info("Starting language filtering")
-
-        # TODO: call filter module
+        thresholds = {source: float(ratio) for source, ratio in (t.split("=", 1) for t in args.threshold)}
+        filter_dataset(args.input, args.output, rejected_path=args.rejected, text_column=args.text_column,
+                       thresholds=thresholds, default_threshold=args.default_threshold,
+                       chunksize=args.chunksize, workers=args.workers)
     elif args.command == "clean":
+        from src.processing.cleaning import clean_dataset
         logging.info("Starting text cleaning")
-        # TODO: call cleaner module
+        clean_dataset(args.input, args.output, text_column=args.text_column,
+                      output_column=args.output_column, mask_pii=not args.keep_pii,
+                      strip_emojis=args.remove_emojis, drop_empty=args.drop_empty,
+                      chunksize=args.chunksize, workers=args.workers)
+    elif args.command == "export-shards":
+        from src.utils.shards import export_shards
+        logging.info(f"Exporting sentence shards to {args.output}")
+        export_shards(args.inputs, args.output, text_column=args.text_column, shard_size=args.shard_size,
+                      columns=args.columns, meta_format=args.meta_format, chunksize=args.chunksize)
+    elif args.command == "sample":
+        from src.processing.sampling import stratified_sample
+        logging.info(f"Sampling {args.per_stratum} rows per stratum of {', '.join(args.strata)}")
+        result = stratified_sample(args.inputs, args.output, args.per_stratum, strata=args.strata, seed=args.seed,
+                                   exclude=args.exclude, exclude_column=args.exclude_column,
+                                   id_column=args.id_column, text_column=args.text_column,
+                                   chunksize=args.chunksize)
+        if result:
+            print("\n=== Sample ===")
+            for stratum, counts in result['strata'].items():
+                print(f"{stratum}: {counts['sampled']} of {counts['population']}")
+            print("==============\n")
     else:
         parser.print_help()
 
@@ -1,93 +1,104 @@
 import pandas as pd
+import numpy as np
 import logging
-import regex
 from .text import remove_emojis
+from .fingerprints import text_fingerprints, FingerprintSet
+from .segmenter import split_batch
+from src.utils.file_io import iter_table, TableWriter
+from src.utils import metrics
 
-def aggregate_and_split(file_paths: list, output_path: str):
+
+def _source_types(chunk: pd.DataFrame, type_col: str, file_path: str) -> pd.Series:
+    if 'youtube' in file_path.lower():
+        return pd.Series('youtube_comment', index=chunk.index)
+    if type_col not in chunk.columns:
+        return pd.Series('social_media', index=chunk.index)
+    types = chunk[type_col].astype(str).str.lower()
+    is_news = types.str.contains('news', regex=False) | types.str.contains('article', regex=False)
+    return pd.Series(np.where(is_news, 'news', 'social_media'), index=chunk.index)
+
+
+def split_chunk(chunk: pd.DataFrame, file_path: str) -> pd.DataFrame:
+    """
+    Splits one chunk of documents into sentence rows with vectorized string ops.
+
+    Returns:
+        pd.DataFrame: sentence_original, sentence_no_emoji, source_type, source_url.
+    """
+    # Identify columns
+    text_col = 'processed_text' if 'processed_text' in chunk.columns else 'text'
+    url_col = 'source_url' if 'source_url' in chunk.columns else 'Video Links'
+    type_col = 'source_type' if 'source_type' in chunk.columns else 'channel_category' # Fallback
+
+    texts = chunk[text_col].fillna('').astype(str) if text_col in chunk.columns \
+        else pd.Series('', index=chunk.index)
+
+    # One row per sentence (index = source row); closing punctuation stays attached,
+    # see segmenter.py for the boundary rules
+    doc, sentences = split_batch(texts.tolist())
+    sentences = pd.Series(sentences, index=chunk.index[doc], dtype=object)
+    sentences = sentences[sentences.str.len() >= 2] # Skip single chars/noise
+
+    no_emoji = sentences.map(remove_emojis).str.strip()
+    keep = no_emoji != '' # Skip if only emoji
+    sentences = sentences[keep]
+    no_emoji = no_emoji[keep]
+
+    urls = chunk[url_col] if url_col in chunk.columns else pd.Series('', index=chunk.index)
+    return pd.DataFrame({
+        'sentence_original': sentences.to_numpy(),
+        'sentence_no_emoji': no_emoji.to_numpy(),
+        'source_type': _source_types(chunk, type_col, file_path).loc[sentences.index].to_numpy(),
+        'source_url': urls.loc[sentences.index].to_numpy(),
+    })
+
+
+def aggregate_and_split(file_paths: list, output_path: str, chunksize: int = 50_000):
     """
-    Combines multiple datasets, splits them into sentences, and creates 
+    Combines multiple datasets, splits them into sentences, and creates
     clean versions (with and without emojis).
-    
+
+    Inputs are streamed in chunks of `chunksize` rows. Sentences are deduplicated
+    on `sentence_no_emoji` against a compact set of 64-bit fingerprints (first
+    occurrence wins, across all files), and each chunk is appended to the output
+    as soon as it is processed, so memory stays bounded by the chunk size plus
+    the fingerprint set.
+
     Args:
-        file_paths (list): List of paths to cleaned CSV files.
-        output_path (str): Path to save the final sentence-level dataset.
+        file_paths (list): List of paths to cleaned CSV or Parquet files.
+        output_path (str): Path to save the final sentence-level dataset (format by extension).
+        chunksize (int): Rows read per chunk.
     """
     logger = logging.getLogger(__name__)
-    all_sentences = []
-    
-    # Regex for splitting sentences: Danda (।), Question Mark (?), Exclamation (!)
-    # We keep the delimiter to reconstruct if needed, but for now we just split.
-    # We split on the punctuation but keep it attached to the previous sentence usually needed for NLP.
-    # Simple split: `[।?!|]`
-    split_pattern = r'([।?!|])'
-    
+    seen = FingerprintSet()
+    total = 0
+    writer = TableWriter(output_path)
+
     for fp in file_paths:
         try:
-            df = pd.read_csv(fp)
-            logger.info(f"Processing {fp}, rows: {len(df)}")
-            
-            # Identify columns
-            text_col = 'processed_text' if 'processed_text' in df.columns else 'text'
-            url_col = 'source_url' if 'source_url' in df.columns else 'Video Links'
-            type_col = 'source_type' if 'source_type' in df.columns else 'channel_category' # Fallback
-            
-            for _, row in df.iterrows():
-                doc = str(row.get(text_col, ''))
-                source_url = row.get(url_col, '')
-                
-                # Determine source type more cleanly
-                s_type = 'news' if 'news' in str(row.get(type_col, '')).lower() or 'article' in str(row.get(type_col, '')).lower() else 'social_media'
-                if 'youtube' in fp.lower():
-                    s_type = 'youtube_comment'
-                
-                # Split into sentences
-                # Step 1: Split keeping delimiters
-                parts = regex.split(split_pattern, doc)
-                
-                # Step 2: Re-assemble (sent + punct)
-                sentences = []
-                current_sent = ""
-                for part in parts:
-                    if regex.match(split_pattern, part):
-                        current_sent += part
-                        sentences.append(current_sent.strip())
-                        current_sent = ""
-                    else:
-                        current_sent += part
-                
-                # Catch any trailing text
-                if current_sent.strip():
-                     sentences.append(current_sent.strip())
-                     
-                # Process each sentence
-                for sent in sentences:
-                    if len(sent) < 2: # Skip single chars/noise
-                        continue
-                        
-                    sent_no_emoji = remove_emojis(sent).strip()
-                    
-                    if not sent_no_emoji: # Skip if only emoji
-                        continue
-                        
-                    all_sentences.append({
-                        'sentence_original': sent,
-                        'sentence_no_emoji': sent_no_emoji,
-                        'source_type': s_type,
-                        'source_url': source_url
-                    })
-                    
+            rows = 0
+            for chunk in iter_table(fp, chunksize=chunksize):
+                rows += len(chunk)
+                out_df = split_chunk(chunk, fp)
+                total += len(out_df)
+                if out_df.empty:
+                    continue
+
+                # Deduplicate at sentence level, within the chunk and against earlier chunks
+                out_df = out_df[seen.add(text_fingerprints(out_df['sentence_no_emoji']))]
+                writer.write(out_df)
+            logger.info(f"Processed {fp}, rows: {rows}")
+            metrics.records('combine', rows)
+
         except Exception as e:
             logger.error(f"Failed to process {fp}: {e}")
-            
-    # Save final
-    if all_sentences:
-        out_df = pd.DataFrame(all_sentences)
-        # Final deduplication at sentence level
-        before_len = len(out_df)
-        out_df = out_df.drop_duplicates(subset=['sentence_no_emoji'])
-        logger.info(f"Generated {len(out_df)} unique sentences (dropped {before_len - len(out_df)} duplicates).")
-        
-        out_df.to_csv(output_path, index=False, encoding='utf-8-sig')
+    writer.close()
+
+    written = writer.count
+    metrics.incr('sentences_written_total', written)
+    metrics.incr('duplicates_removed_total', total - written, kind='sentence')
+    if written:
+        logger.info(f"Generated {written} unique sentences (dropped {total - written} duplicates).")
         logger.info(f"Saved merged dataset to {output_path}")
     else:
         logger.warning("No valid sentences found.")
@@ -0,0 +1,86 @@
+import logging
+from collections import deque
+from functools import partial
+
+from .text import normalize_batch
+from src.utils.parallel import ordered_map
+from src.utils.file_io import iter_table, TableWriter
+from src.utils import metrics
+
+
+def clean_dataset(input_path: str, output_path: str, text_column: str = 'text',
+                  output_column: str = 'processed_text', mask_pii: bool = True,
+                  strip_emojis: bool = False, drop_empty: bool = False,
+                  chunksize: int = 50_000, workers: int = None):
+    """
+    Normalizes a dataset chunk by chunk across a process pool.
+
+    Each record goes through one fused pass (NFC, URL removal, email/phone
+    masking, optional emoji removal). Only the text column is shipped to the
+    workers, and chunks are written back in input order.
+
+    Args:
+        input_path (str): Path to the input CSV or Parquet file.
+        output_path (str): Path where the cleaned table will be saved (format by extension).
+        text_column (str): Column holding the raw text.
+        output_column (str): Column receiving the cleaned text (created or overwritten).
+        mask_pii (bool): Replace emails and phone numbers with <EMAIL> / <PHONE>.
+        strip_emojis (bool): Remove emoji characters.
+        drop_empty (bool): Drop rows whose cleaned text is empty.
+        chunksize (int): Rows per chunk (unit of work for the pool).
+        workers (int): Worker processes; defaults to the CPU count.
+
+    Returns:
+        dict: Statistics about the cleaning pass.
+    """
+    logger = logging.getLogger(__name__)
+
+    try:
+        reader = iter_table(input_path, chunksize=chunksize)
+        first = next(reader, None)
+    except Exception as e:
+        logger.error(f"Failed to read input file {input_path}: {e}")
+        return None
+
+    if first is None:
+        logger.warning(f"{input_path} is empty")
+        return None
+    if text_column not in first.columns:
+        logger.error(f"Column '{text_column}' not found in dataset")
+        return None
+
+    def chunks():
+        yield first
+        yield from reader
+
+    # The pool sees only text lists; the frames stay in this process until written
+    frames = deque()
+    def texts():
+        for chunk in chunks():
+            frames.append(chunk)
+            yield chunk[text_column].tolist()
+
+    clean = partial(normalize_batch, mask_pii=mask_pii, strip_emojis=strip_emojis)
+    total_rows = 0
+    empty_rows = 0
+    with TableWriter(output_path) as writer:
+        for cleaned in ordered_map(clean, texts(), workers=workers):
+            chunk = frames.popleft()
+            chunk[output_column] = cleaned
+            total_rows += len(chunk)
+            empty = chunk[output_column] == ""
+            empty_rows += int(empty.sum())
+            if drop_empty:
+                chunk = chunk[~empty]
+            writer.write(chunk)
+    written_rows = writer.count
+    metrics.records('clean', total_rows)
+    metrics.incr('empty_after_cleaning_total', empty_rows)
+
+    logger.info(f"Cleaned {total_rows} rows ({empty_rows} empty after cleaning), wrote {written_rows} to {output_path}")
+
+    return {
+        "total_rows": total_rows,
+        "empty_rows": empty_rows,
+        "written_rows": written_rows
+    }
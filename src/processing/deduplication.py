@@ -1,14 +1,35 @@
-import pandas as pd
+import numpy as np
 import logging
+import regex
+from functools import partial
+from .text import remove_emojis
+from .fingerprints import text_fingerprints, FirstOccurrences
+from .seen_index import SeenIndex, seen_fingerprints
+from src.utils.parallel import ordered_map
+from src.utils.file_io import read_table, iter_table, write_table, TableWriter
+from src.utils import metrics
 
-def deduplicate_dataset(input_path: str, output_path: str, text_column: str = 'processed_text'):
+def deduplicate_dataset(input_path: str, output_path: str, text_column: str = 'processed_text',
+                        near_duplicates: bool = False, threshold: float = 0.8, num_perm: int = 64,
+                        shingle_size: int = 4, workers: int = 1, seen_index: str = None):
     """
     Removes duplicate entries from the dataset based on the processed text.
+
+    With `near_duplicates`, rows that survive the exact pass are also clustered
+    by MinHash/LSH over character shingles (ignoring emoji, whitespace and case),
+    and only the first row of each cluster is kept.
     
     Args:
-        input_path (str): Path to the input CSV file.
-        output_path (str): Path where the deduplicated CSV will be saved.
+        input_path (str): Path to the input CSV or Parquet file.
+        output_path (str): Path where the deduplicated table will be saved (format by extension).
         text_column (str): The column name to check for duplicates.
+        near_duplicates (bool): Also remove near-duplicates.
+        threshold (float): Estimated Jaccard similarity at which two texts are near-duplicates.
+        num_perm (int): MinHash permutations per signature.
+        shingle_size (int): Characters per shingle.
+        workers (int): Processes used to compute signatures.
+        seen_index (str): Optional SeenIndex path; rows seen in earlier runs are
+                          dropped and the kept rows are recorded once saved.
         
     Returns:
         dict: Statistics about the deduplication process.
@@ -16,7 +37,7 @@ def deduplicate_dataset(input_path: str, output_path: str, text_column: str = 'p
     logger = logging.getLogger(__name__)
     
     try:
-        df = pd.read_csv(input_path)
+        df = read_table(input_path)
     except Exception as e:
         logger.error(f"Failed to read input file {input_path}: {e}")
         return None
@@ -36,18 +57,372 @@ def deduplicate_dataset(input_path: str, output_path: str, text_column: str = 'p
     removed_count = original_count - final_count
     
     logger.info(f"Removed {removed_count} duplicates.")
+
+    index = SeenIndex(seen_index) if seen_index else None
+    seen_stats = {}
+    if index is not None:
+        df_deduped = df_deduped[index.filter_new(df_deduped[text_column].tolist())]
+        seen_stats["previously_seen"] = final_count - len(df_deduped)
+        final_count = len(df_deduped)
+        logger.info(f"Dropped {seen_stats['previously_seen']} rows already in {seen_index}.")
+
+    near_stats = {}
+    if near_duplicates:
+        representatives = find_near_duplicates(df_deduped[text_column].tolist(), threshold=threshold,
+                                               num_perm=num_perm, shingle_size=shingle_size, workers=workers)
+        near_stats = cluster_size_stats(representatives)
+        df_deduped = df_deduped[representatives == np.arange(len(df_deduped))]
+        near_stats["near_duplicate_removed"] = final_count - len(df_deduped)
+        final_count = len(df_deduped)
+        logger.info(f"Removed {near_stats['near_duplicate_removed']} near-duplicates "
+                    f"in {near_stats['near_duplicate_clusters']} clusters "
+                    f"(largest: {near_stats['largest_cluster']}).")
     logger.info(f"Final dataset size: {final_count}")
     
     # Save
     try:
-        df_deduped.to_csv(output_path, index=False, encoding='utf-8-sig')
+        write_table(df_deduped, output_path)
         logger.info(f"Saved deduplicated data to {output_path}")
     except Exception as e:
         logger.error(f"Failed to save output file {output_path}: {e}")
+        if index is not None:
+            index.discard_staged()
+            index.close()
         return None
+
+    # Texts only count as seen once the output holding them exists
+    if index is not None:
+        index.close()
+
+    metrics.records('dedup', original_count)
+    metrics.incr('duplicates_removed_total', removed_count, kind='exact')
+    metrics.incr('duplicates_removed_total', seen_stats.get('previously_seen', 0), kind='seen_index')
+    metrics.incr('duplicates_removed_total', near_stats.get('near_duplicate_removed', 0), kind='near')
         
     return {
         "original_count": original_count,
         "final_count": final_count,
-        "removed_count": removed_count
+        "removed_count": removed_count,
+        **seen_stats,
+        **near_stats
+    }
+
+
+
+def deduplicate_files(input_paths: list, output_path: str, text_column: str = 'processed_text',
+                      chunksize: int = 50_000, memory_mb: int = 1024, bits: int = 64,
+                      spill_dir: str = None, seen_index: str = None):
+    """
+    Exact deduplication across many CSV/Parquet files without loading them into memory.
+
+    The first pass reads only the text column in chunks and records 64/128-bit
+    fingerprints in a compact hash set (spilled to hash-partitioned files on
+    disk past `memory_mb`); the second pass streams the files again and writes
+    the rows that are first occurrences. keep='first' holds across all files,
+    in the order given. Columns of later files are aligned to the first file's.
+
+    Args:
+        input_paths (list): Input CSV or Parquet files.
+        output_path (str): Path where the deduplicated table will be saved (format by extension).
+        text_column (str): The column name to check for duplicates.
+        chunksize (int): Rows read per chunk.
+        memory_mb (int): Budget for the in-memory fingerprint set.
+        bits (int): Fingerprint size, 64 or 128.
+        spill_dir (str): Directory for spill files (default: system temp dir).
+        seen_index (str): Optional SeenIndex path; rows seen in earlier runs are
+                          dropped and the kept rows are recorded once saved.
+
+    Returns:
+        dict: Statistics about the deduplication process.
+    """
+    logger = logging.getLogger(__name__)
+    dtype = {text_column: str}
+
+    first = FirstOccurrences(bits=bits, memory_bytes=memory_mb * 2**20, spill_dir=spill_dir)
+    index = SeenIndex(seen_index) if seen_index else None
+    known = []
+    try:
+        for fp in input_paths:
+            for chunk in iter_table(fp, columns=[text_column], dtype=dtype, chunksize=chunksize):
+                first.add(text_fingerprints(chunk[text_column], bits=bits))
+                if index is not None:
+                    known.append(index.contains_many(seen_fingerprints(chunk[text_column].tolist())))
+        keep = first.keep_mask()
+    except Exception as e:
+        logger.error(f"Failed to fingerprint inputs: {e}")
+        first.close()
+        if index is not None:
+            index.close()
+        return None
+
+    original_count = len(keep)
+    final_count = int(keep.sum())
+    removed_count = original_count - final_count
+    logger.info(f"Original dataset size: {original_count} rows in {len(input_paths)} files")
+    logger.info(f"Removed {removed_count} duplicates.")
+    seen_stats = {}
+    if index is not None:
+        if known:
+            keep &= ~np.concatenate(known)
+        seen_stats["previously_seen"] = final_count - int(keep.sum())
+        final_count -= seen_stats["previously_seen"]
+        logger.info(f"Dropped {seen_stats['previously_seen']} rows already in {seen_index}.")
+    logger.info(f"Final dataset size: {final_count}")
+
+    try:
+        offset = 0
+        with TableWriter(output_path) as writer:
+            for fp in input_paths:
+                for chunk in iter_table(fp, dtype=dtype, chunksize=chunksize):
+                    mask = keep[offset:offset + len(chunk)]
+                    offset += len(chunk)
+                    if index is not None:
+                        index.add_texts(chunk.loc[mask, text_column].tolist())
+                    writer.write(chunk[mask])
+        logger.info(f"Saved deduplicated data to {output_path}")
+    except Exception as e:
+        logger.error(f"Failed to save output file {output_path}: {e}")
+        if index is not None:
+            index.discard_staged()
+            index.close()
+        return None
+
+    if index is not None:
+        index.close()
+
+    metrics.records('dedup', original_count)
+    metrics.incr('duplicates_removed_total', removed_count, kind='exact')
+    metrics.incr('duplicates_removed_total', seen_stats.get('previously_seen', 0), kind='seen_index')
+
+    return {
+        "original_count": original_count,
+        "final_count": final_count,
+        "removed_count": removed_count,
+        **seen_stats,
+        "spilled": first.spilled
+    }
+
+# --- Near-duplicate detection (MinHash + LSH) ---
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WHITESPACE = regex.compile(r'\s+')
+
+
+def _normalize_for_shingling(text) -> str:
+    # Near-copies in comment sections differ mostly by emoji, spacing and case
+    if not isinstance(text, str):
+        return ''
+    return _WHITESPACE.sub('', remove_emojis(text)).casefold()
+
+
+def _permutations(num_perm: int, seed: int):
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def _shingle_batches(lengths: np.ndarray, budget: int):
+    # Consecutive [lo, hi) ranges of about `budget` characters (shingles); a
+    # longer text gets a batch of its own
+    ends = np.cumsum(lengths)
+    lo = 0
+    while lo < len(lengths):
+        hi = int(np.searchsorted(ends, ends[lo] - lengths[lo] + budget, side='right'))
+        hi = max(hi, lo + 1)
+        yield lo, hi
+        lo = hi
+
+
+def minhash_signatures(texts, num_perm: int = 64, shingle_size: int = 4, seed: int = 1,
+                       batch_shingles: int = 1 << 20) -> np.ndarray:
+    """
+    Computes MinHash signatures over character shingles for a list of texts.
+
+    Shingle hashes are built with a rolling polynomial over one UTF-32 buffer
+    per batch, and the per-text minimum under each permutation is a segment
+    reduction, so there is no per-shingle Python work. Batches hold about
+    `batch_shingles` shingles whatever the text lengths, and permutations are
+    applied a few at a time, so memory stays at a few times
+    8 * batch_shingles bytes for 20k-character articles as for short comments.
+
+    Returns:
+        np.ndarray: (len(texts), num_perm) uint32 signatures. Texts that are empty
+                    after normalization get an all-max signature.
+    """
+    a, b = _permutations(num_perm, seed)
+    k = shingle_size
+    normalized = [_normalize_for_shingling(t) for t in texts]
+    signatures = np.full((len(normalized), num_perm), _MAX_HASH, dtype=np.uint32)
+    # Texts shorter than one shingle are padded so they still get a single shingle
+    padded = [t.ljust(k, '\0') if t else '' for t in normalized]
+    all_lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+
+    for lo, hi in _shingle_batches(all_lengths, batch_shingles):
+        lengths = all_lengths[lo:hi]
+        if not lengths.any():
+            continue
+        cps = np.frombuffer(''.join(padded[lo:hi]).encode('utf-32-le', 'surrogatepass'),
+                            dtype='<u4').astype(np.uint64)
+
+        n_pos = len(cps) - k + 1
+        shingles = np.zeros(n_pos, dtype=np.uint64)
+        for j in range(k):
+            shingles = shingles * np.uint64(1000003) + cps[j:j + n_pos]
+        # Fold to 32 bits before the (a*h + b) mod p permutations
+        shingles = (shingles ^ (shingles >> np.uint64(32))) & _MAX_HASH
+
+        # Only windows that start and end inside the same text are shingles
+        has_shingles = lengths > 0
+        counts = lengths[has_shingles] - k + 1
+        text_starts = (np.cumsum(lengths) - lengths)[has_shingles]
+        seg_starts = np.cumsum(counts) - counts
+        positions = np.arange(counts.sum()) + np.repeat(text_starts - seg_starts, counts)
+        hv = shingles[positions]
+        del cps, shingles, positions
+
+        rows = lo + np.flatnonzero(has_shingles)
+        # (a*h + b) mod p, wrapping in uint64 like the usual MinHash implementations;
+        # a block of permutations at a time bounds the (shingles x block) matrix
+        block = max(1, (4 * batch_shingles) // len(hv))
+        for p in range(0, num_perm, block):
+            permuted = ((hv[:, None] * a[None, p:p + block] + b[None, p:p + block]) % _MERSENNE_PRIME) & _MAX_HASH
+            signatures[rows, p:p + block] = np.minimum.reduceat(permuted, seg_starts, axis=0).astype(np.uint32)
+
+    return signatures
+
+
+def _false_probability(threshold: float, bands: int, rows: int):
+    # Areas under the LSH S-curve below (false positives) and above (false negatives) the threshold
+    xs = np.linspace(0.0, 1.0, 201)
+    step = xs[1] - xs[0]
+    p = 1 - (1 - xs ** rows) ** bands
+    fp = np.sum(np.where(xs < threshold, p, 0)) * step
+    fn = np.sum(np.where(xs >= threshold, 1 - p, 0)) * step
+    return fp, fn
+
+
+def lsh_params(threshold: float, num_perm: int):
+    """
+    Picks the (bands, rows) split of a signature that minimizes the combined
+    false-positive and false-negative area around the Jaccard threshold.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        fp, fn = _false_probability(threshold, bands, rows)
+        if best is None or fp + fn < best[0]:
+            best = (fp + fn, bands, rows)
+    return best[1], best[2]
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent, i, j):
+    ri, rj = _find(parent, i), _find(parent, j)
+    if ri != rj:
+        # Keep the earliest index as the root so it is the one retained
+        if ri < rj:
+            parent[rj] = ri
+        else:
+            parent[ri] = rj
+
+
+def near_duplicate_clusters(signatures: np.ndarray, threshold: float = 0.8, valid=None) -> np.ndarray:
+    """
+    Groups near-duplicate signatures with an LSH banding index.
+
+    Items sharing a band bucket are linked when their estimated Jaccard
+    similarity (signature agreement) reaches the threshold; clusters are the
+    connected components of those links. Each item is first checked against
+    the earliest item of its bucket, which settles the usual bucket of copies
+    in linear work. Only the items that fail that check are compared with
+    every other member of the bucket, so every similar pair in a bucket is
+    still linked (the rest are already connected through the earliest item).
+
+    Args:
+        signatures (np.ndarray): (n, num_perm) MinHash signatures.
+        threshold (float): Jaccard similarity required to link two items.
+        valid (np.ndarray): Optional boolean mask; invalid items stay singletons.
+
+    Returns:
+        np.ndarray: Cluster representative (index of the earliest member) per item.
+    """
+    n, num_perm = signatures.shape
+    bands, rows = lsh_params(threshold, num_perm)
+    parent = list(range(n))
+    candidates = np.flatnonzero(valid) if valid is not None else np.arange(n)
+    if len(candidates) == 0:
+        return np.arange(n)
+
+    for band in range(bands):
+        block = signatures[candidates, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = np.zeros(len(candidates), dtype=np.uint64)
+        for j in range(rows):
+            keys = keys * np.uint64(0x100000001B3) + block[:, j]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        # np.unique's return_index is the first occurrence, i.e. the earliest item
+        reps = candidates[first[inverse]]
+        linked = reps != candidates
+        if not linked.any():
+            continue
+        items, reps, buckets = candidates[linked], reps[linked], inverse[linked]
+        similar = (signatures[items] == signatures[reps]).mean(axis=1) >= threshold
+        for i, r in zip(items[similar].tolist(), reps[similar].tolist()):
+            _union(parent, i, r)
+
+        if similar.all():
+            continue
+        # Items unlike their bucket's earliest item may still match another member
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(first) + 1))
+        for i, bucket in zip(items[~similar].tolist(), buckets[~similar].tolist()):
+            members = candidates[order[bounds[bucket]:bounds[bucket + 1]]]
+            members = members[members != i]
+            matches = members[(signatures[members] == signatures[i]).mean(axis=1) >= threshold]
+            for m in matches.tolist():
+                _union(parent, i, m)
+
+    return np.array([_find(parent, i) for i in range(n)], dtype=np.int64)
+
+
+def find_near_duplicates(texts, threshold: float = 0.8, num_perm: int = 64, shingle_size: int = 4,
+                         workers: int = 1, chunksize: int = 50_000):
+    """
+    Clusters near-duplicate texts (e.g. "খুব ভাল 👍" vs "খুব ভাল👍👍").
+
+    Signatures are computed chunk by chunk, optionally across a process pool.
+
+    Returns:
+        np.ndarray: Cluster representative (index of the earliest member) per text.
+    """
+    texts = list(texts)
+    compute = partial(minhash_signatures, num_perm=num_perm, shingle_size=shingle_size)
+    chunks = (texts[i:i + chunksize] for i in range(0, len(texts), chunksize))
+    parts = list(ordered_map(compute, chunks, workers=workers))
+    signatures = np.vstack(parts) if parts else np.zeros((0, num_perm), dtype=np.uint32)
+    valid = np.fromiter((bool(_normalize_for_shingling(t)) for t in texts), dtype=bool, count=len(texts))
+    return near_duplicate_clusters(signatures, threshold=threshold, valid=valid)
+
+
+def cluster_size_stats(representatives: np.ndarray) -> dict:
+    """
+    Summarizes near-duplicate clusters (only clusters with more than one member).
+    """
+    _, sizes = np.unique(representatives, return_counts=True)
+    sizes = sizes[sizes > 1]
+    histogram = dict(zip(*np.unique(sizes, return_counts=True)))
+    return {
+        "near_duplicate_clusters": int(len(sizes)),
+        "largest_cluster": int(sizes.max()) if len(sizes) else 0,
+        "cluster_size_histogram": {int(k): int(v) for k, v in sorted(histogram.items())},
     }
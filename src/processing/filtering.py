@@ -0,0 +1,167 @@
+import os
+import logging
+from collections import deque, Counter
+
+import numpy as np
+import pandas as pd
+
+from .linguistic import LinguisticValidator
+from src.utils.parallel import ordered_map
+from src.utils.file_io import iter_table, table_columns, TableWriter
+from src.utils import metrics
+
+# Same thresholds the scrape jobs apply inline: news articles are longer, so stricter
+DEFAULT_THRESHOLDS = {'youtube': 0.4, 'news': 0.6}
+DEFAULT_THRESHOLD = 0.4
+
+# Failing criteria, in the order LinguisticValidator.is_assamese_script checks them
+REASON_EMPTY = 'empty'
+REASON_LOW_RATIO = 'low_indic_ratio'
+REASON_BENGALI = 'bengali_characters'
+
+
+def source_key(source) -> str:
+    """
+    Maps a source_type / file name to a threshold key ('news', 'youtube' or itself).
+    """
+    source = str(source).lower()
+    if 'news' in source or 'article' in source:
+        return 'news'
+    if 'youtube' in source:
+        return 'youtube'
+    return source
+
+
+def row_thresholds(sources, thresholds: dict = None, default: float = DEFAULT_THRESHOLD) -> np.ndarray:
+    """
+    Per-row Indic-ratio thresholds for a sequence of source labels.
+    """
+    thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    lookup = {}
+    out = np.empty(len(sources), dtype=np.float64)
+    for i, source in enumerate(sources):
+        if source not in lookup:
+            lookup[source] = thresholds.get(source_key(source), default)
+        out[i] = lookup[source]
+    return out
+
+
+def reject_reasons(texts, thresholds) -> tuple:
+    """
+    Vectorized is_assamese_script that also says why a text fails.
+
+    Args:
+        texts (list): Strings; non-strings count as empty.
+        thresholds (float or np.ndarray): Indic-ratio threshold, scalar or per text.
+
+    Returns:
+        tuple: (reasons, indic_ratio) arrays; the reason is '' for accepted texts.
+    """
+    lengths, indic, _, bengali = LinguisticValidator._script_counts_batch(texts)
+    nonempty = lengths > 0
+    indic_ratio = np.zeros(len(lengths), dtype=np.float64)
+    indic_ratio[nonempty] = indic[nonempty] / lengths[nonempty]
+
+    reasons = np.full(len(lengths), '', dtype=object)
+    reasons[bengali > 0] = REASON_BENGALI
+    reasons[indic_ratio < thresholds] = REASON_LOW_RATIO
+    reasons[~nonempty] = REASON_EMPTY
+    return reasons, indic_ratio
+
+
+def _chunk_reasons(payload):
+    texts, thresholds = payload
+    return reject_reasons(texts, thresholds)
+
+
+def filter_dataset(input_path: str, output_path: str, rejected_path: str = None,
+                   text_column: str = None, thresholds: dict = None,
+                   default_threshold: float = DEFAULT_THRESHOLD,
+                   chunksize: int = 50_000, workers: int = None):
+    """
+    Re-applies the Assamese script filter to an existing dataset.
+
+    Chunks are scored across a process pool (only the texts and thresholds are
+    shipped). Each row's threshold comes from its `source_type` column, or the
+    input file name when there is none, looked up in `thresholds`.
+
+    Args:
+        input_path (str): Input CSV or Parquet file.
+        output_path (str): Accepted rows (format by extension).
+        rejected_path (str): Rejected rows with `reject_reason` and `indic_ratio` columns.
+        text_column (str): Column to check (default: processed_text, else text).
+        thresholds (dict): Threshold per source key ('youtube', 'news', ...).
+        default_threshold (float): Threshold for sources not in `thresholds`.
+        chunksize (int): Rows per chunk (unit of work for the pool).
+        workers (int): Worker processes; defaults to the CPU count.
+
+    Returns:
+        dict: Accepted/rejected counts, rejections per reason and per-source counts.
+    """
+    logger = logging.getLogger(__name__)
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+
+    try:
+        columns = table_columns(input_path)
+    except Exception as e:
+        logger.error(f"Failed to read input file {input_path}: {e}")
+        return None
+    text_column = text_column or ('processed_text' if 'processed_text' in columns else 'text')
+    if text_column not in columns:
+        logger.error(f"Column '{text_column}' not found in dataset")
+        return None
+    has_source = 'source_type' in columns
+    file_source = os.path.basename(input_path)
+
+    frames = deque()
+    def payloads():
+        for chunk in iter_table(input_path, chunksize=chunksize):
+            frames.append(chunk)
+            sources = chunk['source_type'].astype(str).tolist() if has_source else [file_source] * len(chunk)
+            yield chunk[text_column].tolist(), row_thresholds(sources, thresholds, default_threshold)
+
+    reasons_count = Counter()
+    by_source = {}
+    accepted_writer = TableWriter(output_path)
+    rejected_writer = TableWriter(rejected_path) if rejected_path else None
+    try:
+        for reasons, ratios in ordered_map(_chunk_reasons, payloads(), workers=workers):
+            chunk = frames.popleft()
+            accepted = reasons == ''
+            keys = (chunk['source_type'].astype(str).map(source_key) if has_source
+                    else pd.Series(source_key(file_source), index=chunk.index))
+            for key, group in pd.Series(accepted, index=chunk.index).groupby(keys.to_numpy()):
+                entry = by_source.setdefault(key, {'accepted': 0, 'rejected': 0})
+                entry['accepted'] += int(group.sum())
+                entry['rejected'] += int((~group).sum())
+            reasons_count.update(reasons[~accepted].tolist())
+
+            accepted_writer.write(chunk[accepted])
+            if rejected_writer is not None:
+                rejected = chunk[~accepted].copy()
+                rejected['reject_reason'] = reasons[~accepted]
+                rejected['indic_ratio'] = ratios[~accepted].round(4)
+                rejected_writer.write(rejected)
+    finally:
+        accepted_writer.close()
+        if rejected_writer is not None:
+            rejected_writer.close()
+
+    accepted_count = accepted_writer.count
+    rejected_count = sum(reasons_count.values())
+    metrics.records('filter', accepted_count + rejected_count)
+    metrics.incr('records_accepted_total', accepted_count, stage='filter')
+    for reason, count in reasons_count.items():
+        metrics.incr('records_rejected_total', count, stage='filter', reason=reason)
+    logger.info(f"Accepted {accepted_count} rows, rejected {rejected_count} "
+                f"({', '.join(f'{r}: {n}' for r, n in reasons_count.most_common()) or 'none'})")
+    logger.info(f"Saved accepted rows to {output_path}")
+    if rejected_path:
+        logger.info(f"Saved rejected rows to {rejected_path}")
+
+    return {
+        "accepted_count": accepted_count,
+        "rejected_count": rejected_count,
+        "reject_reasons": dict(reasons_count),
+        "by_source": by_source
+    }
@@ -0,0 +1,244 @@
+import os
+import shutil
+import logging
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# pandas' default hash key, so 64-bit fingerprints match hash_pandas_object(index=False)
+_HASH_KEYS = ('0123456789123456', 'fedcba9876543210')
+_EMPTY = np.uint64(0)
+
+
+def text_fingerprints(texts, bits: int = 64) -> np.ndarray:
+    """
+    Hashes texts to fixed-size fingerprints (SipHash via pandas, vectorized).
+
+    Missing values share one fingerprint, so they deduplicate like
+    drop_duplicates treats NaN.
+
+    Args:
+        texts (iterable): Strings (or a pd.Series).
+        bits (int): 64 or 128.
+
+    Returns:
+        np.ndarray: (len(texts), bits // 64) uint64 array.
+    """
+    if bits not in (64, 128):
+        raise ValueError(f"bits must be 64 or 128, got {bits}")
+    values = np.asarray(pd.Series(texts, dtype=object), dtype=object)
+    words = [pd.util.hash_array(values, hash_key=key) for key in _HASH_KEYS[:bits // 64]]
+    fps = np.stack(words, axis=1)
+    # All-zero is the empty-slot marker of FingerprintSet
+    fps[(fps == _EMPTY).all(axis=1), 0] = 1
+    return fps
+
+
+def _as_void(fps: np.ndarray) -> np.ndarray:
+    # One opaque value per row, so np.unique compares whole fingerprints
+    fps = np.ascontiguousarray(fps)
+    return fps.view(np.dtype((np.void, fps.dtype.itemsize * fps.shape[1]))).ravel()
+
+
+def _first_in_batch(fps: np.ndarray) -> np.ndarray:
+    _, first = np.unique(_as_void(fps), return_index=True)
+    mask = np.zeros(len(fps), dtype=bool)
+    mask[first] = True
+    return mask
+
+
+class FingerprintSet:
+    """
+    Open-addressing hash set of 64/128-bit fingerprints backed by one NumPy array.
+
+    Inserts are vectorized linear probing over a whole batch; a set of N
+    fingerprints takes about 8 * words * N / max_load bytes, an order of
+    magnitude less than a Python set of ints.
+    """
+
+    def __init__(self, bits: int = 64, capacity: int = 1 << 16, max_load: float = 0.5):
+        self.words = bits // 64
+        self.max_load = max_load
+        self.size = 0
+        self._table = np.zeros((max(1 << 4, 1 << (int(capacity) - 1).bit_length()), self.words), dtype=np.uint64)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        return self._table.nbytes
+
+    def _insert_unique(self, fps: np.ndarray) -> np.ndarray:
+        """Inserts fingerprints that are unique within the batch; returns which were new."""
+        table = self._table
+        mask = np.uint64(len(table) - 1)
+        slots = fps[:, 0] & mask
+        new = np.zeros(len(fps), dtype=bool)
+        todo = np.arange(len(fps))
+        while len(todo):
+            keys = fps[todo]
+            current = table[slots[todo]]
+            found = (current == keys).all(axis=1)
+            empty = (current == _EMPTY).all(axis=1)
+            # Claim empty slots; when several keys race for one slot, one write wins
+            claim = todo[empty]
+            table[slots[claim]] = fps[claim]
+            won = (table[slots[claim]] == fps[claim]).all(axis=1)
+            new[claim[won]] = True
+            done = found.copy()
+            done[np.flatnonzero(empty)[won]] = True
+            todo = todo[~done]
+            slots[todo] = (slots[todo] + np.uint64(1)) & mask
+        self.size += int(new.sum())
+        return new
+
+    def _capacity_for(self, needed: int) -> int:
+        capacity = len(self._table)
+        while needed > capacity * self.max_load:
+            capacity *= 2
+        return capacity
+
+    def nbytes_for(self, needed: int) -> int:
+        """Table size in bytes once `needed` fingerprints are stored."""
+        return self._capacity_for(needed) * self.words * 8
+
+    def _grow(self, needed: int):
+        capacity = self._capacity_for(needed)
+        if capacity == len(self._table):
+            return
+        old = self._table[(self._table != _EMPTY).any(axis=1)]
+        self._table = np.zeros((capacity, self.words), dtype=np.uint64)
+        self.size = 0
+        self._insert_unique(old)
+
+    def add(self, fps: np.ndarray) -> np.ndarray:
+        """
+        Adds a batch of fingerprints.
+
+        Returns:
+            np.ndarray: Boolean mask, True where the fingerprint was not in the set
+                        before and is its first occurrence in the batch.
+        """
+        fps = np.asarray(fps, dtype=np.uint64).reshape(len(fps), self.words)
+        result = np.zeros(len(fps), dtype=bool)
+        first = np.flatnonzero(_first_in_batch(fps))
+        self._grow(self.size + len(first))
+        result[first] = self._insert_unique(fps[first])
+        return result
+
+    def contains(self, fps: np.ndarray) -> np.ndarray:
+        """
+        Membership test for a batch of fingerprints; the set is not modified.
+
+        Returns:
+            np.ndarray: Boolean mask, True where the fingerprint is in the set.
+        """
+        fps = np.asarray(fps, dtype=np.uint64).reshape(len(fps), self.words)
+        table = self._table
+        mask = np.uint64(len(table) - 1)
+        slots = fps[:, 0] & mask
+        found = np.zeros(len(fps), dtype=bool)
+        todo = np.arange(len(fps))
+        # Probe until the key or an empty slot turns up
+        while len(todo):
+            current = table[slots[todo]]
+            hit = (current == fps[todo]).all(axis=1)
+            found[todo[hit]] = True
+            todo = todo[~hit & ~(current == _EMPTY).all(axis=1)]
+            slots[todo] = (slots[todo] + np.uint64(1)) & mask
+        return found
+
+    def items(self) -> np.ndarray:
+        return self._table[(self._table != _EMPTY).any(axis=1)]
+
+
+class FirstOccurrences:
+    """
+    Decides, for a stream of fingerprint batches, which rows are first occurrences
+    (keep='first' across the whole stream) within a memory budget.
+
+    Fingerprints go into a FingerprintSet until it would outgrow `memory_bytes`.
+    After that the set is spilled to hash partitions on disk, every later row
+    is appended there as (fingerprint, row) and the partitions are resolved one
+    at a time by an in-memory sort in `keep_mask()`.
+    """
+
+    def __init__(self, bits: int = 64, memory_bytes: int = 1 << 30, spill_dir: str = None,
+                 partitions: int = 256):
+        self.bits = bits
+        self.memory_bytes = memory_bytes
+        self.spill_dir = spill_dir
+        self.partitions = 1 << (partitions - 1).bit_length()
+        self.rows = 0
+        self.spilled = False
+        self._set = FingerprintSet(bits)
+        self._masks = []
+        self._tmpdir = None
+        self._files = None
+        self._record = np.dtype([('fp', '<u8', (bits // 64,)), ('row', '<i8')])
+
+    def add(self, fps: np.ndarray):
+        if not self.spilled:
+            # Growing doubles the table, so spill before that would cross the budget
+            if self._set.nbytes_for(len(self._set) + len(fps)) > self.memory_bytes:
+                self._spill()
+            else:
+                self._masks.append(self._set.add(fps))
+                self.rows += len(fps)
+                return
+        self._write(fps, np.arange(self.rows, self.rows + len(fps)))
+        self._masks.append(np.zeros(len(fps), dtype=bool))
+        self.rows += len(fps)
+
+    def _partition_of(self, fps: np.ndarray) -> np.ndarray:
+        shift = np.uint64(64 - (self.partitions - 1).bit_length())
+        return (fps[:, 0] >> shift).astype(np.int64) if shift < 64 else np.zeros(len(fps), dtype=np.int64)
+
+    def _write(self, fps: np.ndarray, rows: np.ndarray):
+        records = np.empty(len(fps), dtype=self._record)
+        records['fp'] = fps.reshape(len(fps), self.bits // 64)
+        records['row'] = rows
+        part = self._partition_of(records['fp'])
+        order = np.argsort(part, kind='stable')
+        bounds = np.searchsorted(part[order], np.arange(self.partitions + 1))
+        for p in np.flatnonzero(np.diff(bounds)):
+            records[order[bounds[p]:bounds[p + 1]]].tofile(self._files[p])
+
+    def _spill(self):
+        logger = logging.getLogger(__name__)
+        self._tmpdir = tempfile.mkdtemp(prefix='dedup-', dir=self.spill_dir)
+        self._files = [open(os.path.join(self._tmpdir, f'{p:04d}.bin'), 'wb') for p in range(self.partitions)]
+        logger.info(f"Fingerprint set reached {self._set.nbytes / 2**20:.0f} MB, spilling to {self._tmpdir}")
+        # Already-kept fingerprints go first with row -1: any later copy is a duplicate
+        seen = self._set.items()
+        self._write(seen, np.full(len(seen), -1))
+        self._set = None
+        self.spilled = True
+
+    def keep_mask(self) -> np.ndarray:
+        """Returns the keep='first' mask over all rows added so far and releases spill files."""
+        keep = np.concatenate(self._masks) if self._masks else np.zeros(0, dtype=bool)
+        if not self.spilled:
+            return keep
+        try:
+            for f in self._files:
+                f.close()
+            for f in self._files:
+                records = np.fromfile(f.name, dtype=self._record)
+                if not len(records):
+                    continue
+                _, first = np.unique(_as_void(records['fp']), return_index=True)
+                rows = records['row'][first]
+                keep[rows[rows >= 0]] = True
+        finally:
+            self.close()
+        return keep
+
+    def close(self):
+        if self._tmpdir:
+            for f in self._files:
+                f.close()
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
@@ -1,4 +1,5 @@
 import regex
+import numpy as np
 
 class LinguisticValidator:
     """
@@ -15,6 +16,9 @@ class LinguisticValidator:
     
     CH_BENGALI_RA = '\u09B0'  # র
     
+    # Strings per UTF-32 buffer in the batch API (bounds the temporary arrays)
+    BATCH_CHUNK = 100_000
+    
     @staticmethod
     def get_script_stats(text: str) -> dict:
         """
@@ -72,3 +76,78 @@ class LinguisticValidator:
         # because they are valid Assamese words too, provided no Bengali logic is found.
         
         return True
+
+    @staticmethod
+    def _script_counts_batch(texts):
+        """
+        Per-string length, Indic-block count and ৰ/ৱ and র counts, in one pass.
+        
+        Each chunk of strings is joined into one UTF-32 buffer and scanned once as
+        a NumPy codepoint array; per-string counts are segment sums (reduceat)
+        over the string boundaries.
+        """
+        texts = [t if isinstance(t, str) else '' for t in texts]
+        n = len(texts)
+        lengths = np.zeros(n, dtype=np.int64)
+        indic = np.zeros(n, dtype=np.int64)
+        assamese = np.zeros(n, dtype=np.int64)
+        bengali = np.zeros(n, dtype=np.int64)
+        
+        step = LinguisticValidator.BATCH_CHUNK
+        for lo in range(0, n, step):
+            chunk = texts[lo:lo + step]
+            hi = lo + len(chunk)
+            chunk_lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+            starts = np.cumsum(chunk_lengths) - chunk_lengths
+            
+            buf = ''.join(chunk).encode('utf-32-le', 'surrogatepass')
+            cps = np.frombuffer(buf, dtype='<u4')
+            
+            # reduceat needs valid, non-empty segments; empty strings keep their zeros
+            nonempty = chunk_lengths > 0
+            seg_starts = starts[nonempty]
+            rows = np.arange(lo, hi)[nonempty]
+            
+            def segment_counts(mask):
+                if len(seg_starts) == 0:
+                    return 0
+                return np.add.reduceat(mask.view(np.uint8), seg_starts, dtype=np.int64)
+            
+            lengths[lo:hi] = chunk_lengths
+            indic[rows] = segment_counts((cps >= 0x0980) & (cps <= 0x09FF))
+            assamese[rows] = segment_counts((cps == 0x09F0) | (cps == 0x09F1))
+            bengali[rows] = segment_counts(cps == 0x09B0)
+        
+        return lengths, indic, assamese, bengali
+
+    @staticmethod
+    def get_script_stats_batch(texts) -> dict:
+        """
+        Vectorized get_script_stats for a list or pandas Series of strings.
+        Non-string entries (e.g. NaN) are treated as empty strings.
+        
+        Returns:
+            dict: 'indic_ratio' (float64), 'has_assamese_unique' and
+                  'has_bengali_unique' (bool) arrays, aligned with the input.
+        """
+        lengths, indic, assamese, bengali = LinguisticValidator._script_counts_batch(texts)
+        indic_ratio = np.zeros(len(lengths), dtype=np.float64)
+        nonempty = lengths > 0
+        indic_ratio[nonempty] = indic[nonempty] / lengths[nonempty]
+        
+        return {
+            "indic_ratio": indic_ratio,
+            "has_assamese_unique": assamese > 0,
+            "has_bengali_unique": bengali > 0
+        }
+
+    @staticmethod
+    def is_assamese_script_batch(texts, threshold: float = 0.5) -> np.ndarray:
+        """
+        Vectorized is_assamese_script; same criteria, one boolean per input string.
+        """
+        lengths, indic, _, bengali = LinguisticValidator._script_counts_batch(texts)
+        nonempty = lengths > 0
+        indic_ratio = np.zeros(len(lengths), dtype=np.float64)
+        indic_ratio[nonempty] = indic[nonempty] / lengths[nonempty]
+        return nonempty & (indic_ratio >= threshold) & (bengali == 0)
@@ -0,0 +1,172 @@
+import logging
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .fingerprints import text_fingerprints, FingerprintSet
+from src.utils.file_io import iter_table, write_table
+from src.utils import metrics
+
+DEFAULT_STRATA = ('source_type', 'channel_category')
+# Stratum value of rows that lack a strata column or have it empty
+UNKNOWN = 'unknown'
+# Looked up in this order when no --text_column / --id_column is given
+TEXT_COLUMNS = ('sentence_no_emoji', 'sentence_original', 'processed_text', 'text')
+
+
+def sample_ids(texts) -> list:
+    """
+    Stable ID of a row without an ID column: its 64-bit text fingerprint in hex.
+    """
+    return [format(fp, '016x') for fp in text_fingerprints(texts)[:, 0].tolist()]
+
+
+def load_excluded(paths: list, column: str = 'sample_id', chunksize: int = 200_000) -> FingerprintSet:
+    """
+    Hashes already-annotated IDs into a fingerprint set.
+
+    Args:
+        paths (list): CSV/Parquet tables with the ID column, or .txt files with one ID per line.
+        column (str): ID column of the tables.
+
+    Returns:
+        FingerprintSet: Fingerprints of the IDs (see `stratified_sample`).
+    """
+    excluded = FingerprintSet()
+    for path in paths:
+        if path.lower().endswith('.txt'):
+            with open(path, encoding='utf-8') as f:
+                ids = [line.strip() for line in f if line.strip()]
+            excluded.add(text_fingerprints(ids))
+            continue
+        for chunk in iter_table(path, columns=[column], chunksize=chunksize):
+            excluded.add(text_fingerprints(chunk[column].dropna().astype(str)))
+    return excluded
+
+
+def _strata_labels(chunk: pd.DataFrame, strata: tuple) -> np.ndarray:
+    parts = []
+    for col in strata:
+        if col in chunk.columns:
+            values = chunk[col].astype(object).where(chunk[col].notna(), UNKNOWN).astype(str)
+            parts.append(values.replace('', UNKNOWN))
+        else:
+            parts.append(pd.Series(UNKNOWN, index=chunk.index))
+    labels = parts[0]
+    for part in parts[1:]:
+        labels = labels + ' / ' + part
+    return labels.to_numpy(dtype=object)
+
+
+def stratified_sample(file_paths: list, output_path: str, per_stratum: int, strata=DEFAULT_STRATA,
+                      seed: int = 0, exclude: list = None, exclude_column: str = 'sample_id',
+                      id_column: str = None, text_column: str = None, chunksize: int = 50_000) -> dict:
+    """
+    Draws up to `per_stratum` rows uniformly at random from every stratum, in one pass.
+
+    Every row gets a random key from a generator seeded with `seed`, and each
+    stratum keeps the rows with the `per_stratum` smallest keys (a bottom-k
+    reservoir, i.e. a uniform sample without replacement). Keys are drawn for
+    every row in input order, so the sample depends only on the inputs and
+    the seed, not on the chunk size. Rows that cannot beat their stratum's
+    current k-th key are dropped straight away, so memory holds one chunk
+    plus at most `per_stratum` rows per stratum.
+
+    Each sampled row carries a `sample_id`: the value of `id_column`, or the
+    hex text fingerprint. Rows whose ID appears in the `exclude` files
+    (e.g. the sample_id column of earlier, already annotated batches) are
+    never drawn.
+
+    Args:
+        file_paths (list): CSV/Parquet inputs.
+        output_path (str): Sample table (format by extension), in random order.
+        per_stratum (int): Rows drawn per stratum.
+        strata (tuple): Columns whose value combination defines a stratum; rows
+                        missing a column count as 'unknown' for it.
+        seed (int): Random seed.
+        exclude (list): Files of IDs to leave out (see load_excluded).
+        exclude_column (str): ID column of the exclude tables.
+        id_column (str): Input column holding row IDs (default: text fingerprint).
+        text_column (str): Text used for fingerprint IDs (default: first of TEXT_COLUMNS present).
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        dict: Rows read, rows excluded, and per-stratum population and sample sizes.
+    """
+    logger = logging.getLogger(__name__)
+    strata = tuple(strata)
+    rng = np.random.default_rng(seed)
+    excluded = load_excluded(exclude, column=exclude_column) if exclude else None
+    if excluded is not None:
+        logger.info(f"Excluding {len(excluded)} already-annotated IDs")
+
+    reservoir = None
+    thresholds = {}
+    population = Counter()
+    rows_read = 0
+    rows_excluded = 0
+    for fp in file_paths:
+        missing_warned = False
+        file_rows = 0
+        for chunk in iter_table(fp, chunksize=chunksize):
+            keys = rng.random(len(chunk))
+            file_rows += len(chunk)
+            if not missing_warned and not set(strata) <= set(chunk.columns):
+                logger.warning(f"{fp} has no {', '.join(c for c in strata if c not in chunk.columns)} column; "
+                               f"its rows count as '{UNKNOWN}' there")
+                missing_warned = True
+
+            if id_column and id_column not in chunk.columns:
+                raise KeyError(f"Column '{id_column}' not found in {fp}")
+            column = id_column or text_column or next((c for c in TEXT_COLUMNS if c in chunk.columns), None)
+            if column is None or column not in chunk.columns:
+                raise KeyError(f"No text column in {fp}; pass text_column or id_column")
+
+            def row_ids(mask):
+                values = chunk[column][mask]
+                if id_column:
+                    return values.astype(str).to_numpy(dtype=object)
+                return np.array(sample_ids(values.fillna('').astype(str)), dtype=object)
+
+            labels = _strata_labels(chunk, strata)
+            keep = np.ones(len(chunk), dtype=bool)
+            if excluded is not None:
+                keep = ~excluded.contains(text_fingerprints(row_ids(keep)))
+                rows_excluded += int((~keep).sum())
+            population.update(labels[keep].tolist())
+
+            # Only rows below their stratum's current k-th smallest key can enter the reservoir
+            limit = pd.Series(labels).map(thresholds).fillna(np.inf).to_numpy()
+            keep &= keys < limit
+            if not keep.any():
+                continue
+            # IDs are computed for these candidates only
+            candidates = chunk[keep].assign(sample_id=row_ids(keep), stratum=labels[keep], _key=keys[keep])
+            reservoir = candidates if reservoir is None else pd.concat([reservoir, candidates], ignore_index=True)
+            reservoir = reservoir.sort_values('_key', kind='stable')
+            reservoir = reservoir[reservoir.groupby('stratum', sort=False).cumcount() < per_stratum]
+            full = reservoir.groupby('stratum', sort=False)['_key'].agg(['size', 'max'])
+            thresholds = full.loc[full['size'] >= per_stratum, 'max'].to_dict()
+        rows_read += file_rows
+        metrics.records('sample', file_rows)
+
+    if reservoir is None:
+        logger.warning("No rows to sample from.")
+        return None
+    sample = reservoir.sort_values('_key', kind='stable').drop(columns='_key').reset_index(drop=True)
+    write_table(sample, output_path)
+
+    drawn = sample['stratum'].value_counts().to_dict()
+    small = [s for s, n in population.items() if n < per_stratum]
+    if small:
+        logger.warning(f"{len(small)} strata have fewer than {per_stratum} rows and were taken whole: "
+                       f"{', '.join(sorted(small))}")
+    logger.info(f"Sampled {len(sample)} rows from {len(population)} strata ({rows_read} read, "
+                f"{rows_excluded} excluded) to {output_path}")
+    return {
+        'rows_read': rows_read,
+        'rows_excluded': rows_excluded,
+        'sampled': len(sample),
+        'strata': {s: {'population': population[s], 'sampled': drawn.get(s, 0)} for s in sorted(population)},
+    }
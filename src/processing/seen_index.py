@@ -0,0 +1,159 @@
+import os
+import time
+import sqlite3
+import logging
+
+import numpy as np
+
+from .fingerprints import text_fingerprints
+
+# SQLite caps bound parameters per statement (999 on older builds)
+_LOOKUP_BATCH = 900
+
+
+def normalize_key(text) -> str:
+    """
+    Canonical form a text is fingerprinted under: whitespace runs collapsed and trimmed.
+
+    Both the scrapers (on processed_text) and deduplication use this, so a text
+    is recognised whichever stage saw it first.
+    """
+    if not isinstance(text, str):
+        return ''
+    return ' '.join(text.split())
+
+
+def seen_fingerprints(texts) -> np.ndarray:
+    """
+    Signed 64-bit fingerprints of the normalized texts (SQLite INTEGER keys).
+    """
+    keys = [normalize_key(t) for t in texts]
+    return text_fingerprints(keys, bits=64)[:, 0].view(np.int64)
+
+
+class SeenIndex:
+    """
+    Persistent set of text fingerprints shared across runs and pipeline stages.
+
+    Fingerprints live as INTEGER PRIMARY KEYs of an SQLite table in WAL mode,
+    so lookups are B-tree probes, several processes can read while one writes,
+    and the file stays around 20 bytes per text. Like JobManifest, new
+    fingerprints are staged in memory and only become durable on `commit()`,
+    which the scrape jobs tie to their output flushes: a text is never marked
+    seen before it is on disk.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # The `run` command opens the index on the main thread and uses it from its
+        # dedup stage thread; it is never used by two threads at once
+        self.conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen (fp INTEGER PRIMARY KEY, added_at REAL)")
+        self.conn.commit()
+        self._staged = {}
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0] + len(self._staged)
+
+    def contains_many(self, fps) -> np.ndarray:
+        """
+        Batched lookup of fingerprints (committed or staged).
+
+        Returns:
+            np.ndarray: Boolean mask, True where the fingerprint is already known.
+        """
+        fps = np.asarray(fps, dtype=np.int64)
+        found = set()
+        values = fps.tolist()
+        for i in range(0, len(values), _LOOKUP_BATCH):
+            batch = values[i:i + _LOOKUP_BATCH]
+            rows = self.conn.execute(
+                f"SELECT fp FROM seen WHERE fp IN ({','.join('?' * len(batch))})", batch
+            )
+            found.update(r[0] for r in rows)
+        return np.fromiter((v in found or v in self._staged for v in values), dtype=bool, count=len(values))
+
+    def add_many(self, fps):
+        """
+        Stages fingerprints; they become durable on the next `commit()`.
+        """
+        now = time.time()
+        for fp in np.asarray(fps, dtype=np.int64).tolist():
+            self._staged.setdefault(fp, now)
+
+    def add_texts(self, texts):
+        """
+        Stages the fingerprints of non-empty texts.
+        """
+        texts = [t for t in texts if normalize_key(t)]
+        self.add_many(seen_fingerprints(texts))
+
+    def filter_new(self, texts) -> np.ndarray:
+        """
+        Marks texts never seen before (in any run, or earlier in this batch) and stages them.
+        Empty texts are always kept and never recorded.
+
+        Returns:
+            np.ndarray: Boolean mask, True for texts to keep.
+        """
+        texts = list(texts)
+        fps = seen_fingerprints(texts)
+        empty = np.fromiter((not normalize_key(t) for t in texts), dtype=bool, count=len(texts))
+        known = self.contains_many(fps)
+        _, first = np.unique(fps, return_index=True)
+        new = np.zeros(len(fps), dtype=bool)
+        new[first] = True
+        new &= ~known
+        self.add_many(fps[new & ~empty])
+        return new | empty
+
+    def commit(self):
+        """
+        Writes all staged fingerprints in one transaction.
+        """
+        if not self._staged:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen (fp, added_at) VALUES (?, ?)", self._staged.items()
+            )
+        self._staged = {}
+
+    def discard_staged(self):
+        self._staged = {}
+
+    def compact(self, max_age_days: float = None) -> dict:
+        """
+        Optionally forgets fingerprints older than `max_age_days`, then rebuilds the
+        file and truncates the WAL.
+
+        Returns:
+            dict: Entries removed and the file size before/after.
+        """
+        self.commit()
+        size_before = os.path.getsize(self.path)
+        removed = 0
+        if max_age_days is not None:
+            with self.conn:
+                removed = self.conn.execute(
+                    "DELETE FROM seen WHERE added_at < ?", (time.time() - max_age_days * 86400,)
+                ).rowcount
+        self.conn.execute("VACUUM")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_after = os.path.getsize(self.path)
+        self.logger.info(f"Compacted {self.path}: removed {removed} entries, "
+                         f"{size_before / 2**20:.1f} MB -> {size_after / 2**20:.1f} MB")
+        return {"removed": removed, "size_before": size_before, "size_after": size_after}
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,185 @@
+"""
+Sentence segmenter shared by `combine` (aggregation) and `stats`.
+
+Sentences are returned as (start, end) offsets into the original strings,
+so counting never builds substrings and splitting slices each sentence once.
+A batch of documents is scanned as one NumPy codepoint array (as in
+LinguisticValidator._script_counts_batch); boundaries, whitespace trimming
+and empty-sentence removal are all array operations.
+
+Rules:
+  * A sentence ends after a run of terminators: Danda (।), double Danda (॥),
+    '?', '!', and '|' (typed for Danda). Repeated punctuation ("কিয়??!",
+    "।।") stays attached to its sentence instead of producing empty ones.
+  * '.' ends a sentence only when followed by whitespace, a closing quote or
+    the end of the text, so decimals (3.5, ১২.৫) and URLs do not split, and
+    not after a lone Latin initial ("A. K. Sarma").
+  * Ellipses ("..." and "…") are pauses, not boundaries.
+  * Closing quotes and brackets right after the terminator belong to the sentence.
+  * Spans are trimmed of whitespace; spans with nothing but whitespace and
+    punctuation are dropped.
+"""
+import string
+
+import numpy as np
+
+# Documents per codepoint buffer (bounds the temporary arrays)
+BATCH_CHUNK = 100_000
+
+TERMINATORS = '।॥?!|'
+PERIOD = '.'
+ELLIPSIS = '…'
+CLOSERS = '"\'”’»)]}'
+# Codepoints of everything str.isspace() accepts
+WHITESPACE = ''.join(map(chr, [0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20, 0x85, 0xA0, 0x1680,
+                               *range(0x2000, 0x200B), 0x2028, 0x2029, 0x202F, 0x205F, 0x3000]))
+
+
+# Character classes (bit flags) looked up per codepoint in one table
+_SPACE, _TERMINATOR, _PERIOD, _CLOSER, _PUNCT, _LATIN = 1, 2, 4, 8, 16, 32
+
+
+def _class_table() -> np.ndarray:
+    table = np.zeros(max(map(ord, WHITESPACE + TERMINATORS + CLOSERS + ELLIPSIS)) + 2, dtype=np.uint8)
+    for chars, flags in ((WHITESPACE, _SPACE), (TERMINATORS, _TERMINATOR | _PUNCT), (PERIOD, _PERIOD | _PUNCT),
+                         (ELLIPSIS, _PUNCT), (CLOSERS, _CLOSER | _PUNCT),
+                         (string.ascii_letters, _LATIN)):
+        for c in chars:
+            table[ord(c)] |= flags
+    return table
+
+
+_CLASSES = _class_table()
+# Codepoints past the table share its (empty) last entry
+_OTHER = len(_CLASSES) - 1
+
+
+def _segment_chunk(texts: list, trim: bool = True) -> tuple:
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    starts = np.cumsum(lengths) - lengths
+    n = int(lengths.sum())
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    cps = np.frombuffer(''.join(texts).encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    cls = _CLASSES[np.minimum(cps, _OTHER)]
+
+    # Classes of the neighbours, with a space standing in for "outside this document"
+    first = np.zeros(n + 1, dtype=bool)
+    first[starts] = True
+    first[n] = True
+    prev = np.empty(n, dtype=np.uint8)
+    prev[0] = _SPACE
+    prev[1:] = cls[:-1]
+    prev[first[:n]] = _SPACE
+    nxt = np.empty(n, dtype=np.uint8)
+    nxt[:-1] = cls[1:]
+    nxt[first[1:]] = _SPACE
+    prev2 = np.empty(n, dtype=np.uint8)
+    prev2[0] = _SPACE
+    prev2[1:] = prev[:-1]
+    prev2[first[:n]] = _SPACE
+
+    # '.' ends a sentence before a space / closer / the end, unless part of an
+    # ellipsis or after a lone Latin initial
+    initial = (prev & _LATIN > 0) & (prev2 & _SPACE > 0)
+    full_stop = (cls & _PERIOD > 0) & (prev & _PERIOD == 0) & (nxt & _PERIOD == 0) \
+        & (nxt & (_SPACE | _CLOSER) > 0) & ~initial
+
+    # Terminator runs, extended over closing quotes/brackets that follow them
+    ends_sentence = (cls & _TERMINATOR > 0) | full_stop
+    closer = cls & _CLOSER > 0
+    for _ in range(2):
+        follows = np.zeros(n, dtype=bool)
+        follows[1:] = ends_sentence[:-1]
+        follows &= ~first[:n]
+        ends_sentence |= closer & follows
+    run_end = ends_sentence.copy()
+    run_end[:-1] &= ~ends_sentence[1:] | first[1:n]
+
+    # Segment boundaries: every document start, every end of a terminator run
+    bounds = first.copy()
+    bounds[1:] |= run_end
+    bounds = np.flatnonzero(bounds)
+    seg_start, seg_end = bounds[:-1], bounds[1:]
+
+    # Keep segments holding at least one character that is not space or punctuation
+    keep = np.logical_or.reduceat(cls & (_SPACE | _PUNCT) == 0, seg_start)
+    seg_start, seg_end = seg_start[keep], seg_end[keep]
+
+    if trim:
+        # Step kept segments past their (few) leading / trailing spaces; content stops both walks
+        space = cls & _SPACE > 0
+        seg_start, seg_end = seg_start.copy(), seg_end.copy()
+        todo = np.flatnonzero(space[seg_start])
+        while len(todo):
+            seg_start[todo] += 1
+            todo = todo[space[seg_start[todo]]]
+        todo = np.flatnonzero(space[seg_end - 1])
+        while len(todo):
+            seg_end[todo] -= 1
+            todo = todo[space[seg_end[todo] - 1]]
+
+    # Empty documents share their start with the next one; 'right' picks that non-empty one
+    doc = np.searchsorted(starts, seg_start, side='right') - 1
+    return doc, seg_start - starts[doc], seg_end - starts[doc]
+
+
+def segment_batch(texts, trim: bool = True) -> tuple:
+    """
+    Sentence spans of many documents.
+
+    Args:
+        texts (list): Strings (or a pandas Series); non-strings count as empty.
+        trim (bool): Exclude surrounding whitespace from the spans (not needed for counting).
+
+    Returns:
+        tuple: (doc, start, end) int64 arrays, one entry per sentence in
+               document order; texts[doc[i]][start[i]:end[i]] is sentence i.
+    """
+    texts = [t if isinstance(t, str) else '' for t in texts]
+    docs, starts, ends = [], [], []
+    for lo in range(0, len(texts), BATCH_CHUNK):
+        doc, start, end = _segment_chunk(texts[lo:lo + BATCH_CHUNK], trim=trim)
+        docs.append(doc + lo)
+        starts.append(start)
+        ends.append(end)
+    if not docs:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    return np.concatenate(docs), np.concatenate(starts), np.concatenate(ends)
+
+
+def segment(text: str) -> list:
+    """
+    (start, end) spans of the sentences of one text.
+    """
+    _, starts, ends = segment_batch([text])
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def split_sentences(text: str) -> list:
+    """
+    The sentences of one text, as strings.
+    """
+    return [text[start:end] for start, end in segment(text)]
+
+
+def split_batch(texts) -> tuple:
+    """
+    Sentences of many documents, as strings.
+
+    Returns:
+        tuple: (doc, sentences) - the document index of every sentence and the sentence strings.
+    """
+    texts = [t if isinstance(t, str) else '' for t in texts]
+    doc, starts, ends = segment_batch(texts)
+    return doc, [texts[d][s:e] for d, s, e in zip(doc.tolist(), starts.tolist(), ends.tolist())]
+
+
+def count_batch(texts) -> np.ndarray:
+    """
+    Number of sentences in each document, without building any substring.
+    """
+    doc, _, _ = segment_batch(texts, trim=False)
+    return np.bincount(doc, minlength=len(texts)).astype(np.int64)
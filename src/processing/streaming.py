@@ -0,0 +1,121 @@
+"""
+Generator stages for the fused `run` command.
+
+Each stage takes an iterable of DataFrame chunks and yields chunks, so the
+stages can be chained with src.utils.parallel.pipeline (one thread per stage,
+bounded queues in between) and no intermediate file is written unless a tap
+is inserted.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .text import clean_text
+from .filtering import reject_reasons, row_thresholds
+from .fingerprints import text_fingerprints, FingerprintSet
+from .aggregation import split_chunk
+from src.utils.file_io import TableWriter
+from src.utils import metrics
+
+def batch_records(records, batch_size: int = 1000):
+    """
+    Groups record dicts into DataFrames of `batch_size` rows; DataFrames pass through.
+    """
+    batch = []
+    for record in records:
+        if isinstance(record, pd.DataFrame):
+            yield record
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+def clean_stage(chunks):
+    """
+    Adds `processed_text` (clean_text of `text`, or of an existing `processed_text`).
+    """
+    for chunk in chunks:
+        column = 'text' if 'text' in chunk.columns else 'processed_text'
+        chunk['processed_text'] = [clean_text(t) for t in chunk[column].tolist()]
+        yield chunk
+
+
+def validate_stage(chunks, default_source: str = None, thresholds: dict = None):
+    """
+    Keeps rows whose processed_text passes the Assamese script check, with the
+    threshold of the row's source (`source_type` column, else `default_source`).
+    """
+    for chunk in chunks:
+        sources = chunk['source_type'].astype(str).tolist() if 'source_type' in chunk.columns \
+            else [default_source or ''] * len(chunk)
+        with metrics.timer('validate_seconds', stage='validate'):
+            reasons, _ = reject_reasons(chunk['processed_text'].tolist(), row_thresholds(sources, thresholds))
+        accepted = reasons == ''
+        metrics.incr('records_accepted_total', int(accepted.sum()), stage='validate')
+        for reason, count in zip(*np.unique(reasons[~accepted].astype(str), return_counts=True)):
+            metrics.incr('records_rejected_total', int(count), stage='validate', reason=reason)
+        chunk = chunk[accepted].copy()
+        chunk['is_assamese'] = True
+        if not chunk.empty:
+            yield chunk
+
+
+def dedup_stage(chunks, seen_index=None):
+    """
+    Drops rows whose processed_text appeared earlier in the stream (keep='first'),
+    and, with a SeenIndex, rows collected by earlier runs.
+    """
+    seen = FingerprintSet()
+    for chunk in chunks:
+        chunk = chunk[seen.add(text_fingerprints(chunk['processed_text']))]
+        if seen_index is not None:
+            chunk = chunk[seen_index.filter_new(chunk['processed_text'].tolist())]
+        if not chunk.empty:
+            yield chunk
+
+
+def split_stage(chunks, label: str = ''):
+    """
+    Splits documents into unique sentences (as in aggregate_and_split).
+
+    `label` plays the role of the input file name for source detection; chunks
+    read from files carry their own in a `source_file` column.
+    """
+    seen = FingerprintSet()
+    for chunk in chunks:
+        origin = chunk['source_file'].iat[0] if 'source_file' in chunk.columns else label
+        sentences = split_chunk(chunk, origin)
+        sentences = sentences[seen.add(text_fingerprints(sentences['sentence_no_emoji']))]
+        if not sentences.empty:
+            yield sentences
+
+
+def stats_stage(chunks, stats, text_column: str = 'sentence_original'):
+    """
+    Feeds every chunk into a StatsPartial on its way through.
+    """
+    for chunk in chunks:
+        sources = chunk['source_type'].astype(str) if 'source_type' in chunk.columns \
+            else pd.Series('unknown', index=chunk.index)
+        stats.add_chunk(chunk[text_column], sources)
+        yield chunk
+
+
+def tap(path: str):
+    """
+    Returns a pass-through stage that also persists every chunk to `path`
+    (CSV or Parquet by extension).
+    """
+    def stage(chunks):
+        logger = logging.getLogger(__name__)
+        with TableWriter(path) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+                yield chunk
+        logger.info(f"Tapped {writer.count} rows to {path}")
+    return stage
@@ -2,14 +2,47 @@ import re
 import unicodedata
 import regex
 
+# Precompiled once; these run for every record in the pipeline.
+# \p{Emoji} also covers ASCII digits, '#' and '*' (keycap bases); those are kept.
+EMOJI_PATTERN = regex.compile(r'[\p{Emoji}--[\x00-\x7F]]+', regex.V1)
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+# Indian mobile numbers, optionally with +91 / 91 prefix (ASCII digits only)
+PHONE_PATTERN = re.compile(r'(?<![0-9])(?:\+?91[\s-]?)?[6-9][0-9]{4}[\s-]?[0-9]{5}(?![0-9])')
+
+# One alternation per option set so normalize_text does a single regex pass
+_FUSED_PARTS = {
+    'url': URL_PATTERN.pattern,
+    'email': EMAIL_PATTERN.pattern,
+    'phone': PHONE_PATTERN.pattern,
+    'emoji': EMOJI_PATTERN.pattern,
+}
+_FUSED_REPLACEMENTS = {'url': '', 'email': '<EMAIL>', 'phone': '<PHONE>', 'emoji': ''}
+_FUSED_PATTERNS = {}
+
+
+def _fused_pattern(mask_pii: bool, strip_emojis: bool):
+    key = (mask_pii, strip_emojis)
+    if key not in _FUSED_PATTERNS:
+        names = ['url'] + (['email', 'phone'] if mask_pii else []) + (['emoji'] if strip_emojis else [])
+        _FUSED_PATTERNS[key] = regex.compile(
+            '|'.join(f'(?P<{name}>{_FUSED_PARTS[name]})' for name in names), regex.V1
+        )
+    return _FUSED_PATTERNS[key]
+
+
+def _fused_replace(match) -> str:
+    return _FUSED_REPLACEMENTS[match.lastgroup]
+
+
 def remove_emojis(text: str) -> str:
     """
-    Removes emojis and other graphic symbols from text.
+    Removes emojis and other graphic symbols from text (ASCII, digits included, is kept).
     """
     if not isinstance(text, str):
         return ""
     # Remove unicode emoji characters
-    return regex.sub(r'\p{Emoji}', '', text)
+    return EMOJI_PATTERN.sub('', text)
 
 def clean_text(text: str) -> str:
     """
@@ -27,7 +60,7 @@ def clean_text(text: str) -> str:
     text = unicodedata.normalize('NFC', text)
     
     # Remove URLs
-    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = URL_PATTERN.sub('', text)
     
     # Strip whitespace
     text = text.strip()
@@ -39,5 +72,44 @@ def anonymize_text(text: str) -> str:
     Removes potentially identifying patterns like emails or phone numbers.
     """
     # Remove emails
-    text = re.sub(r'\S+@\S+', '<EMAIL>', text)
+    text = EMAIL_PATTERN.sub('<EMAIL>', text)
+    # Remove phone numbers
+    text = PHONE_PATTERN.sub('<PHONE>', text)
     return text
+
+def normalize_text(text: str, mask_pii: bool = True, strip_emojis: bool = False) -> str:
+    """
+    Fused clean_text + anonymize_text (+ optional emoji removal) in one regex pass.
+
+    Processing steps:
+    1. Unicode Normalization (NFC), skipped when the text is already NFC
+    2. URL removal, email/phone masking and emoji removal as one alternation
+    3. Trailing whitespace removal
+
+    Matches are taken leftmost-first, so a token containing '@' that starts
+    before a URL is masked as an email rather than removed as a URL.
+    """
+    if not isinstance(text, str):
+        return ""
+
+    if not unicodedata.is_normalized('NFC', text):
+        text = unicodedata.normalize('NFC', text)
+
+    text = _fused_pattern(mask_pii, strip_emojis).sub(_fused_replace, text)
+
+    return text.strip()
+
+def normalize_batch(texts, mask_pii: bool = True, strip_emojis: bool = False) -> list:
+    """
+    Applies normalize_text to a list of strings (unit of work for process pools).
+    """
+    pattern = _fused_pattern(mask_pii, strip_emojis)
+    out = []
+    for text in texts:
+        if not isinstance(text, str):
+            out.append("")
+            continue
+        if not unicodedata.is_normalized('NFC', text):
+            text = unicodedata.normalize('NFC', text)
+        out.append(pattern.sub(_fused_replace, text).strip())
+    return out
@@ -0,0 +1,171 @@
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache for the news scraper.
+
+    Bodies are stored zlib-compressed under the SHA-256 of their content
+    (identical pages fetched from several URLs share one blob), and an
+    SQLite index maps each URL to its body plus the ETag / Last-Modified
+    validators needed for conditional revalidation.
+
+    Entries younger than `ttl` seconds are served without touching the
+    network; older ones are revalidated with If-None-Match /
+    If-Modified-Since. When the cache grows past `max_bytes` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 7 * 24 * 3600, max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(cache_dir, 'blobs'), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, body_hash TEXT, size INTEGER,"
+            " etag TEXT, last_modified TEXT, fetched_at REAL, last_access REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_body_hash ON responses (body_hash)")
+        self.conn.commit()
+        self._total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT body_hash, size FROM responses)"
+        ).fetchone()[0]
+
+    def _blob_path(self, body_hash: str) -> str:
+        return os.path.join(self.cache_dir, 'blobs', body_hash[:2], body_hash + '.z')
+
+    def lookup(self, url: str):
+        """
+        Returns the index entry for a URL as a dict, or None if it isn't cached.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT body_hash, size, etag, last_modified, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'url': url, 'body_hash': row[0], 'size': row[1], 'etag': row[2],
+                'last_modified': row[3], 'fetched_at': row[4]}
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def conditional_headers(self, entry: dict) -> dict:
+        """
+        Builds the revalidation headers for a stale entry.
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read_body(self, entry: dict):
+        """
+        Returns the decompressed body for an entry, or None if the blob is gone.
+        """
+        try:
+            with open(self._blob_path(entry['body_hash']), 'rb') as f:
+                body = zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            self.logger.warning(f"Cached body for {entry['url']} unreadable: {e}")
+            return None
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), entry['url']))
+        return body
+
+    def store(self, url: str, body: bytes, etag: str = None, last_modified: str = None):
+        """
+        Caches a freshly downloaded body and its validators.
+        """
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(body_hash)
+        now = time.time()
+
+        with self._lock:
+            if os.path.exists(path):
+                size = os.path.getsize(path)
+                is_new_blob = False
+            else:
+                data = zlib.compress(body, 6)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                size = len(data)
+                is_new_blob = True
+
+            old = self.conn.execute("SELECT body_hash FROM responses WHERE url = ?", (url,)).fetchone()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (url, body_hash, size, etag, last_modified, fetched_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, body_hash, size, etag, last_modified, now, now)
+                )
+            if is_new_blob:
+                self._total_bytes += size
+            if old and old[0] != body_hash:
+                self._release_blob(old[0])
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def touch(self, url: str):
+        """
+        Marks an entry as revalidated (HTTP 304), restarting its TTL.
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE responses SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+
+    def urls(self):
+        """
+        Returns every cached URL (used for offline replay).
+        """
+        with self._lock:
+            return [r[0] for r in self.conn.execute("SELECT url FROM responses ORDER BY url")]
+
+    def _release_blob(self, body_hash: str):
+        # Blobs are shared between URLs with identical bodies; only drop unreferenced ones
+        still_used = self.conn.execute(
+            "SELECT 1 FROM responses WHERE body_hash = ? LIMIT 1", (body_hash,)
+        ).fetchone()
+        if still_used:
+            return
+        path = self._blob_path(body_hash)
+        if os.path.exists(path):
+            self._total_bytes -= os.path.getsize(path)
+            os.remove(path)
+
+    def _evict(self):
+        # Evict least recently used entries down to 90% of the budget
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT url, body_hash FROM responses ORDER BY last_access").fetchall()
+        evicted = 0
+        for url, body_hash in rows:
+            if self._total_bytes <= target:
+                break
+            with self.conn:
+                self.conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._release_blob(body_hash)
+            evicted += 1
+        self.logger.info(f"Evicted {evicted} cached responses ({self._total_bytes} bytes in cache)")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,308 @@
+"""
+HTML extraction backends for the news scraper.
+
+Every backend returns the same thing the original BeautifulSoup code did:
+the `get_text(strip=True)` text of every <p> in document order (nested ones
+included) and the page title (first <h1>, falling back to og:title).
+
+- 'bs4':      full BeautifulSoup tree with html.parser (the reference).
+- 'stream':   event-driven stdlib HTMLParser that never builds a tree and
+              replays html.parser's open-element stack to stay identical
+              (tests/test_extract.py compares the two on random markup).
+- 'auto':     'stream', the fastest backend that is identical to 'bs4'.
+
+Two faster-to-write but lossy backends remain for comparison; neither is
+identical to 'bs4' on malformed pages:
+
+- 'strained': BeautifulSoup, but only p/h1/meta subtrees are built. The
+              end tags of dropped elements (e.g. </table>) no longer close
+              an open <p>, so later text can run into it.
+- 'lxml':     lxml.html, when installed. lxml repairs malformed markup
+              differently from html.parser (e.g. it closes an open <p> at a
+              block element).
+"""
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Strings inside these tags are not returned by BeautifulSoup's get_text()
+_SKIP_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+# Tags html.parser closes immediately (see bs4 HTMLTreeBuilder.empty_element_tags)
+_VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+    'menuitem', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+    'command', 'frame', 'image', 'isindex', 'nextid', 'spacer',
+}
+
+
+# html.parser hands over unterminated references like "&#39abc" whole; bs4 keeps
+# the leading number as the reference and the rest as text
+_DECIMAL_PREFIX = re.compile(r'([0-9]+)(.*)', re.S)
+_HEX_PREFIX = re.compile(r'([0-9a-f]+)(.*)', re.S)
+
+
+def _numeric_reference(name: str) -> str:
+    # The HTML spec's numeric reference rules, as BeautifulSoup applies them
+    base, prefix = 10, _DECIMAL_PREFIX
+    if name[:1] in ('x', 'X'):
+        name, base, prefix = name[1:], 16, _HEX_PREFIX
+    extra = ''
+    try:
+        number = int(name, base)
+    except ValueError:
+        match = prefix.match(name)
+        if match is None:
+            return name
+        number, extra = int(match.group(1), base), match.group(2)
+    if number == 0 or number > 0x10ffff or 0xd800 <= number <= 0xdfff:
+        return '\ufffd' + extra
+    if 0x80 <= number <= 0x9f:
+        # References to C1 controls were meant as Windows-1252 bytes
+        try:
+            return bytes([number]).decode('cp1252') + extra
+        except UnicodeDecodeError:
+            pass
+    return chr(number) + extra
+
+
+def _decode(content) -> str:
+    # Same encoding detection BeautifulSoup applies to raw bytes
+    if isinstance(content, str):
+        return content
+    return UnicodeDammit(content, is_html=True).unicode_markup
+
+
+def _title_from_soup(soup) -> str:
+    title_tag = soup.find('h1')
+    title = title_tag.get_text(strip=True) if title_tag else ""
+    # Fallback: if h1 is missing, try og:title meta tag
+    if not title:
+        meta_title = soup.find("meta", property="og:title")
+        if meta_title:
+            title = meta_title.get("content", "")
+    return title
+
+
+def extract_bs4(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    return [p.get_text(strip=True) for p in soup.find_all('p')], _title_from_soup(soup)
+
+
+_STRAINER = SoupStrainer(['p', 'h1', 'meta'])
+
+
+def extract_strained(content):
+    soup = BeautifulSoup(content, 'html.parser', parse_only=_STRAINER)
+    return [p.get_text(strip=True) for p in soup.find_all('p')], _title_from_soup(soup)
+
+
+def _lxml_text(el) -> str:
+    parts = []
+
+    def walk(node):
+        if isinstance(node.tag, str) and node.tag not in _SKIP_TEXT_TAGS:
+            if node.text:
+                parts.append(node.text.strip())
+            for child in node:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail.strip())
+        elif not isinstance(node.tag, str):
+            # Comments and processing instructions contribute only their tail
+            return
+
+    walk(el)
+    return ''.join(parts)
+
+
+def extract_lxml(content):
+    if lxml is None:
+        raise ImportError("lxml is not installed")
+    markup = _decode(content)
+    if markup.lstrip().startswith('<?xml'):
+        # lxml refuses str input that carries an XML encoding declaration
+        markup = markup.split('?>', 1)[1]
+    if not markup.strip():
+        return [], ""
+    doc = lxml.html.fromstring(markup)
+
+    paragraphs = [_lxml_text(p) for p in doc.iter('p')]
+    title = ""
+    h1 = next(doc.iter('h1'), None)
+    if h1 is not None:
+        title = _lxml_text(h1)
+    if not title:
+        for meta in doc.iter('meta'):
+            if meta.get('property') == 'og:title':
+                title = meta.get('content', "")
+                break
+    return paragraphs, title
+
+
+class _StreamExtractor(HTMLParser):
+    """
+    Collects <p>/<h1> text and og:title from parser events, tracking the same
+    open-element stack BeautifulSoup's html.parser builder would build.
+    """
+
+    def __init__(self):
+        # Character references are resolved the way bs4 does it (see _numeric_reference)
+        super().__init__(convert_charrefs=False)
+        self.pending = []        # adjacent data pieces, joined into one string like bs4
+        self.stack = []          # open tag names
+        self.already_closed = [] # void tags whose next explicit end tag is ignored
+        self.collectors = []     # (stack depth, list of strings, output slot)
+        self.skip_depth = 0      # open script/style/template/... elements
+        self.paragraphs = []
+        self.h1_text = None
+        self.og_title = None
+
+    def handle_starttag(self, tag, attrs):
+        self._open(tag, attrs)
+        if tag in _VOID_TAGS:
+            # bs4 closes void tags itself and later ignores one explicit end tag for them
+            self.already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs)
+        self._pop_to(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.already_closed:
+            self.already_closed.remove(tag)
+            return
+        self._pop_to(tag)
+
+    def _open(self, tag, attrs):
+        self._flush()
+        if tag == 'meta':
+            if self.og_title is None:
+                values = dict(attrs)
+                if values.get('property') == 'og:title':
+                    self.og_title = values.get('content') or ""
+            return
+        if tag in _VOID_TAGS:
+            return
+        self.stack.append(tag)
+        if tag in _SKIP_TEXT_TAGS:
+            self.skip_depth += 1
+        if tag == 'p':
+            self.paragraphs.append("")
+            self.collectors.append((len(self.stack), [], len(self.paragraphs) - 1))
+        elif tag == 'h1' and self.h1_text is None:
+            self.h1_text = ""
+            self.collectors.append((len(self.stack), [], 'h1'))
+
+    def _pop_to(self, tag):
+        self._flush()
+        # Like bs4's _popToTag: close everything down to the most recent match, or ignore
+        if tag not in self.stack:
+            return
+        while self.stack:
+            name = self.stack.pop()
+            self._close(name)
+            if name == tag:
+                break
+
+    def _close(self, name):
+        if name in _SKIP_TEXT_TAGS:
+            self.skip_depth -= 1
+        depth = len(self.stack) + 1
+        if self.collectors and self.collectors[-1][0] == depth:
+            _, parts, slot = self.collectors.pop()
+            text = ''.join(parts)
+            if slot == 'h1':
+                self.h1_text = text
+            else:
+                self.paragraphs[slot] = text
+
+    def _add_text(self, data, cdata=False):
+        # bs4 keeps CDATA as CData strings, which get_text returns even inside template/rt/rp
+        if (self.skip_depth and not cdata) or not self.collectors:
+            return
+        data = data.strip()
+        if data:
+            for _, parts, _ in self.collectors:
+                parts.append(data)
+
+    def _flush(self):
+        if self.pending:
+            self._add_text(''.join(self.pending))
+            self.pending = []
+
+    def handle_data(self, data):
+        self.pending.append(data)
+
+    def handle_entityref(self, name):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.pending.append(character if character is not None else "&%s" % name)
+
+    def handle_charref(self, name):
+        self.pending.append(_numeric_reference(name))
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        # html.parser hands CDATA sections here; BeautifulSoup keeps them as text
+        if data.upper().startswith('CDATA['):
+            self._add_text(data[len('CDATA['):], cdata=True)
+
+    def finish(self):
+        self.close()
+        self._flush()
+        while self.stack:
+            self._close(self.stack.pop())
+
+
+def extract_stream(content):
+    parser = _StreamExtractor()
+    parser.feed(_decode(content))
+    parser.finish()
+    title = parser.h1_text or ""
+    if not title and parser.og_title is not None:
+        title = parser.og_title
+    return parser.paragraphs, title
+
+
+BACKENDS = {
+    'bs4': extract_bs4,
+    'strained': extract_strained,
+    'lxml': extract_lxml,
+    'stream': extract_stream,
+}
+
+
+def available_backends() -> list:
+    return [name for name in BACKENDS if name != 'lxml' or lxml is not None]
+
+
+def get_extractor(backend: str = 'auto'):
+    """
+    Returns the extraction function for a backend name.
+
+    Returns:
+        callable: content (bytes or str) -> (list of paragraph texts, title)
+    """
+    if backend == 'auto':
+        backend = 'stream'
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend '{backend}', choose from {sorted(BACKENDS)} or 'auto'")
+    if backend == 'lxml' and lxml is None:
+        raise ImportError("lxml backend requested but lxml is not installed")
+    return BACKENDS[backend]
@@ -1,29 +1,146 @@
 import logging
 import time
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
-from bs4 import BeautifulSoup
 from .base import BaseScraper
-import random
+from .extract import get_extractor
+from .robots import RobotsCache
+from .throttle import HostThrottle, RETRY_STATUSES, host_of, parse_retry_after
+from src.utils import metrics
 # Import validator to filter paragraph content by language within the scraper
 try:
     from src.processing.linguistic import LinguisticValidator
 except ImportError:
     LinguisticValidator = None
 
+USER_AGENT = 'Mozilla/5.0 (Research Pipeline; Assamese Sentiment Project) requests/2.31'
+
+# Skip reasons that fetching the URL again would not change; any other reason is transient
+FINAL_SKIP_REASONS = frozenset({'robots_disallowed', 'no_assamese_text'})
+
 class NewsScraper(BaseScraper):
     """
     Generic scraper for static news/blog sites.
-    Respects robots.txt and implements rate limiting.
+    Respects robots.txt (Disallow rules and Crawl-delay) and adapts its
+    per-host rate limit to the responses (see HostThrottle).
     Currently configured for a generic structure, can be subclassed for specific sites.
     """
     
-    def __init__(self, delay=2.0):
+    def __init__(self, delay=2.0, max_per_host=1, cache=None, offline=False, extractor='stream',
+                 min_delay=None, retries=3, respect_robots=True):
         self.logger = logging.getLogger(__name__)
         self.delay = delay
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Research Pipeline; Assamese Sentiment Project) requests/2.31'
-        })
+        # 'stream' (and 'auto') match the original BeautifulSoup output exactly
+        self.extract = get_extractor(extractor)
+        # Starts every host at `delay` and speeds up to `min_delay` while it keeps answering
+        self.throttle = HostThrottle(delay=delay, max_per_host=max_per_host, min_delay=min_delay)
+        # Throttled responses (429/5xx) and connection errors are retried this many times
+        self.retries = retries
+        self.robots = RobotsCache(self._fetch_robots, USER_AGENT) if respect_robots else None
+        # Optional ResponseCache; with offline=True pages are only ever served from it
+        self.cache = cache
+        self.offline = offline
+        # requests.Session is not guaranteed to be thread-safe, so each worker gets its own
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, 'session'):
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT})
+            self._local.session = session
+        return self._local.session
+
+    def _get(self, url: str, headers=None):
+        """
+        GET through the per-host throttle. Throttled responses (429/5xx) and
+        connection errors slow the host down and are retried up to
+        `self.retries` times; any other response speeds it back up.
+        
+        Returns:
+            requests.Response: The last response (possibly still a 429/5xx).
+        """
+        host = host_of(url)
+        for attempt in range(self.retries + 1):
+            try:
+                with self.throttle.slot(url):
+                    # Network latency only; the politeness wait is not counted
+                    with metrics.timer('fetch_seconds', host=host):
+                        response = self.session.get(url, timeout=10, headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries:
+                    raise
+                pause = self.throttle.backoff(host, reason='connection')
+                self.logger.warning(f"{type(e).__name__} on {url}, retrying in {pause:.1f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.throttle.success(host)
+                    return response
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                pause = self.throttle.backoff(host, retry_after, reason=str(response.status_code))
+                # A Retry-After beyond the throttle's cap means "not today"
+                if attempt == self.retries or (retry_after or 0) > self.throttle.max_retry_after:
+                    return response
+                self.logger.warning(f"{response.status_code} from {host}, retrying {url} in {pause:.1f}s")
+            metrics.incr('fetch_retries_total', host=host)
+
+    def _fetch_robots(self, robots_url: str):
+        response = self._get(robots_url)
+        return response.status_code, response.text
+
+    def _fetch(self, url: str):
+        """
+        Returns (raw page body, skip reason), going through the response cache
+        when configured. The body is None when offline and the page was never
+        cached, or when robots.txt disallows it ('robots_disallowed') or could
+        not be fetched ('robots_unavailable').
+        """
+        host = host_of(url)
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry:
+            if self.offline or self.cache.is_fresh(entry):
+                body = self.cache.read_body(entry)
+                if body is not None:
+                    metrics.incr('fetch_total', host=host, result='cache_hit')
+                    return body, None
+        if self.offline:
+            self.logger.warning(f"Not in cache, skipping in replay mode: {url}")
+            metrics.incr('fetch_total', host=host, result='cache_miss')
+            return None, None
+        
+        if self.robots is not None:
+            rules = self.robots.rules(url)
+            self.throttle.set_crawl_delay(host, rules.crawl_delay)
+            if rules.unavailable:
+                self.logger.info(f"robots.txt unavailable, skipping for now: {url}")
+                metrics.incr('fetch_total', host=host, result='robots_unavailable')
+                return None, 'robots_unavailable'
+            if not rules.can_fetch(url):
+                self.logger.info(f"Disallowed by robots.txt, skipping: {url}")
+                metrics.incr('fetch_total', host=host, result='robots_disallowed')
+                return None, 'robots_disallowed'
+        
+        headers = self.cache.conditional_headers(entry) if entry else {}
+        response = self._get(url, headers=headers)
+        
+        if response.status_code == 304 and entry:
+            body = self.cache.read_body(entry)
+            if body is not None:
+                self.cache.touch(url)
+                metrics.incr('fetch_total', host=host, result='not_modified')
+                return body, None
+            # Blob went missing behind the index; fetch unconditionally
+            response = self._get(url)
+        
+        metrics.incr('fetch_total', host=host, result=str(response.status_code))
+        response.raise_for_status()
+        if self.cache:
+            self.cache.store(url, response.content,
+                             etag=response.headers.get('ETag'),
+                             last_modified=response.headers.get('Last-Modified'))
+        return response.content, None
 
     def scrape(self, url: str):
         """
@@ -35,28 +152,41 @@ class NewsScraper(BaseScraper):
         Yields:
             dict: Data containing text, title, and source metadata.
         """
-        self.logger.info(f"Fetching: {url}")
+        articles, _ = self.scrape_page(url)
+        yield from articles
+
+    def scrape_page(self, url: str):
+        """
+        Scrapes one news URL, also telling why it yielded no article.
         
-        # Respectful delay with jitter
-        sleep_time = self.delay + random.uniform(0.5, 1.5)
-        time.sleep(sleep_time)
+        Args:
+            url (str): The full URL of the news article.
+            
+        Returns:
+            tuple: (list of article dicts, skip reason or None). The reason is
+                   set when the URL was skipped without an error; reasons in
+                   FINAL_SKIP_REASONS mean fetching it again would not help,
+                   while 'robots_unavailable' is worth retrying later.
+        """
+        self.logger.info(f"Fetching: {url}")
         
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            content, reason = self._fetch(url)
+            if content is None:
+                return [], reason
             
-            # Use 'lxml' if available, else 'html.parser'
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Only <p>, <h1> and og:title are needed; see extract.py for the backends
+            with metrics.timer('parse_seconds'):
+                all_p_texts, title = self.extract(content)
             
             # --- Extraction Logic (Linguistic-based) ---
             # Instead of relying on brittle class names, we fetch all paragraphs
             # and filter them by language. This handles messy CMS structures better.
             
             paragraphs = []
-            all_p_tags = soup.find_all('p')
             
-            for p in all_p_tags:
-                text = p.get_text(strip=True)
+            validate_start = time.perf_counter()
+            for text in all_p_texts:
                 if not text:
                     continue
                     
@@ -72,32 +202,74 @@ class NewsScraper(BaseScraper):
                 if is_valid:
                     paragraphs.append(text)
 
+            metrics.observe('validate_seconds', time.perf_counter() - validate_start, stage='news_paragraphs')
             full_text = "\n".join(paragraphs)
-            
-            # Extract Title
-            title_tag = soup.find('h1')
-            title = title_tag.get_text(strip=True) if title_tag else ""
-            
-            # Fallback: if h1 is missing, try og:title meta tag
-            if not title:
-                meta_title = soup.find("meta", property="og:title")
-                if meta_title:
-                    title = meta_title.get("content", "")
 
             if not full_text:
                 self.logger.warning(f"No Assamese text found in {url}")
-                return []
+                return [], 'no_assamese_text'
 
             # Return simplified object
-            yield {
+            return [{
                 'text': full_text,
                 'title': title,
                 'source_url': url,
                 'scraped_timestamp': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                 'source_type': 'news_article'
-            }
+            }], None
             
         except Exception as e:
             self.logger.error(f"Failed to scrape {url}: {e}")
-            return []
+            metrics.incr('scrape_errors_total', source='news')
+            return [], None
 
+    def scrape_many(self, urls, max_workers: int = 8):
+        """
+        Scrapes many article URLs concurrently, yielding results as they finish.
+        
+        Different hosts are fetched in parallel, while each host keeps its own
+        delay/jitter and in-flight cap through the shared HostThrottle.
+        
+        Args:
+            urls (iterable): Article URLs to fetch.
+            max_workers (int): Global cap on in-flight requests.
+            
+        Yields:
+            tuple: (url, list of article dicts, skip reason or None) for every
+                   URL, in completion order.
+        """
+        pending = defaultdict(deque)
+        for url in urls:
+            pending[host_of(url)].append(url)
+        
+        host_load = defaultdict(int)
+        in_flight = {}
+        # Replaying from the cache sends no requests, so there is no per-host limit to keep
+        per_host = max_workers if self.offline else self.throttle.max_per_host
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            def dispatch():
+                # Round-robin over hosts so one big outlet can't hog every worker
+                progress = True
+                while progress and len(in_flight) < max_workers:
+                    progress = False
+                    for host in list(pending):
+                        if len(in_flight) >= max_workers:
+                            break
+                        if host_load[host] >= per_host:
+                            continue
+                        url = pending[host].popleft()
+                        if not pending[host]:
+                            del pending[host]
+                        host_load[host] += 1
+                        in_flight[pool.submit(self.scrape_page, url)] = (url, host)
+                        progress = True
+            
+            dispatch()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, host = in_flight.pop(future)
+                    host_load[host] -= 1
+                    yield (url, *future.result())
+                dispatch()
@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from src.utils import metrics
+
+
+def parse_crawl_delays(lines) -> dict:
+    """
+    Crawl-delay of every User-agent group, as floats.
+
+    RobotFileParser only accepts whole seconds and ignores values like
+    "Crawl-delay: 0.5", so the delays are read separately.
+
+    Returns:
+        dict: Lower-cased user agent ('*' included) -> seconds.
+    """
+    delays = {}
+    agents, in_rules = [], False
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, value = (part.strip() for part in line.split(':', 1))
+        field = field.lower()
+        if field == 'user-agent':
+            # Consecutive User-agent lines share one group
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            continue
+        in_rules = True
+        if field == 'crawl-delay':
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays.setdefault(agent, delay)
+    return delays
+
+
+class RobotsRules:
+    """
+    Parsed robots.txt of one host: what may be fetched and how fast.
+
+    `unavailable` marks rules standing in for a robots.txt that could not be
+    fetched (server or network error): nothing may be fetched, but unlike a
+    Disallow rule this only lasts until the next successful fetch.
+    """
+
+    def __init__(self, parser: RobotFileParser, user_agent: str, fetched_at: float, ttl: float,
+                 crawl_delays: dict = None, unavailable: bool = False):
+        self.parser = parser
+        self.user_agent = user_agent
+        self.expires = fetched_at + ttl
+        self.crawl_delays = crawl_delays or {}
+        self.unavailable = unavailable
+
+    def can_fetch(self, url: str) -> bool:
+        return self.parser.can_fetch(self.user_agent, url)
+
+    @property
+    def crawl_delay(self) -> float:
+        """
+        Minimum seconds between requests asked for by the site (Crawl-delay,
+        or the interval implied by Request-rate), or None.
+        """
+        delays = []
+        # Same agent matching as RobotFileParser: the product token, by substring
+        token = self.user_agent.split('/')[0].lower()
+        named = [delay for agent, delay in self.crawl_delays.items() if agent != '*' and agent in token]
+        delay = named[0] if named else self.crawl_delays.get('*')
+        if delay is not None:
+            delays.append(delay)
+        rate = self.parser.request_rate(self.user_agent)
+        if rate is not None and rate.requests:
+            delays.append(rate.seconds / rate.requests)
+        return max(delays) if delays else None
+
+
+class RobotsCache:
+    """
+    Fetches and caches robots.txt per host for the news scraper.
+
+    Follows RFC 9309: a missing robots.txt (4xx) allows everything, while a
+    server or network error disallows the whole host. Such rules are marked
+    `unavailable` and only kept for `error_ttl` seconds so a host that was
+    briefly down is retried; successful ones for `ttl` (a day by default).
+
+    Args:
+        fetch (callable): fetch(robots_url) -> (status_code, text); it should
+                          go through the same per-host throttle as the pages.
+        user_agent (str): Matched against the User-agent groups.
+    """
+
+    def __init__(self, fetch, user_agent: str, ttl: float = 24 * 3600, error_ttl: float = 300):
+        self.fetch = fetch
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._host_locks = {}
+        self._rules = {}
+
+    def _host_lock(self, key):
+        with self._lock:
+            if key not in self._host_locks:
+                self._host_locks[key] = threading.Lock()
+            return self._host_locks[key]
+
+    def rules(self, url: str) -> RobotsRules:
+        """
+        Rules for the URL's host, fetching robots.txt on first use or after expiry.
+        """
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc.lower())
+        rules = self._rules.get(key)
+        if rules is not None and rules.expires > time.time():
+            return rules
+        # One fetch per host, even when several workers ask at once
+        with self._host_lock(key):
+            rules = self._rules.get(key)
+            if rules is None or rules.expires <= time.time():
+                rules = self._load(f"{parsed.scheme}://{parsed.netloc}/robots.txt", key[1])
+                self._rules[key] = rules
+            return rules
+
+    def _load(self, robots_url: str, host: str) -> RobotsRules:
+        parser = RobotFileParser(robots_url)
+        crawl_delays = {}
+        ttl = self.ttl
+        unavailable = False
+        try:
+            status, text = self.fetch(robots_url)
+        except Exception as e:
+            self.logger.warning(f"Could not fetch {robots_url} ({e}); not crawling {host} for now")
+            status, text = None, ''
+        if status is not None and 200 <= status < 300:
+            lines = text.splitlines()
+            parser.parse(lines)
+            crawl_delays = parse_crawl_delays(lines)
+            result = 'parsed'
+        elif status is not None and 400 <= status < 500:
+            parser.allow_all = True
+            result = 'missing'
+        else:
+            parser.disallow_all = True
+            ttl = self.error_ttl
+            unavailable = True
+            result = 'error'
+        metrics.incr('robots_total', host=host, result=result)
+        rules = RobotsRules(parser, self.user_agent, time.time(), ttl, crawl_delays, unavailable)
+        if rules.crawl_delay:
+            self.logger.info(f"{host} asks for {rules.crawl_delay:g}s between requests")
+        return rules
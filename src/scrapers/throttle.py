@@ -0,0 +1,168 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from src.utils import metrics
+
+# Responses that mean "slow down" rather than "this page is broken"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def host_of(url: str) -> str:
+    """
+    Returns the lower-cased network location of a URL, used as the politeness key.
+    """
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value) -> float:
+    """
+    Seconds to wait according to a Retry-After header (delta-seconds or an
+    HTTP date), or None when missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class HostThrottle:
+    """
+    Per-host politeness gate shared by scraper worker threads.
+    Each host keeps its own delay/jitter schedule and in-flight cap, so
+    different outlets can be fetched in parallel while every single outlet
+    still sees the pacing of the sequential scraper.
+
+    The delay adapts per host: every throttled response (429/5xx, see
+    `backoff`) multiplies it by `backoff_factor` up to `max_delay`, and every
+    success (`success`) shrinks it by `recovery` down to the host's floor -
+    `min_delay`, or the site's robots.txt Crawl-delay when that is larger
+    (`set_crawl_delay`). A Retry-After header holds the whole host back for
+    that long (capped at `max_retry_after`). Hosts therefore settle at the
+    fastest pace they accept instead of one fixed delay for all.
+    """
+
+    def __init__(self, delay=2.0, jitter=(0.5, 1.5), max_per_host=1, min_delay=None, max_delay=60.0,
+                 backoff_factor=2.0, recovery=0.9, max_retry_after=300.0):
+        self.delay = delay
+        self.jitter = jitter
+        self.max_per_host = max_per_host
+        # Without an explicit floor the starting delay is never undercut
+        self.min_delay = delay if min_delay is None else min_delay
+        self.max_delay = max(max_delay, delay)
+        self.backoff_factor = backoff_factor
+        self.recovery = recovery
+        self.max_retry_after = max_retry_after
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+        self._delays = {}
+        self._floors = {}
+        self._last_backoff = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._semaphores[host]
+
+    def floor(self, host: str) -> float:
+        return self._floors.get(host, self.min_delay)
+
+    def current_delay(self, host: str) -> float:
+        """
+        The delay currently applied between two request starts on a host (without jitter).
+        """
+        return self._delays.get(host, max(self.delay, self.floor(host)))
+
+    def set_crawl_delay(self, host: str, seconds: float):
+        """
+        Raises the host's floor to the site's Crawl-delay (None keeps `min_delay`).
+        """
+        floor = max(self.min_delay, seconds or 0.0)
+        with self._lock:
+            if self._floors.get(host) == floor:
+                return
+            self._floors[host] = floor
+            self._delays[host] = max(self._delays.get(host, self.delay), floor)
+            metrics.set_gauge('host_delay_seconds', self._delays[host], host=host)
+
+    def reserve(self, host: str) -> float:
+        """
+        Books the next request start time for a host.
+
+        Returns:
+            float: Seconds the caller has to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            delay = self.current_delay(host)
+            # Jitter shrinks with the delay, so a host that sped up is not held at the jitter's pace
+            scale = min(1.0, delay / self.delay) if self.delay else 1.0
+            self._next_start[host] = start + delay + scale * random.uniform(*self.jitter)
+            return start - now
+
+    def backoff(self, host: str, retry_after: float = None, reason: str = 'throttled') -> float:
+        """
+        Slows a host down after a 429/5xx or a connection failure.
+
+        Args:
+            host (str): Host as returned by host_of.
+            retry_after (float): Seconds from the Retry-After header, if any.
+            reason (str): Label for the backoff counter (e.g. the status code).
+
+        Returns:
+            float: Seconds before the host's next request may start.
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = self.current_delay(host)
+            # Concurrent requests failing together count as one signal, not one per request
+            if now - self._last_backoff.get(host, float('-inf')) >= delay:
+                delay = min(self.max_delay, max(delay, 0.1) * self.backoff_factor)
+                self._delays[host] = delay
+                self._last_backoff[host] = now
+            pause = delay
+            if retry_after is not None:
+                pause = max(pause, min(retry_after, self.max_retry_after))
+            # Requests already booked for this host are pushed back as well
+            self._next_start[host] = max(self._next_start.get(host, now), now + pause)
+            wait = self._next_start[host] - now
+        metrics.incr('throttle_backoffs_total', host=host, reason=reason)
+        metrics.set_gauge('host_delay_seconds', delay, host=host)
+        return wait
+
+    def success(self, host: str):
+        """
+        Speeds a host back up toward its floor after a successful response.
+        """
+        with self._lock:
+            floor = self.floor(host)
+            delay = self.current_delay(host)
+            if delay <= floor:
+                return
+            self._delays[host] = max(floor, delay * self.recovery)
+            delay = self._delays[host]
+        metrics.set_gauge('host_delay_seconds', delay, host=host)
+
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Blocks until the URL's host has a free in-flight slot and its delay
+        has elapsed, then holds the slot for the duration of the block.
+        """
+        host = host_of(url)
+        with self._semaphore(host):
+            wait = self.reserve(host)
+            if wait > 0:
+                time.sleep(wait)
+            yield
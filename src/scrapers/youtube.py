@@ -1,13 +1,20 @@
 import logging
 import itertools
+import queue
+import threading
+import time
 from datetime import datetime
 from .base import BaseScraper
-try:
-    from youtube_comment_downloader import YoutubeCommentDownloader, SORT_BY_RECENT
-except ImportError:
-    # Fallback to prevent crash if dependency isn't installed yet, but logging warning
-    YoutubeCommentDownloader = None
-    SORT_BY_RECENT = 0
+from src.utils import metrics
+
+# Newest top-level comment IDs always kept per video in its high-water mark
+WATERMARK_SIZE = 20
+# Publish times are parsed from coarse relative strings ("3 days ago"), so a
+# comment only counts as older than the mark by more than this margin
+WATERMARK_SLACK = 2 * 86400
+# Stop reasons of a walk cut short by --max_comments / --time_budget: older comments were never fetched
+CAP_STOP_REASONS = ('max_comments', 'time_budget')
+
 
 class YoutubeScraper(BaseScraper):
     """
@@ -17,42 +24,151 @@ class YoutubeScraper(BaseScraper):
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        if YoutubeCommentDownloader:
-            self.downloader = YoutubeCommentDownloader()
-        else:
+        # Imported on first use: the package pulls in dateparser, which takes
+        # longer to load than the rest of the CLI together
+        try:
+            from youtube_comment_downloader import YoutubeCommentDownloader, SORT_BY_RECENT
+        except ImportError:
+            # Fallback to prevent crash if dependency isn't installed yet, but logging warning
             self.logger.error("youtube-comment-downloader not installed.")
             self.downloader = None
+            self.sort_by = 0
+        else:
+            self.downloader = YoutubeCommentDownloader()
+            self.sort_by = SORT_BY_RECENT
+        # Set by every scrape() call, see there
+        self.watermark = None
+        self.stop_reason = None
+
+    @staticmethod
+    def _item_id(cid: str) -> str:
+        return 'youtube_' + cid[0:10]
 
-    def scrape(self, video_id: str):
+    def scrape(self, video_id: str, raise_errors: bool = False, since: dict = None, max_comments: int = None,
+               time_budget: float = None, stop_after: int = 3):
         """
         Scrapes comments for a specific video ID.
         
+        Comments arrive newest first, and the downloader only fetches the next
+        page when asked, so stopping early saves every older page.
+        
         Args:
             video_id (str): The 11-character YouTube video ID.
+            raise_errors (bool): Re-raise download errors instead of logging and stopping.
+            since (dict): High-water mark of an earlier harvest ({'item_ids', 'newest'}).
+                Top-level comments it covers (listed, or older than 'newest') are
+                skipped with their replies, and pagination stops after `stop_after`
+                of them in a row.
+            max_comments (int): Stop after this many comments (replies included).
+            time_budget (float): Stop paginating after this many seconds.
+            stop_after (int): Consecutive already-harvested comments that end a delta walk
+                (a pinned comment alone does not).
             
         Yields:
             dict: Comment data including text, anonymized author info, etc.
+            
+        Once exhausted, `self.watermark` holds the mark to store for the next
+        delta harvest and `self.stop_reason` says why the walk ended:
+        'complete', 'caught_up', 'max_comments' or 'time_budget'. A walk
+        stopped by a cap keeps `since` (None on a first harvest), since the
+        comments past the cap were never fetched.
         """
+        self.watermark = since
+        self.stop_reason = None
         if not self.downloader:
             self.logger.error("Scraper not initialized properly.")
             return
 
-        self.logger.info(f"Starting scrape for video: {video_id}")
+        self.logger.info(f"Starting scrape for video: {video_id}" + (" (new comments only)" if since else ""))
         url = f"https://www.youtube.com/watch?v={video_id}"
+        known = set(since.get('item_ids') or []) if since else set()
+        older_than = since['newest'] - WATERMARK_SLACK if since and since.get('newest') else None
         
         try:
             # We use SORT_BY_RECENT to get the newest comments which is better for current events
             # and often yields more raw/spontaneous text.
-            generator = self.downloader.get_comments_from_url(url, sort_by=SORT_BY_RECENT)
+            generator = self.downloader.get_comments_from_url(url, sort_by=self.sort_by)
+            if max_comments:
+                # One past the cap tells a cut-short walk from a video with exactly max_comments
+                generator = itertools.islice(generator, max_comments + 1)
             
+            started = time.monotonic()
+            fresh, newest = [], None
+            skipped = set()
+            streak = 0
+            count = 0
+            stop_reason = 'complete'
             for comment in generator:
-                anonymized = self._anonymize(comment)
-                if anonymized:
-                    yield anonymized
+                if max_comments and count >= max_comments:
+                    stop_reason = 'max_comments'
+                    break
+                count += 1
+                cid = comment.get('cid', '')
+                published = comment.get('time_parsed')
+                if comment.get('reply'):
+                    # Replies of skipped comments were harvested along with them
+                    harvested = self._item_id(cid.split('.')[0]) in skipped
+                else:
+                    item_id = self._item_id(cid)
+                    harvested = item_id in known or (older_than is not None and published is not None
+                                                     and published < older_than)
+                    if harvested:
+                        skipped.add(item_id)
+                        streak += 1
+                        if streak >= stop_after:
+                            stop_reason = 'caught_up'
+                            break
+                    else:
+                        streak = 0
+                        fresh.append((item_id, published))
+                        if published is not None:
+                            newest = max(newest or published, published)
+                
+                if not harvested:
+                    anonymized = self._anonymize(comment)
+                    if anonymized:
+                        yield anonymized
+                
+                if time_budget is not None and time.monotonic() - started > time_budget:
+                    stop_reason = 'time_budget'
+                    break
+            
+            self.stop_reason = stop_reason
+            if stop_reason in CAP_STOP_REASONS:
+                # Comments past the cap were never fetched; keeping the old mark (or none)
+                # makes the next walk cover them again
+                self.logger.info(f"Video {video_id} stopped by {stop_reason} before "
+                                 + ("reaching its high-water mark" if since else "its oldest comment"))
+            else:
+                self.watermark = self._watermark(fresh, newest, since or {})
                     
         except Exception as e:
+            if raise_errors:
+                raise
             self.logger.error(f"Error scraping video {video_id}: {e}")
 
+    @staticmethod
+    def _watermark(fresh, newest, previous):
+        """
+        Builds the high-water mark after a walk that reached harvested (or the oldest) comments.
+        
+        A comment within WATERMARK_SLACK of the newest one is not covered by
+        'newest', so every such id is kept, however many there are; past the
+        WATERMARK_SIZE newest, older ids are left to the time check.
+        """
+        newest_times = [t for t in (newest, previous.get('newest')) if t is not None]
+        newest = max(newest_times) if newest_times else None
+        window = newest - WATERMARK_SLACK if newest is not None else None
+        
+        def in_window(published):
+            return window is None or published is None or published >= window
+        
+        ids = [item_id for n, (item_id, published) in enumerate(fresh)
+               if n < WATERMARK_SIZE or in_window(published)]
+        if in_window(previous.get('newest')):
+            ids += previous.get('item_ids') or []
+        return {'item_ids': list(dict.fromkeys(ids)), 'newest': newest}
+
     def _anonymize(self, raw_comment):
         """
         Strips PII from the comment object before it leaves the scoping.
@@ -68,7 +184,7 @@ class YoutubeScraper(BaseScraper):
             'votes': raw_comment.get('votes', '0'),
             'relative_time': raw_comment.get('time', ''), # "2 hours ago" - acceptable
             'scraped_timestamp': datetime.utcnow().isoformat(),
-            'source_item_id': 'youtube_' + raw_comment.get('cid', '')[0:10], # Hashed or truncated ID for dedupe only
+            'source_item_id': self._item_id(raw_comment.get('cid', '')), # Hashed or truncated ID for dedupe only
         }
         
         # Double check: ensure text is string
@@ -76,3 +192,110 @@ class YoutubeScraper(BaseScraper):
             clean_obj['text'] = str(clean_obj['text'])
             
         return clean_obj
+
+
+def harvest_videos(jobs, workers: int = 4, max_failures: int = 2, queue_size: int = 1000,
+                   scraper_factory=YoutubeScraper, max_comments: int = None, time_budget: float = None):
+    """
+    Harvests comments from many videos at once with a pool of worker threads.
+    
+    Each worker owns its own scraper (and therefore its own downloader session)
+    and pushes comments into one bounded queue, so a single consumer can run the
+    shared clean/validate/write stage while slow videos only occupy one worker.
+    
+    A video that errors is retried until it has used up its failure budget;
+    comments already yielded on an earlier attempt are skipped on retry.
+    
+    A job carrying a high-water mark under 'since' is harvested in delta mode
+    (only comments newer than the mark, see YoutubeScraper.scrape). When a
+    video finishes, its new mark and stop reason are stored in the job as
+    'watermark' and 'stop_reason' before the 'done' event.
+    
+    Args:
+        jobs (iterable): Dicts with at least a 'video_id' key; passed back with the keys above added.
+        workers (int): Number of videos harvested concurrently.
+        max_failures (int): Retries allowed per video before it is abandoned.
+        queue_size (int): Bound on buffered comments (applies backpressure to workers).
+        scraper_factory (callable): Builds one scraper per worker.
+        max_comments (int): Per-video cap on fetched comments.
+        time_budget (float): Per-video cap on seconds spent paginating (per attempt).
+        
+    Yields:
+        tuple: (event, job, payload) where event is 'comment' (payload is the comment),
+               'done' (payload is the comment count) or 'failed' (payload is the error).
+    """
+    logger = logging.getLogger(__name__)
+    job_queue = queue.Queue()
+    for job in jobs:
+        job_queue.put(job)
+    
+    out = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    
+    def emit(item):
+        # Poll so workers exit when the consumer abandons the generator
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker():
+        scraper = scraper_factory()
+        while not stop.is_set():
+            try:
+                job = job_queue.get_nowait()
+            except queue.Empty:
+                break
+            video_id = job['video_id']
+            seen = set()
+            failures = 0
+            started = time.perf_counter()
+            while True:
+                try:
+                    comments = scraper.scrape(video_id, raise_errors=True, since=job.get('since'),
+                                              max_comments=max_comments, time_budget=time_budget)
+                    for comment in comments:
+                        key = (comment.get('source_item_id'), comment.get('text'))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        if not emit(('comment', job, comment)):
+                            return
+                    job['watermark'] = scraper.watermark
+                    job['stop_reason'] = scraper.stop_reason
+                    emit(('done', job, len(seen)))
+                    metrics.incr('videos_total', result='done')
+                    metrics.incr('video_stops_total', reason=scraper.stop_reason)
+                    break
+                except Exception as e:
+                    failures += 1
+                    if failures > max_failures:
+                        logger.error(f"Giving up on video {video_id} after {failures} failures: {e}")
+                        emit(('failed', job, e))
+                        metrics.incr('videos_total', result='failed')
+                        break
+                    metrics.incr('video_retries_total')
+                    logger.warning(f"Retrying video {video_id} ({failures}/{max_failures}): {e}")
+                    time.sleep(2 ** failures)
+            # Includes retries and backoff, i.e. how long the video held a worker
+            metrics.observe('video_harvest_seconds', time.perf_counter() - started)
+            metrics.incr('comments_harvested_total', len(seen))
+        emit(None)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, workers))]
+    for t in threads:
+        t.start()
+    
+    try:
+        finished = 0
+        while finished < len(threads):
+            item = out.get()
+            if item is None:
+                finished += 1
+                continue
+            yield item
+    finally:
+        stop.set()
@@ -1,28 +1,766 @@
+import io
+import os
 import json
 import csv
+import gzip
+import time
+import zlib
 import logging
 from typing import List, Dict, Any
 
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+# Low-cardinality columns repeated on every row; read back as pandas categoricals
+# from Parquet (which dictionary-encodes them on disk)
+CATEGORICAL_COLUMNS = ('source_url', 'source_type', 'channel_name', 'channel_category', 'video_id', 'title')
+
 def save_jsonl(data: List[Dict[str, Any]], filepath: str):
     """
-    Saves a list of dictionaries to a JSON Lines file.
+    Saves a list of dictionaries to a JSON Lines file (gzip/zstd by extension).
     """
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
+        with JsonlWriter(filepath, append=False) as writer:
             for entry in data:
-                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                writer.write(entry)
     except Exception as e:
         logging.error(f"Failed to save JSONL to {filepath}: {e}")
 
 def load_jsonl(filepath: str) -> List[Dict[str, Any]]:
     """
-    Loads data from a JSON Lines file.
+    Loads data from a JSON Lines file (gzip/zstd by extension).
     """
     data = []
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                data.append(json.loads(line))
+        data.extend(iter_jsonl(filepath))
     except Exception as e:
         logging.error(f"Failed to load JSONL from {filepath}: {e}")
     return data
+
+
+# --- Streaming JSON Lines ---
+
+_READ_SIZE = 1 << 20
+# Sidecar index entry per record: start of its compressed block, offset inside the block
+INDEX_DTYPE = np.dtype([('block', '<u8'), ('offset', '<u8')])
+
+
+def _dumps(record) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(line: bytes):
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def jsonl_codec(path: str) -> str:
+    """
+    Returns 'gzip' for .gz, 'zstd' for .zst and None for plain files.
+    """
+    lower = path.lower()
+    if lower.endswith('.gz'):
+        return 'gzip'
+    if lower.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError("zstandard is not installed; it is needed for .zst files")
+        return 'zstd'
+    return None
+
+
+def _compress_block(data: bytes, codec: str) -> bytes:
+    # Each block is a complete gzip member / zstd frame, so the file stays a
+    # valid stream and any block can be decoded on its own
+    if codec == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decompressor(codec: str):
+    if codec == 'gzip':
+        return zlib.decompressobj(wbits=31)
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def _read_block(f, offset: int, codec: str, length: int = None) -> bytes:
+    """Decodes the block starting at `offset`; plain blocks are read to `length` or EOF."""
+    f.seek(offset)
+    if codec is None:
+        return f.read(length) if length is not None else f.read()
+    d = _decompressor(codec)
+    out = []
+    while not d.eof:
+        chunk = f.read(_READ_SIZE)
+        if not chunk:
+            break
+        out.append(d.decompress(chunk))
+    return b''.join(out)
+
+
+def _iter_lines(stream):
+    pending = b''
+    while True:
+        chunk = stream.read(_READ_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _open_decoded(path: str):
+    codec = jsonl_codec(path)
+    if codec == 'gzip':
+        return gzip.open(path, 'rb')
+    if codec == 'zstd':
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_across_frames=True,
+                                                          closefd=True)
+    return open(path, 'rb')
+
+
+def iter_jsonl(filepath: str, start: int = None, stop: int = None):
+    """
+    Streams records from a JSON Lines file, decompressing gzip/zstd on the fly.
+
+    Without `start`/`stop` the file is read sequentially. With them, only
+    records [start, stop) are decoded, located through the sidecar offset
+    index (see JsonlIndex), so parallel readers can each take a range.
+
+    Yields:
+        dict: One record at a time.
+    """
+    if start is not None or stop is not None:
+        yield from JsonlIndex(filepath).iter_range(start or 0, stop)
+        return
+    with _open_decoded(filepath) as stream:
+        for line in _iter_lines(stream):
+            if line.strip():
+                yield _loads(line)
+
+
+def _scan_blocks(filepath: str, codec: str) -> np.ndarray:
+    """Builds index entries for a file written without one (every gzip member / zstd frame is a block)."""
+    entries = []
+    with open(filepath, 'rb') as f:
+        if codec is None:
+            offset = 0
+            for line in _iter_lines(f):
+                if line.strip():
+                    entries.append((offset, 0))
+                offset += len(line) + 1
+            return np.array(entries, dtype=INDEX_DTYPE)
+
+        block = 0
+        size = os.path.getsize(filepath)
+        while block < size:
+            f.seek(block)
+            d = _decompressor(codec)
+            data = []
+            consumed = 0
+            while not d.eof:
+                chunk = f.read(_READ_SIZE)
+                if not chunk:
+                    break
+                consumed += len(chunk)
+                data.append(d.decompress(chunk))
+            offset = 0
+            for line in b''.join(data).split(b'\n'):
+                if line.strip():
+                    entries.append((block, offset))
+                offset += len(line) + 1
+            next_block = block + consumed - len(d.unused_data)
+            if next_block <= block:
+                break
+            block = next_block
+    return np.array(entries, dtype=INDEX_DTYPE)
+
+
+class JsonlIndex:
+    """
+    Random access into a (possibly compressed) JSON Lines file through its
+    `<file>.idx` sidecar.
+
+    The sidecar is a flat array of (block offset, offset in block) pairs, one
+    per record, opened as a NumPy memmap, so looking up record N costs one
+    seek plus decoding a single block rather than a scan of the file. It is
+    written by JsonlWriter and rebuilt by scanning when missing or older than
+    the data file.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.codec = jsonl_codec(filepath)
+        self.index_path = filepath + '.idx'
+        if not os.path.exists(self.index_path) or \
+                os.path.getmtime(self.index_path) < os.path.getmtime(filepath):
+            _scan_blocks(filepath, self.codec).tofile(self.index_path)
+        if os.path.getsize(self.index_path):
+            self.entries = np.memmap(self.index_path, dtype=INDEX_DTYPE, mode='r')
+        else:
+            self.entries = np.zeros(0, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, n: int):
+        block, offset = (int(v) for v in self.entries[n])
+        with open(self.filepath, 'rb') as f:
+            if self.codec is None:
+                f.seek(block + offset)
+                return _loads(f.readline())
+            data = _read_block(f, block, self.codec)
+        newline = data.find(b'\n', offset)
+        return _loads(data[offset:newline if newline >= 0 else len(data)])
+
+    def iter_range(self, start: int = 0, stop: int = None):
+        """
+        Yields records [start, stop), decoding each block once.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return
+        blocks = self.entries['block']
+        with open(self.filepath, 'rb') as f:
+            i = start
+            while i < stop:
+                block = int(blocks[i])
+                end = int(np.searchsorted(blocks, block, side='right'))
+                if self.codec is None:
+                    # Plain blocks can be read exactly up to the last wanted record's line
+                    last = min(end, stop) - 1
+                    f.seek(block + int(self.entries['offset'][last]))
+                    length = int(self.entries['offset'][last]) + len(f.readline())
+                    data = _read_block(f, block, None, length)
+                else:
+                    data = _read_block(f, block, self.codec)
+                for j in range(i, min(end, stop)):
+                    offset = int(self.entries['offset'][j])
+                    newline = data.find(b'\n', offset)
+                    yield _loads(data[offset:newline if newline >= 0 else len(data)])
+                i = min(end, stop)
+
+    def split(self, parts: int) -> list:
+        """
+        Splits the records into `parts` contiguous (start, stop) ranges of
+        roughly equal compressed size, for parallel readers.
+        """
+        if not len(self):
+            return []
+        size = os.path.getsize(self.filepath)
+        targets = np.linspace(0, size, parts + 1)[1:-1]
+        cuts = np.searchsorted(self.entries['block'], targets, side='left')
+        bounds = [0] + sorted(set(int(c) for c in cuts if 0 < c < len(self))) + [len(self)]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+
+class JsonlWriter:
+    """
+    Appends records to a JSON Lines file in buffered batches.
+
+    Records are encoded as they arrive (with orjson when installed) and every
+    `batch_size` records are written as one block: a single write for plain
+    files, one gzip member or zstd frame for `.gz` / `.zst`. The matching
+    entries are appended to the `<file>.idx` sidecar, so the file can be read
+    back with JsonlIndex without a scan.
+    """
+
+    def __init__(self, filepath: str, batch_size: int = 1000, append: bool = True, index: bool = True):
+        self.filepath = filepath
+        self.batch_size = batch_size
+        self.codec = jsonl_codec(filepath)
+        self.index_path = filepath + '.idx' if index else None
+        self.count = 0
+        self._lines = []
+
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        if append and os.path.exists(filepath) and self.index_path:
+            # Bring a missing or stale sidecar up to date before extending it
+            JsonlIndex(filepath)
+        mode = 'ab' if append else 'wb'
+        self._fh = open(filepath, mode)
+        self._index_fh = open(self.index_path, mode) if self.index_path else None
+
+    def write(self, record: Dict[str, Any]):
+        self._lines.append(_dumps(record))
+        if len(self._lines) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._lines:
+            return
+        offsets = np.zeros(len(self._lines), dtype=np.uint64)
+        np.cumsum([len(line) + 1 for line in self._lines[:-1]], out=offsets[1:])
+        data = b'\n'.join(self._lines) + b'\n'
+
+        block = self._fh.tell()
+        self._fh.write(_compress_block(data, self.codec))
+        self._fh.flush()
+        if self._index_fh:
+            entries = np.empty(len(self._lines), dtype=INDEX_DTYPE)
+            entries['block'] = block
+            entries['offset'] = offsets
+            self._index_fh.write(entries.tobytes())
+            self._index_fh.flush()
+        self.count += len(self._lines)
+        self._lines = []
+
+    def close(self):
+        if self._fh.closed:
+            return
+        self.flush()
+        self._fh.close()
+        if self._index_fh:
+            self._index_fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class CsvBatchWriter:
+    """
+    Streams records to a CSV file in batches instead of collecting them in memory.
+    
+    Records are buffered until `batch_size` records or `flush_interval` seconds
+    have accumulated, then the batch is serialized and written through one
+    buffered handle with a single write + fsync. The committed byte offset is
+    kept in a `<file>.commit` sidecar while the writer is open; if a run dies
+    mid-batch, the next writer truncates the file back to the last complete
+    batch before appending.
+    
+    The `utf-8-sig` BOM and the header are only written when the file is new,
+    and appended batches follow the existing header's column order.
+    
+    `on_flush` is called after every flush (even an empty one), which lets
+    callers commit bookkeeping such as a job manifest only once the records
+    it refers to are durable.
+    """
+
+    def __init__(self, filepath: str, batch_size: int = 1000, flush_interval: float = 30.0,
+                 on_flush=None):
+        self.filepath = filepath
+        self.on_flush = on_flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.logger = logging.getLogger(__name__)
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._commit_path = filepath + '.commit'
+        
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        self._recover()
+        self.columns = self._read_header()
+        self._fh = open(filepath, 'ab')
+        self._committed = self._fh.tell()
+        # Record the starting point now, so a crash inside the first batch is recoverable too
+        self._write_commit()
+
+    def _recover(self):
+        # A leftover sidecar means the previous writer never closed cleanly
+        if not os.path.exists(self._commit_path):
+            return
+        try:
+            with open(self._commit_path, 'r') as f:
+                committed = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return
+        if os.path.exists(self.filepath) and os.path.getsize(self.filepath) > committed:
+            self.logger.warning(f"Truncating partial batch in {self.filepath} back to byte {committed}")
+            with open(self.filepath, 'r+b') as f:
+                f.truncate(committed)
+
+    def _read_header(self):
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            return None
+        with open(self.filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            return next(csv.reader(f), None)
+
+    def write(self, record: Dict[str, Any]):
+        """
+        Buffers one record, flushing when the batch size or interval is reached.
+        """
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size or \
+                time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered batch to disk as one atomic append.
+        """
+        self._last_flush = time.monotonic()
+        if self._buffer:
+            self._write_batch()
+        if self.on_flush:
+            self.on_flush()
+
+    def _write_batch(self):
+        prefix = ''
+        if self.columns is None:
+            # Column order follows first appearance in the first batch
+            self.columns = list(dict.fromkeys(k for record in self._buffer for k in record))
+            prefix = '\ufeff'
+        
+        out = io.StringIO()
+        out.write(prefix)
+        writer = csv.DictWriter(out, fieldnames=self.columns, extrasaction='ignore', lineterminator='\n')
+        if prefix:
+            writer.writeheader()
+        writer.writerows(self._buffer)
+        
+        self._fh.write(out.getvalue().encode('utf-8'))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._committed = self._fh.tell()
+        self._write_commit()
+        
+        self.count += len(self._buffer)
+        self._buffer = []
+
+    def _write_commit(self):
+        tmp_path = self._commit_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(self._committed))
+        os.replace(tmp_path, self._commit_path)
+
+    def close(self):
+        """
+        Flushes any remaining records and closes the file.
+        """
+        if self._fh.closed:
+            return
+        self.flush()
+        self._fh.close()
+        if os.path.exists(self._commit_path):
+            os.remove(self._commit_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# --- Table storage (CSV or Parquet, chosen by extension) ---
+
+def storage_format(path: str) -> str:
+    """
+    Returns 'parquet' for .parquet/.pq paths (files or part-file directories), else 'csv'.
+    """
+    return 'parquet' if path.lower().endswith(PARQUET_EXTENSIONS) else 'csv'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is not installed; it is needed for Parquet files")
+
+
+def _dataset(path: str):
+    _require_pyarrow()
+    return ds.dataset(path, format='parquet')
+
+
+def table_columns(path: str) -> list:
+    """
+    Column names of a table without reading its rows.
+    """
+    if storage_format(path) == 'parquet':
+        return _dataset(path).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _to_pandas(table) -> pd.DataFrame:
+    # Dictionary-encoded columns become categoricals
+    return table.to_pandas()
+
+
+def _dictionary_columns(schema) -> list:
+    return [name for name in CATEGORICAL_COLUMNS
+            if name in schema.names and pa.types.is_string(schema.field(name).type)]
+
+
+def _projected(dataset, columns):
+    # Read the repetitive string columns as dictionaries, everything else as is
+    schema = dataset.schema
+    fields = [schema.field(name) for name in (columns or schema.names)]
+    dictionary = set(_dictionary_columns(schema))
+    return {f.name: ds.field(f.name).cast(pa.dictionary(pa.int32(), pa.string())) if f.name in dictionary
+            else ds.field(f.name) for f in fields}
+
+
+def read_table(path: str, columns: list = None, dtype: dict = None) -> pd.DataFrame:
+    """
+    Reads a whole CSV or Parquet table.
+
+    Args:
+        path (str): File (or Parquet part-file directory).
+        columns (list): Only read these columns (Parquet skips the others on disk).
+        dtype (dict): Column dtypes for CSV parsing; Parquet is already typed.
+    """
+    if storage_format(path) == 'parquet':
+        dataset = _dataset(path)
+        return _to_pandas(dataset.to_table(columns=_projected(dataset, columns)))
+    return pd.read_csv(path, usecols=columns, dtype=dtype)
+
+
+def iter_table(path: str, columns: list = None, chunksize: int = 50_000, dtype: dict = None):
+    """
+    Streams a CSV or Parquet table as DataFrames of at most `chunksize` rows.
+
+    Parquet is read row group by row group with only the projected columns.
+
+    Yields:
+        pd.DataFrame: One chunk at a time.
+    """
+    if storage_format(path) != 'parquet':
+        yield from pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=chunksize)
+        return
+    dataset = _dataset(path)
+    scanner = dataset.scanner(columns=_projected(dataset, columns), batch_size=chunksize)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield _to_pandas(pa.Table.from_batches([batch]))
+
+
+def _arrow_schema(df: pd.DataFrame):
+    # Text-like columns are always strings so that later chunks (or an all-null
+    # first chunk) cannot change the file schema
+    fields = []
+    for name, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype) \
+                and not isinstance(dtype, pd.CategoricalDtype):
+            fields.append(pa.field(str(name), pa.Schema.from_pandas(df[[name]], preserve_index=False).field(0).type))
+        else:
+            fields.append(pa.field(str(name), pa.string()))
+    return pa.schema(fields)
+
+
+def _arrow_table(df: pd.DataFrame, schema):
+    df = df.reindex(columns=schema.names)
+    arrays = []
+    for field in schema:
+        col = df[field.name]
+        if pa.types.is_string(field.type):
+            col = col.astype(object).where(col.notna(), None)
+            col = col.map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        arrays.append(pa.array(col, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _widened(schema, df: pd.DataFrame):
+    # Fields of `schema` that `df` does not fit: int columns that turned
+    # fractional become float64, any other mismatch becomes string
+    fields = []
+    for field in schema:
+        col = df[field.name] if field.name in df.columns else pd.Series(dtype=object)
+        try:
+            pa.array(col, type=field.type, from_pandas=True)
+            fields.append(field)
+            continue
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        if pa.types.is_integer(field.type) and pd.api.types.is_float_dtype(col.dtype):
+            fields.append(pa.field(field.name, pa.float64()))
+        else:
+            fields.append(pa.field(field.name, pa.string()))
+    return pa.schema(fields)
+
+
+def write_table(df: pd.DataFrame, path: str):
+    """
+    Writes a DataFrame as utf-8-sig CSV or Parquet (by extension).
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if storage_format(path) == 'parquet':
+        _require_pyarrow()
+        pq.write_table(_arrow_table(df, _arrow_schema(df)), path, compression='zstd')
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+class TableWriter:
+    """
+    Appends DataFrame chunks to one CSV or Parquet table.
+
+    CSV gets the utf-8-sig BOM and header with the first chunk. Parquet writes
+    one row group per chunk, with the schema of the first chunk; later chunks
+    are aligned to its columns. When a later chunk does not fit a column's
+    type (chunked CSV reads a counts column as int64, then as text once a
+    value like "1.2K" turns up), the column is widened to float64 or string
+    and the row groups already written are rewritten with the new schema.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.format = storage_format(path)
+        self.columns = None
+        self.count = 0
+        self._writer = None
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if self.format == 'parquet':
+            _require_pyarrow()
+
+    def write(self, df: pd.DataFrame):
+        if self.columns is None:
+            self.columns = [str(c) for c in df.columns]
+        if self.format == 'parquet':
+            if self._writer is None:
+                self._schema = _arrow_schema(df)
+                self._writer = pq.ParquetWriter(self.path, self._schema, compression='zstd')
+            try:
+                table = _arrow_table(df, self._schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                self._widen(_widened(self._schema, df))
+                table = _arrow_table(df, self._schema)
+            self._writer.write_table(table)
+        else:
+            first = self.count == 0 and self._writer is None
+            df.reindex(columns=self.columns).to_csv(self.path, mode='w' if first else 'a', header=first,
+                                                    index=False, encoding='utf-8-sig' if first else 'utf-8')
+            self._writer = True
+        self.count += len(df)
+
+    def _widen(self, schema):
+        logger = logging.getLogger(__name__)
+        changed = [f"{new.name} {old.type}->{new.type}" for old, new in zip(self._schema, schema) if old != new]
+        logger.info(f"Widening {', '.join(changed)} in {self.path}, rewriting {self.count} rows")
+        self._writer.close()
+        old_path = self.path + '.widen'
+        os.replace(self.path, old_path)
+        self._schema = schema
+        self._writer = pq.ParquetWriter(self.path, schema, compression='zstd')
+        # Through pandas like new chunks, so old and new values are formatted alike
+        for batch in pq.ParquetFile(old_path).iter_batches():
+            self._writer.write_table(_arrow_table(batch.to_pandas(integer_object_nulls=True), schema))
+        os.remove(old_path)
+
+    def close(self):
+        if self.format == 'parquet' and self._writer is not None:
+            self._writer.close()
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetBatchWriter:
+    """
+    Parquet counterpart of CsvBatchWriter for the scrape jobs.
+
+    The output path is a directory of part files; every flushed batch becomes
+    one `part-NNNNN.parquet`, written to a temporary name, fsynced and renamed,
+    so a crash can never leave a half-written batch behind and a new writer
+    simply continues the numbering. As in the CSV path, every field is stored
+    as text (scraped fields such as vote counts change type between records),
+    and batches follow the columns of the first part file. Readers (`read_table`, `iter_table`, pandas) treat the
+    directory as one table.
+    """
+
+    def __init__(self, filepath: str, batch_size: int = 1000, flush_interval: float = 30.0,
+                 on_flush=None):
+        _require_pyarrow()
+        self.filepath = filepath
+        self.on_flush = on_flush
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.logger = logging.getLogger(__name__)
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+        os.makedirs(filepath, exist_ok=True)
+        parts = sorted(f for f in os.listdir(filepath) if f.startswith('part-') and f.endswith('.parquet'))
+        for leftover in os.listdir(filepath):
+            if leftover.endswith('.tmp'):
+                os.remove(os.path.join(filepath, leftover))
+        self._next_part = int(parts[-1][5:-8]) + 1 if parts else 0
+        self._schema = pq.read_schema(os.path.join(filepath, parts[0])).remove_metadata() if parts else None
+        self.columns = self._schema.names if self._schema else None
+
+    def write(self, record: Dict[str, Any]):
+        """
+        Buffers one record, flushing when the batch size or interval is reached.
+        """
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size or \
+                time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered batch as one new part file.
+        """
+        self._last_flush = time.monotonic()
+        if self._buffer:
+            self._write_batch()
+        if self.on_flush:
+            self.on_flush()
+
+    def _write_batch(self):
+        df = pd.DataFrame(self._buffer)
+        if self._schema is None:
+            self._schema = pa.schema([pa.field(str(name), pa.string()) for name in df.columns])
+            self.columns = self._schema.names
+
+        path = os.path.join(self.filepath, f'part-{self._next_part:05d}.parquet')
+        tmp_path = path + '.tmp'
+        pq.write_table(_arrow_table(df, self._schema), tmp_path, compression='zstd')
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._next_part += 1
+
+        self.count += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """
+        Flushes any remaining records.
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_batch_writer(filepath: str, **kwargs):
+    """
+    Returns a ParquetBatchWriter for Parquet paths, else a CsvBatchWriter.
+    """
+    if storage_format(filepath) == 'parquet':
+        return ParquetBatchWriter(filepath, **kwargs)
+    return CsvBatchWriter(filepath, **kwargs)
@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+
+
+class JobManifest:
+    """
+    Persistent record of scrape targets (video IDs, article URLs) and their outcome.
+
+    Backed by an indexed SQLite file so a lookup is a single primary-key probe,
+    which keeps startup instant even for seed lists with 100k+ entries.
+    Updates are staged in memory and only committed with `commit()`, so the
+    scrape jobs can tie them to the output writer's flushes: a target is never
+    marked done before its records are on disk.
+
+    For targets that are still in progress the IDs of already-written items are
+    kept too, so an interrupted video can be resumed without writing its
+    comments twice. They are dropped once the target is done.
+
+    Targets that can never yield records (a URL robots.txt disallows, a page
+    without Assamese text) are marked skipped, which like done is final. Only
+    failed and partial targets are retried, so anything that yielded nothing
+    for a reason that may pass (a fetch error, an unreachable robots.txt) is
+    staged as failed, not skipped.
+
+    Finished videos also keep a high-water mark (IDs of their newest
+    comments and the newest publish time) so a later delta harvest can stop
+    paginating where the previous one began.
+    """
+
+    DONE = 'done'
+    PARTIAL = 'partial'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS targets ("
+            " target TEXT PRIMARY KEY, kind TEXT, status TEXT,"
+            " updated_at TEXT, record_count INTEGER)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " target TEXT, item_id TEXT, PRIMARY KEY (target, item_id)) WITHOUT ROWID"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            " target TEXT PRIMARY KEY, item_ids TEXT, newest REAL, updated_at TEXT)"
+        )
+        self.conn.commit()
+        self._staged = {}
+        self._staged_items = []
+        self._staged_watermarks = {}
+
+    def get(self, target: str) -> Optional[dict]:
+        """
+        Returns the committed entry for a target, or None if it was never seen.
+        """
+        row = self.conn.execute(
+            "SELECT kind, status, updated_at, record_count FROM targets WHERE target = ?", (target,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'target': target, 'kind': row[0], 'status': row[1],
+                'updated_at': row[2], 'record_count': row[3]}
+
+    def status(self, target: str) -> Optional[str]:
+        entry = self.get(target)
+        return entry['status'] if entry else None
+
+    def is_done(self, target: str) -> bool:
+        return self.status(target) == self.DONE
+
+    def is_final(self, target: str) -> bool:
+        """
+        True for targets that are not retried (done or skipped).
+        """
+        return self.status(target) in (self.DONE, self.SKIPPED)
+
+    def seen_items(self, target: str) -> set:
+        """
+        Returns the item IDs already written for an unfinished target.
+        """
+        rows = self.conn.execute("SELECT item_id FROM items WHERE target = ?", (target,))
+        return {r[0] for r in rows}
+
+    def watermark(self, target: str) -> Optional[dict]:
+        """
+        Returns the committed high-water mark of a target, or None.
+        """
+        row = self.conn.execute(
+            "SELECT item_ids, newest FROM watermarks WHERE target = ?", (target,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'item_ids': row[0].split() if row[0] else [], 'newest': row[1]}
+
+    def stage(self, target: str, kind: str, status: str, record_count: int):
+        """
+        Stages a status update; it becomes durable on the next `commit()`.
+        """
+        self._staged[target] = (kind, status, datetime.utcnow().isoformat(), record_count)
+
+    def stage_items(self, target: str, item_ids: Iterable[str]):
+        self._staged_items.extend((target, item_id) for item_id in item_ids)
+
+    def stage_watermark(self, target: str, watermark: dict):
+        """
+        Stages a target's high-water mark ({'item_ids': [...], 'newest': timestamp or None}).
+        """
+        self._staged_watermarks[target] = (' '.join(watermark.get('item_ids') or []), watermark.get('newest'),
+                                           datetime.utcnow().isoformat())
+
+    def commit(self):
+        """
+        Writes all staged updates in one transaction.
+        """
+        if not self._staged and not self._staged_items and not self._staged_watermarks:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO items (target, item_id) VALUES (?, ?)", self._staged_items
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO targets (target, kind, status, updated_at, record_count)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(t, *values) for t, values in self._staged.items()]
+            )
+            done = [(t,) for t, values in self._staged.items() if values[1] == self.DONE]
+            self.conn.executemany("DELETE FROM items WHERE target = ?", done)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO watermarks (target, item_ids, newest, updated_at) VALUES (?, ?, ?, ?)",
+                [(t, *values) for t, values in self._staged_watermarks.items()]
+            )
+        self._staged = {}
+        self._staged_items = []
+        self._staged_watermarks = {}
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
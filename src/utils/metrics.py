@@ -0,0 +1,388 @@
+"""
+In-process instrumentation for pipeline stages and hot functions.
+
+A single registry collects three kinds of series, each identified by a
+name plus optional labels (e.g. host='example.com'):
+
+    counters  incr('records_accepted_total', 3, stage='validate')
+    timings   with timer('fetch_seconds', host=host): ...   (count, sum, max)
+    gauges    set_gauge('queue_depth', 5)
+
+Stages are timings named 'stage_seconds' plus counters named
+'records_total', both labelled with the stage, from which the summary
+derives records per second. The summary can be written as JSON or as a
+Prometheus textfile (for node_exporter's textfile collector), and includes
+the peak RSS of the process and, separately, of its largest child.
+
+Only the calling process is measured: work done inside worker processes
+shows up in the timing of the stage that waits for it.
+"""
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then left out
+    resource = None
+
+PROMETHEUS_PREFIX = 'assamese_pipeline_'
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_text(key: tuple) -> str:
+    return ','.join(f'{k}={v}' for k, v in key)
+
+
+def peak_rss_bytes() -> dict:
+    """
+    Peak resident set sizes in bytes: 'peak_rss_self' of this process and
+    'peak_rss_children_max' of the largest of its waited-for children.
+
+    The kernel only reports the largest child, not a total, and the peaks
+    need not overlap in time, so the two are never added. Both are None
+    where the resource module is unavailable.
+    """
+    if resource is None:
+        return {'peak_rss_self': None, 'peak_rss_children_max': None}
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {'peak_rss_self': own * scale, 'peak_rss_children_max': children * scale}
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters, timings and gauges.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {}
+        self.timings = {}
+        self.gauges = {}
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counters = {}
+            self.timings = {}
+            self.gauges = {}
+
+    def incr(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            entry = self.timings.get(key)
+            if entry is None:
+                self.timings[key] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[(name, _label_key(labels))] = value
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Times the block (also when it raises) as one observation of `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, **labels):
+        """
+        Decorator form of `timer`.
+        """
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def stage(self, name: str):
+        """
+        Times a whole stage; count its records with `records(name, n)`.
+        """
+        return self.timer('stage_seconds', stage=name)
+
+    def records(self, stage: str, count: int):
+        self.incr('records_total', count, stage=stage)
+
+    def instrument_stage(self, name: str, stage):
+        """
+        Wraps a chunk-to-chunk generator stage (see src.utils.parallel.pipeline).
+
+        Counts the rows it yields and its busy time: time spent inside the
+        stage, excluding time blocked on its input.
+        """
+        def run(chunks):
+            waited = [0.0]
+
+            def upstream():
+                it = iter(chunks)
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(it)
+                    except StopIteration:
+                        return
+                    finally:
+                        waited[0] += time.perf_counter() - start
+                    yield item
+
+            gen = stage(upstream())
+            while True:
+                start, before = time.perf_counter(), waited[0]
+                try:
+                    chunk = next(gen)
+                except StopIteration:
+                    break
+                finally:
+                    busy = time.perf_counter() - start - (waited[0] - before)
+                    self.observe('stage_seconds', busy, stage=name)
+                self.records(name, len(chunk))
+                yield chunk
+        return run
+
+    def summary(self) -> dict:
+        """
+        Snapshot of every series, with per-stage records/sec and peak RSS.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            timings = {key: list(entry) for key, entry in self.timings.items()}
+            gauges = dict(self.gauges)
+
+        seconds = {dict(labels)['stage']: entry[1] for (name, labels), entry in timings.items()
+                   if name == 'stage_seconds'}
+        counts = {dict(labels)['stage']: value for (name, labels), value in counters.items()
+                  if name == 'records_total'}
+        stages = {}
+        for name in list(seconds) + [s for s in counts if s not in seconds]:
+            total, records = seconds.get(name), counts.get(name, 0)
+            stages[name] = {'seconds': round(total, 4) if total is not None else None, 'records': records,
+                            'records_per_sec': round(records / total, 1) if total and records else None}
+
+        def grouped(series, render):
+            out = {}
+            for (name, labels), value in sorted(series.items()):
+                out.setdefault(name, {})[_label_text(labels) or 'all'] = render(value)
+            return out
+
+        rss = peak_rss_bytes()
+        return {
+            'started_at': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+            'elapsed_seconds': round(time.time() - self.started, 3),
+            **{f'{name}_mb': round(value / 2**20, 1) if value is not None else None
+               for name, value in rss.items()},
+            'stages': stages,
+            'counters': grouped(counters, lambda v: v),
+            'timings': grouped(timings, lambda e: {'count': e[0], 'total_seconds': round(e[1], 4),
+                                                   'mean_ms': round(1000 * e[1] / e[0], 3),
+                                                   'max_ms': round(1000 * e[2], 3)}),
+            'gauges': grouped(gauges, lambda v: v),
+        }
+
+    def write_json(self, path: str):
+        _atomic_write(path, json.dumps(self.summary(), ensure_ascii=False, indent=2))
+
+    def prometheus_text(self) -> str:
+        """
+        The registry in the Prometheus text exposition format.
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            timings = {key: list(entry) for key, entry in self.timings.items()}
+            gauges = dict(self.gauges)
+
+        out = io.StringIO()
+        def series(name, labels, value):
+            rendered = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+            out.write(f"{PROMETHEUS_PREFIX}{name}{{{rendered}}} {value}\n" if rendered
+                      else f"{PROMETHEUS_PREFIX}{name} {value}\n")
+
+        def by_name(items):
+            names = {}
+            for (name, labels), value in sorted(items):
+                names.setdefault(name, []).append((labels, value))
+            return names.items()
+
+        for name, rows in by_name(counters.items()):
+            out.write(f"# TYPE {PROMETHEUS_PREFIX}{name} counter\n")
+            for labels, value in rows:
+                series(name, labels, value)
+        for name, rows in by_name(timings.items()):
+            out.write(f"# TYPE {PROMETHEUS_PREFIX}{name} summary\n")
+            for labels, (count, total, _) in rows:
+                series(f"{name}_count", labels, count)
+                series(f"{name}_sum", labels, round(total, 6))
+            out.write(f"# TYPE {PROMETHEUS_PREFIX}{name}_max gauge\n")
+            for labels, (_, _, longest) in rows:
+                series(f"{name}_max", labels, round(longest, 6))
+        for name, rows in by_name(gauges.items()):
+            out.write(f"# TYPE {PROMETHEUS_PREFIX}{name} gauge\n")
+            for labels, value in rows:
+                series(name, labels, value)
+
+        for name, value in peak_rss_bytes().items():
+            if value is not None:
+                out.write(f"# TYPE {PROMETHEUS_PREFIX}{name}_bytes gauge\n")
+                series(f'{name}_bytes', (), value)
+        out.write(f"# TYPE {PROMETHEUS_PREFIX}last_run_timestamp_seconds gauge\n")
+        series('last_run_timestamp_seconds', (), round(time.time(), 3))
+        return out.getvalue()
+
+    def write_prometheus(self, path: str):
+        _atomic_write(path, self.prometheus_text())
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _atomic_write(path: str, text: str):
+    # The textfile collector may read at any moment, so never expose a partial file
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# Process-wide registry used by the pipeline modules
+REGISTRY = Metrics()
+incr = REGISTRY.incr
+observe = REGISTRY.observe
+set_gauge = REGISTRY.set_gauge
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+stage = REGISTRY.stage
+records = REGISTRY.records
+instrument_stage = REGISTRY.instrument_stage
+
+
+class StackSampler:
+    """
+    Sampling profiler over every thread: every `interval` seconds the current
+    stack of each thread is recorded, and the counts are written as collapsed
+    stacks ("frame;frame;frame count" lines, the flamegraph.pl input format).
+
+    Unlike cProfile, which only sees the thread that enabled it, this covers
+    the scraper workers and pipeline stage threads, at a fixed small cost.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            names.update((t.ident, t.name) for t in threading.enumerate())
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top_functions(self, limit: int = 20) -> list:
+        # Innermost frame of each sample (self time)
+        leaf = Counter()
+        for stack, count in self.stacks.items():
+            leaf[stack.rsplit(';', 1)[-1]] += count
+        return leaf.most_common(limit)
+
+
+@contextmanager
+def profiled(path: str, mode: str = 'cprofile', interval: float = 0.005, top: int = 25):
+    """
+    Profiles the block and writes the result to `path`.
+
+    Args:
+        path (str): Output file; None disables profiling.
+        mode (str): 'cprofile' (deterministic, calling thread only; pstats file
+                    for snakeviz / `python -m pstats`) or 'sample' (all threads;
+                    collapsed stacks for flame graphs).
+        interval (float): Sampling period in seconds ('sample' mode).
+        top (int): Entries to log when done.
+    """
+    if not path:
+        yield
+        return
+    logger = logging.getLogger(__name__)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    if mode == 'sample':
+        sampler = StackSampler(interval).start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            sampler.write(path)
+            lines = '\n'.join(f"  {count:8d}  {frame}" for frame, count in sampler.top_functions(top))
+            logger.info(f"Wrote {sampler.samples} stack samples to {path}; hottest frames:\n{lines}")
+        return
+
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(top)
+        logger.info(f"Wrote profile to {path}; top {top} by cumulative time:\n{report.getvalue()}")
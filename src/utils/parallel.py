@@ -0,0 +1,121 @@
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def ordered_map(fn, items, workers: int = None, max_pending: int = None):
+    """
+    Maps `fn` over `items` in a process pool, yielding results in input order.
+
+    Unlike ProcessPoolExecutor.map, at most `max_pending` items are submitted
+    ahead of the consumer, so a lazily read input (e.g. CSV chunks) is never
+    pulled into memory all at once.
+
+    Args:
+        fn (callable): Picklable, module-level function.
+        items (iterable): Work items, consumed lazily.
+        workers (int): Process count; 1 runs inline without a pool. Defaults to the CPU count.
+        max_pending (int): Submitted-but-unconsumed items. Defaults to 2 * workers.
+
+    Yields:
+        The result of `fn(item)` for every item, in order.
+    """
+    workers = workers or default_workers()
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    max_pending = max_pending or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+_END = object()
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is _END:
+            return
+        yield item
+
+
+def pipeline(source, stages, queue_size: int = 8):
+    """
+    Chains generator stages, each running in its own thread, connected by
+    bounded queues.
+
+    Every stage is a callable taking an iterable and returning an iterator
+    (typically a generator function). A stage blocks once its output queue
+    holds `queue_size` items, so a slow consumer throttles the producers and
+    memory stays bounded. An exception in any stage stops the others and is
+    re-raised to the consumer; closing the returned generator early stops
+    all threads.
+
+    Args:
+        source (iterable): First stage's input.
+        stages (list): Callables applied in order.
+        queue_size (int): Items buffered between two stages.
+
+    Yields:
+        Items produced by the last stage.
+    """
+    stop = threading.Event()
+    errors = []
+
+    def run(iterable, out: queue.Queue):
+        try:
+            for item in iterable:
+                if not _put(out, item, stop):
+                    return
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            _put(out, _END, stop)
+
+    threads = []
+    upstream = source
+    for stage in [iter] + list(stages):
+        out = queue.Queue(maxsize=queue_size)
+        thread = threading.Thread(target=run, args=(stage(upstream), out), daemon=True)
+        threads.append(thread)
+        upstream = _drain(out, stop)
+
+    for thread in threads:
+        thread.start()
+    try:
+        yield from upstream
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
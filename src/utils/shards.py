@@ -0,0 +1,347 @@
+"""
+Sharded sentence corpus for random access from annotation tools and training loaders.
+
+A corpus is a directory of fixed-size shards plus a manifest:
+
+    manifest.json                    shard size, row counts, file names, columns
+    shard-<id>-00000.txt             UTF-8 text of the shard's sentences, back to back
+    shard-<id>-00000.offsets.npy     int64 byte offsets, one per sentence plus the end
+    shard-<id>-00000.meta.parquet    the other columns, same row order (or .csv)
+
+<id> is random per export, so re-exporting into the same directory never
+touches the files of the corpus being replaced until the new manifest is in.
+
+Sentence i lives in shard i // shard_size at row i % shard_size, and its
+bytes are blob[offsets[row]:offsets[row + 1]], so a lookup is two array
+reads on memory-mapped files: no parsing, and nothing but the touched pages
+is read. Read-only maps of the same files are shared through the page
+cache, so several DataLoader workers hold one copy of the data.
+
+Usage:
+    corpus = ShardedCorpus('data/shards')
+    corpus[12345]                     # str
+    corpus.get_batch([5, 17, 99])     # list of str
+    corpus.metadata(12345)            # dict of the other columns
+"""
+import json
+import logging
+import mmap
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.utils.file_io import iter_table, read_table, TableWriter
+from src.utils import metrics
+
+FORMAT = 'sentence-shards'
+VERSION = 1
+MANIFEST = 'manifest.json'
+DEFAULT_SHARD_SIZE = 1_000_000
+
+
+def _shard_files(prefix: str, index: int, meta_ext: str) -> dict:
+    stem = f"{prefix}-{index:05d}"
+    return {'text': f"{stem}.txt", 'offsets': f"{stem}.offsets.npy", 'meta': f"{stem}.meta{meta_ext}"}
+
+
+class ShardWriter:
+    """
+    Writes sentence DataFrames into a sharded corpus directory.
+
+    Text bytes are streamed to the open shard's blob and metadata to its
+    table, so memory is bounded by the incoming chunk plus one shard's
+    offsets. Every export writes its shards under names of its own and
+    the manifest is replaced once, on close(), after which the shards of
+    the previous export are deleted; until then readers keep seeing the
+    previous corpus. Leaving the `with` block on an exception discards the
+    new shards instead (see abort()).
+
+    Args:
+        path (str): Output directory.
+        text_column (str): Column stored in the blobs.
+        shard_size (int): Sentences per shard (the last one may be smaller).
+        meta_format (str): 'parquet' or 'csv' for the metadata tables.
+    """
+
+    def __init__(self, path: str, text_column: str = 'sentence_no_emoji', shard_size: int = DEFAULT_SHARD_SIZE,
+                 meta_format: str = 'parquet'):
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        self.path = path
+        self.text_column = text_column
+        self.shard_size = shard_size
+        self.meta_ext = '.parquet' if meta_format == 'parquet' else '.csv'
+        self.logger = logging.getLogger(__name__)
+        self.shards = []
+        self.columns = None
+        self.count = 0
+        self.closed = False
+        # Unique per export, so the new shards never overwrite the ones readers still use
+        self._prefix = f"shard-{os.urandom(4).hex()}"
+        self._blob = None
+        self._offsets = []
+        self._meta = None
+        self._rows = 0
+        self._bytes = 0
+        os.makedirs(path, exist_ok=True)
+
+    def _open_shard(self):
+        files = _shard_files(self._prefix, len(self.shards), self.meta_ext)
+        self._files = files
+        self._blob = open(os.path.join(self.path, files['text']), 'wb')
+        self._meta = TableWriter(os.path.join(self.path, files['meta']))
+        self._offsets = [np.zeros(1, dtype=np.int64)]
+        self._rows = 0
+        self._bytes = 0
+
+    def _close_shard(self):
+        self._blob.close()
+        self._meta.close()
+        np.save(os.path.join(self.path, self._files['offsets']), np.concatenate(self._offsets), allow_pickle=False)
+        self.shards.append({'rows': self._rows, 'bytes': self._bytes, 'files': self._files})
+        self._blob = None
+
+    def _write_manifest(self):
+        manifest = {
+            'format': FORMAT,
+            'version': VERSION,
+            'text_column': self.text_column,
+            'metadata_columns': [c for c in (self.columns or []) if c != self.text_column],
+            'shard_size': self.shard_size,
+            'rows': self.count,
+            'shards': self.shards,
+        }
+        tmp = os.path.join(self.path, MANIFEST + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, os.path.join(self.path, MANIFEST))
+
+    def _remove_shards(self, keep: set) -> int:
+        # Shard files of earlier exports, and of ones that died before their manifest
+        removed = 0
+        for name in os.listdir(self.path):
+            if name.startswith('shard-') and name not in keep:
+                os.remove(os.path.join(self.path, name))
+                removed += 1
+        return removed
+
+    def write(self, df: pd.DataFrame):
+        """
+        Appends sentence rows; `text_column` must be present.
+        """
+        if self.text_column not in df.columns:
+            raise KeyError(f"Column '{self.text_column}' not in the input")
+        if self.columns is None:
+            self.columns = [str(c) for c in df.columns]
+        texts = df[self.text_column].fillna('').astype(str)
+        meta = df.drop(columns=[self.text_column])
+        start = 0
+        while start < len(df):
+            if self._blob is None:
+                self._open_shard()
+            stop = min(len(df), start + self.shard_size - self._rows)
+            encoded = [t.encode('utf-8') for t in texts.iloc[start:stop]]
+            lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            self._blob.write(b''.join(encoded))
+            self._offsets.append(self._bytes + np.cumsum(lengths))
+            self._bytes += int(lengths.sum())
+            if len(meta.columns):
+                self._meta.write(meta.iloc[start:stop])
+            self._rows += stop - start
+            self.count += stop - start
+            start = stop
+            if self._rows == self.shard_size:
+                self._close_shard()
+
+    def close(self):
+        """
+        Finishes the last shard, publishes the manifest and deletes the previous export's shards.
+        """
+        if self.closed:
+            return
+        if self._blob is not None:
+            self._close_shard()
+        self._write_manifest()
+        self.closed = True
+        removed = self._remove_shards({name for shard in self.shards for name in shard['files'].values()})
+        if removed:
+            self.logger.info(f"Removed {removed} files of the previous corpus in {self.path}")
+
+    def abort(self):
+        """
+        Deletes the shards written so far and leaves the previous corpus (if any) as it was.
+        """
+        if self.closed:
+            return
+        if self._blob is not None:
+            self._blob.close()
+            self._meta.close()
+            self._blob = None
+        self.closed = True
+        for name in os.listdir(self.path):
+            if name.startswith(self._prefix + '-'):
+                os.remove(os.path.join(self.path, name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ShardedCorpus:
+    """
+    Random access to a corpus written by ShardWriter.
+
+    Shards are memory-mapped on first use. The maps are not pickled, so the
+    object can be handed to DataLoader workers, which then map the files
+    themselves and share the pages through the OS cache.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != FORMAT:
+            raise ValueError(f"{path} is not a sharded sentence corpus")
+        self.text_column = manifest['text_column']
+        self.metadata_columns = manifest['metadata_columns']
+        self.shard_size = manifest['shard_size']
+        self.shards = manifest['shards']
+        self.rows = manifest['rows']
+        self._maps = {}
+        self._meta_cache = (None, None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_maps'] = {}
+        state['_meta_cache'] = (None, None)
+        return state
+
+    def __len__(self):
+        return self.rows
+
+    def _shard(self, index: int) -> tuple:
+        maps = self._maps.get(index)
+        if maps is None:
+            files = self.shards[index]['files']
+            # A memoryview over the map slices without NumPy's per-object overhead;
+            # an empty file cannot be mapped
+            blob = memoryview(b'')
+            if self.shards[index]['bytes']:
+                with open(os.path.join(self.path, files['text']), 'rb') as f:
+                    blob = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            # Still backed by the map, but indexed as a plain ndarray (np.memmap slices are slow)
+            offsets = np.load(os.path.join(self.path, files['offsets']), mmap_mode='r').view(np.ndarray)
+            maps = self._maps[index] = (blob, offsets)
+        return maps
+
+    def locate(self, i: int) -> tuple:
+        """
+        (shard, row) of sentence i; negative indices count from the end.
+        """
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError(f"sentence {i} out of range for {self.rows} sentences")
+        return divmod(i, self.shard_size)
+
+    def raw(self, i: int) -> memoryview:
+        """
+        UTF-8 bytes of sentence i as a view into the mapped shard (no copy).
+        """
+        shard, row = self.locate(i)
+        blob, offsets = self._shard(shard)
+        start, end = offsets[row:row + 2].tolist()
+        return blob[start:end]
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.raw(i), 'utf-8')
+
+    def get_batch(self, indices) -> list:
+        """
+        Sentences at the given positions, in that order.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = np.where(indices < 0, indices + self.rows, indices)
+        if len(indices) and (indices.min() < 0 or indices.max() >= self.rows):
+            raise IndexError(f"sentence index out of range for {self.rows} sentences")
+        shards, rows = np.divmod(indices, self.shard_size)
+        out = [None] * len(indices)
+        # One offsets gather per shard touched
+        for shard in np.unique(shards).tolist():
+            positions = np.flatnonzero(shards == shard)
+            blob, offsets = self._shard(shard)
+            starts = offsets[rows[positions]].tolist()
+            ends = offsets[rows[positions] + 1].tolist()
+            for position, start, end in zip(positions.tolist(), starts, ends):
+                out[position] = str(blob[start:end], 'utf-8')
+        return out
+
+    def __iter__(self):
+        for index in range(len(self.shards)):
+            yield from self.iter_shard(index)
+
+    def iter_shard(self, index: int):
+        """
+        Sentences of one shard in order (a contiguous read of its blob).
+        """
+        blob, offsets = self._shard(index)
+        bounds = offsets.tolist()
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            yield str(blob[start:end], 'utf-8')
+
+    def shard_metadata(self, index: int) -> pd.DataFrame:
+        """
+        Metadata table of one shard (the most recent one is kept in memory).
+        """
+        cached_index, table = self._meta_cache
+        if cached_index != index:
+            path = os.path.join(self.path, self.shards[index]['files']['meta'])
+            table = read_table(path) if os.path.exists(path) else pd.DataFrame(index=range(self.shards[index]['rows']))
+            self._meta_cache = (index, table)
+        return table
+
+    def metadata(self, i: int) -> dict:
+        """
+        Metadata columns of sentence i.
+        """
+        shard, row = self.locate(i)
+        return self.shard_metadata(shard).iloc[row].to_dict()
+
+
+def export_shards(file_paths: list, output_dir: str, text_column: str = 'sentence_no_emoji',
+                  shard_size: int = DEFAULT_SHARD_SIZE, columns: list = None, meta_format: str = 'parquet',
+                  chunksize: int = 50_000) -> int:
+    """
+    Converts sentence-level datasets (e.g. the output of `combine`) into a sharded corpus.
+
+    Args:
+        file_paths (list): CSV/Parquet inputs, concatenated in order.
+        output_dir (str): Corpus directory (replaced if it already holds one).
+        text_column (str): Column stored in the memory-mapped blobs.
+        shard_size (int): Sentences per shard.
+        columns (list): Metadata columns to keep (default: all others).
+        meta_format (str): 'parquet' or 'csv' metadata tables.
+        chunksize (int): Rows read per chunk.
+
+    Returns:
+        int: Number of sentences written.
+    """
+    logger = logging.getLogger(__name__)
+    read_columns = [text_column] + [c for c in columns if c != text_column] if columns else None
+    with ShardWriter(output_dir, text_column=text_column, shard_size=shard_size,
+                     meta_format=meta_format) as writer:
+        for fp in file_paths:
+            rows = 0
+            for chunk in iter_table(fp, columns=read_columns, chunksize=chunksize):
+                writer.write(chunk)
+                rows += len(chunk)
+            logger.info(f"Exported {fp}, rows: {rows}")
+            metrics.records('export_shards', rows)
+    logger.info(f"Wrote {writer.count} sentences in {len(writer.shards)} shards to {output_dir}")
+    return writer.count
@@ -1,59 +1,201 @@
+import os
 import pandas as pd
+import numpy as np
 import logging
 from collections import Counter
-import regex
+from functools import partial
 
-def generate_stats(file_paths: list):
+from .file_io import table_columns, iter_table
+from .parallel import ordered_map
+from .sketches import hash_items, HyperLogLog, CountMinSketch, SpaceSaving
+from . import metrics
+from src.processing.linguistic import LinguisticValidator
+from src.processing.segmenter import count_batch
+TEXT_COLUMNS = ('processed_text', 'text', 'sentence_original')
+# Indic-script ratio histogram: ten bins over [0, 1]
+RATIO_BINS = np.linspace(0.0, 1.0, 11)
+
+
+class StatsPartial:
+    """
+    Statistics over part of a corpus; partials of different chunks merge
+    into the statistics of their union.
+
+    With `approximate`, the vocabulary is summarised by a HyperLogLog
+    (distinct words), a Count-Min sketch (word counts) and a SpaceSaving
+    summary (top-word candidates) instead of an exact Counter, so memory
+    stays fixed however large the corpus is.
     """
-    Generates statistics for one or multiple CSV datasets.
-    
+
+    def __init__(self, approximate: bool = False, top_k: int = 20):
+        self.approximate = approximate
+        self.top_k = top_k
+        self.docs = 0
+        self.words = 0
+        self.sentences = 0
+        self.by_source = {}
+        if approximate:
+            self.hll = HyperLogLog()
+            self.cms = CountMinSketch()
+            self.heavy = SpaceSaving(capacity=max(1000, 50 * top_k))
+        else:
+            self.vocab = Counter()
+
+    def _source(self, source: str):
+        if source not in self.by_source:
+            self.by_source[source] = {'docs': 0, 'words': 0, 'sentences': 0,
+                                      'ratio_hist': np.zeros(len(RATIO_BINS) - 1, dtype=np.int64)}
+        return self.by_source[source]
+
+    def add_chunk(self, texts: pd.Series, sources: pd.Series):
+        texts = texts.astype(str)
+        tokens = texts.str.split()
+        word_counts = tokens.str.len()
+        # Same segmenter as `combine`, so both report the same sentences
+        sentence_counts = pd.Series(count_batch(texts.tolist()), index=texts.index)
+        ratios = LinguisticValidator.get_script_stats_batch(texts.tolist())['indic_ratio']
+
+        self.docs += len(texts)
+        self.words += int(word_counts.sum())
+        self.sentences += int(sentence_counts.sum())
+
+        frame = pd.DataFrame({'source': sources.to_numpy(), 'words': word_counts.to_numpy(),
+                              'sentences': sentence_counts.to_numpy(), 'ratio': ratios})
+        for source, group in frame.groupby('source', sort=False, observed=True):
+            entry = self._source(str(source))
+            entry['docs'] += len(group)
+            entry['words'] += int(group['words'].sum())
+            entry['sentences'] += int(group['sentences'].sum())
+            entry['ratio_hist'] += np.histogram(group['ratio'].to_numpy(), bins=RATIO_BINS)[0]
+
+        counts = tokens.explode().dropna().value_counts()
+        if self.approximate:
+            hashes = hash_items(counts.index.to_numpy())
+            self.hll.add_hashes(hashes)
+            self.cms.add_hashes(hashes, counts.to_numpy())
+            # Only the chunk's top words become candidates; any word left out may be
+            # undercounted by up to the largest count left out
+            head = counts.head(self.heavy.capacity)
+            self.heavy.update(head.to_dict())
+            if len(counts) > len(head):
+                self.heavy.error += int(counts.iloc[len(head)])
+        else:
+            self.vocab.update(counts.to_dict())
+
+    def merge(self, other: 'StatsPartial'):
+        self.docs += other.docs
+        self.words += other.words
+        self.sentences += other.sentences
+        for source, theirs in other.by_source.items():
+            entry = self._source(source)
+            for key in ('docs', 'words', 'sentences', 'ratio_hist'):
+                entry[key] += theirs[key]
+        if self.approximate:
+            self.hll.merge(other.hll)
+            self.cms.merge(other.cms)
+            self.heavy.merge(other.heavy)
+        else:
+            self.vocab.update(other.vocab)
+        return self
+
+    def top_words(self) -> list:
+        if not self.approximate:
+            return self.vocab.most_common(self.top_k)
+        # Rank the SpaceSaving candidates by their (never undercounting) Count-Min estimates
+        candidates = [word for word, _ in self.heavy.top(len(self.heavy.counts))]
+        if not candidates:
+            return []
+        estimates = self.cms.estimate(hash_items(candidates))
+        ranked = sorted(zip(candidates, estimates.tolist()), key=lambda kv: kv[1], reverse=True)
+        return ranked[:self.top_k]
+
+    def result(self) -> dict:
+        vocab_size = self.hll.count() if self.approximate else len(self.vocab)
+        return {
+            "Total Documents": self.docs,
+            "Total Words": self.words,
+            "Total Sentences (approx)": self.sentences,
+            "Vocabulary Size": vocab_size,
+            "Vocabulary Method": "hyperloglog" if self.approximate else "exact",
+            "Avg Words/Doc": round(self.words / self.docs, 2) if self.docs else 0,
+            "Top Words": self.top_words(),
+            "By Source": {
+                source: {
+                    "Documents": entry['docs'],
+                    "Words": entry['words'],
+                    "Sentences": entry['sentences'],
+                    "Avg Words/Doc": round(entry['words'] / entry['docs'], 2) if entry['docs'] else 0,
+                } for source, entry in self.by_source.items()
+            },
+            "Script Ratio Histogram": {
+                source: entry['ratio_hist'].tolist() for source, entry in self.by_source.items()
+            },
+        }
+
+
+def chunk_stats(chunk, approximate: bool = False, top_k: int = 20) -> StatsPartial:
+    """
+    Map step: statistics of one (texts, sources) chunk, run in a worker process.
+    """
+    texts, sources = chunk
+    partial_stats = StatsPartial(approximate=approximate, top_k=top_k)
+    partial_stats.add_chunk(texts, sources)
+    return partial_stats
+
+
+def _file_source(fp: str) -> str:
+    # Files without a source_type column are labelled by origin
+    return 'youtube_comment' if 'youtube' in fp.lower() else os.path.splitext(os.path.basename(fp))[0]
+
+
+def generate_stats(file_paths: list, workers: int = 1, chunksize: int = 50_000,
+                   approximate: bool = False, top_k: int = 20):
+    """
+    Generates statistics for one or multiple CSV or Parquet datasets.
+
+    Files are streamed in chunks of `chunksize` rows (text and source columns
+    only); each chunk is reduced to a StatsPartial, across `workers`
+    processes, and the partials are merged.
+
     Args:
-        file_paths (list): List of paths to CSV files.
+        file_paths (list): List of paths to CSV or Parquet files.
+        workers (int): Worker processes (1 runs inline).
+        chunksize (int): Rows per chunk.
+        approximate (bool): Use HyperLogLog / Count-Min / SpaceSaving sketches
+                            instead of an exact vocabulary Counter.
+        top_k (int): Number of most frequent words to report.
+
+    Returns:
+        dict: Corpus totals, top words, per-source breakdown and
+              per-source Indic-script ratio histograms.
     """
     logger = logging.getLogger(__name__)
-    
-    total_docs = 0
-    total_words = 0
-    total_sentences = 0
-    vocab = Counter()
-    
-    # Assamese sentence delimiter approximation (Danda | ?)
-    # standard py regex might not handle all perfectly, but we try standard split
-    
-    for fp in file_paths:
-        try:
-            df = pd.read_csv(fp)
-            # Check for text column
-            col = 'processed_text' if 'processed_text' in df.columns else 'text'
-            
-            if col not in df.columns:
-                logger.warning(f"Skipping {fp}: No text column found.")
-                continue
-                
-            logger.info(f"Analyzing {fp}...")
-            
-            docs = df[col].dropna().astype(str).tolist()
-            total_docs += len(docs)
-            
-            for doc in docs:
-                # Word count (splitting by whitespace is crude but effective for stats)
-                words = doc.split()
-                total_words += len(words)
-                vocab.update(words)
-                
-                # Sentence count (using Danda '।' and '?')
-                sentences = regex.split(r'[।?]', doc)
-                total_sentences += len([s for s in sentences if s.strip()])
-                
-        except Exception as e:
-            logger.error(f"Error processing {fp}: {e}")
-
-    stats = {
-        "Total Documents": total_docs,
-        "Total Words": total_words,
-        "Total Sentences (approx)": total_sentences,
-        "Vocabulary Size": len(vocab),
-        "Avg Words/Doc": round(total_words / total_docs, 2) if total_docs else 0
-    }
-    
-    return stats
+
+    def chunks():
+        for fp in file_paths:
+            try:
+                columns = table_columns(fp)
+                # Check for text column
+                col = next((c for c in TEXT_COLUMNS if c in columns), None)
+                if col is None:
+                    logger.warning(f"Skipping {fp}: No text column found.")
+                    continue
+
+                logger.info(f"Analyzing {fp}...")
+                has_source = 'source_type' in columns
+                wanted = [col, 'source_type'] if has_source else [col]
+                for chunk in iter_table(fp, columns=wanted, chunksize=chunksize):
+                    chunk = chunk[chunk[col].notna()]
+                    sources = chunk['source_type'].astype(str) if has_source \
+                        else pd.Series(_file_source(fp), index=chunk.index)
+                    yield chunk[col], sources
+            except Exception as e:
+                logger.error(f"Error processing {fp}: {e}")
+
+    total = StatsPartial(approximate=approximate, top_k=top_k)
+    reduce_chunk = partial(chunk_stats, approximate=approximate, top_k=top_k)
+    for partial_stats in ordered_map(reduce_chunk, chunks(), workers=workers):
+        total.merge(partial_stats)
+        metrics.records('stats', partial_stats.docs)
+
+    return total.result()
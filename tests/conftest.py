@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixture_server import FixtureServer
+
+ASSAMESE_PARAGRAPH = "অসমীয়া ভাষা ব্ৰহ্মপুত্ৰ উপত্যকাৰ মানুহৰ মাতৃভাষা।"
+
+ENGLISH_HTML = b"<html><body><p>Terms of use and privacy policy of this site.</p></body></html>"
+
+ARTICLE_HTML = (
+    "<html><head><meta property='og:title' content='শিৰোনাম'></head>"
+    f"<body><h1>শিৰোনাম</h1><p>{ASSAMESE_PARAGRAPH}</p><p>Copyright 2024</p></body></html>"
+).encode('utf-8')
+
+
+@pytest.fixture
+def article_servers():
+    """
+    Factory fixture for local stand-ins of news sites:
+    article_servers(hosts=3, latency=0.05) starts a FixtureServer with one
+    port per host that serves ARTICLE_HTML for every path not in `routes`.
+    """
+    started = []
+
+    def start(hosts=1, latency=0.0):
+        servers = FixtureServer(pages={}, default_page=ARTICLE_HTML, latency=latency, hosts=hosts).start()
+        started.append(servers)
+        return servers
+
+    yield start
+    for servers in started:
+        servers.stop()
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    """Drops HostThrottle's random jitter, which applies even with a zero delay."""
+    from src.scrapers import throttle
+    monkeypatch.setattr(throttle.random, 'uniform', lambda a, b: 0.0)
@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from src.processing.aggregation import aggregate_and_split
+
+
+@pytest.fixture
+def sources(tmp_path):
+    news = tmp_path / 'news.csv'
+    pd.DataFrame({
+        'processed_text': ["প্ৰথম বাক্য। দ্বিতীয় বাক্য!", "তৃতীয় বাক্য 😀। প্ৰথম বাক্য।", "😀😀", None],
+        'source_url': ['u1', 'u2', 'u3', 'u4'],
+        'source_type': ['news_article'] * 4,
+    }).to_csv(news, index=False)
+    comments = tmp_path / 'youtube_comments.csv'
+    pd.DataFrame({
+        'processed_text': ["দ্বিতীয় বাক্য! নতুন মন্তব্য?"],
+        'source_url': ['v1'],
+    }).to_csv(comments, index=False)
+    return [str(news), str(comments)]
+
+
+@pytest.mark.parametrize('chunksize', [1, 50_000])
+def test_sentences_are_split_and_deduplicated_across_chunks_and_files(sources, tmp_path, chunksize):
+    output = tmp_path / 'combined.csv'
+
+    aggregate_and_split(sources, str(output), chunksize=chunksize)
+
+    result = pd.read_csv(output)
+    # First occurrence wins; emoji-only sentences are dropped
+    assert result['sentence_original'].tolist() == [
+        "প্ৰথম বাক্য।", "দ্বিতীয় বাক্য!", "তৃতীয় বাক্য 😀।", "নতুন মন্তব্য?",
+    ]
+    assert result['sentence_no_emoji'].tolist()[2] == "তৃতীয় বাক্য ।"
+    assert result['source_url'].tolist() == ['u1', 'u1', 'u2', 'v1']
+    assert result['source_type'].tolist() == ['news', 'news', 'news', 'youtube_comment']
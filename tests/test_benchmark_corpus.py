@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from benchmarks.corpus import BLOCK, iter_corpus, make_corpus, write_corpus
+from src.utils.file_io import iter_table
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def test_corpus_is_deterministic_per_seed():
+    first = make_corpus(BLOCK + 500, seed=1)
+
+    assert first.equals(make_corpus(BLOCK + 500, seed=1))
+    assert not first['text'].equals(make_corpus(BLOCK + 500, seed=2)['text'])
+    assert [len(block) for block in iter_corpus(BLOCK + 500, seed=1)] == [BLOCK, 500]
+    assert set(first['source_type']) == {'youtube_comment', 'news_article'}
+
+
+def test_corpus_has_duplicates_near_the_requested_rate():
+    corpus = make_corpus(5000, seed=3, dup_rate=0.2)
+
+    duplicated = corpus['text'].duplicated().mean()
+    assert 0.15 < duplicated < 0.3
+
+
+@pytest.mark.parametrize('suffix', ['.csv', pytest.param('.parquet', marks=pytest.mark.skipif(
+    pyarrow is None, reason="pyarrow is not installed"))])
+def test_written_corpus_reads_back_the_same_in_any_chunk_size(tmp_path, suffix):
+    path = str(tmp_path / f'corpus{suffix}')
+    assert write_corpus(path, 3000, seed=4) == 3000
+
+    expected = make_corpus(3000, seed=4)
+    for chunksize in (700, 3000):
+        back = pd.concat(list(iter_table(path, chunksize=chunksize)), ignore_index=True)
+        assert back['text'].tolist() == expected['text'].tolist()
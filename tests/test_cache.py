@@ -0,0 +1,69 @@
+import os
+
+from src.scrapers.cache import ResponseCache
+from tests.conftest import ARTICLE_HTML
+from tests.test_news import make_scraper
+
+
+def test_store_and_read_back(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store('http://a/1', b'<p>body</p>', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+
+    entry = cache.lookup('http://a/1')
+
+    assert cache.read_body(entry) == b'<p>body</p>'
+    assert cache.is_fresh(entry)
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"v1"',
+                                                'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert cache.lookup('http://a/2') is None
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store('http://a/1', b'same page')
+    cache.store('http://a/2', b'same page')
+
+    blobs = [name for _, _, names in os.walk(tmp_path / 'blobs') for name in names]
+    assert len(blobs) == 1
+    # Replacing one URL's body keeps the blob the other still points to
+    cache.store('http://a/1', b'new page')
+    assert cache.read_body(cache.lookup('http://a/2')) == b'same page'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    # Random bodies don't compress: each blob is a little over 40 bytes, so the fourth overflows
+    cache = ResponseCache(str(tmp_path), max_bytes=160)
+    for i in range(3):
+        cache.store(f'http://a/{i}', os.urandom(40))
+    cache.read_body(cache.lookup('http://a/0'))
+    cache.store('http://a/3', os.urandom(40))
+
+    assert cache.lookup('http://a/0') is not None
+    assert cache.lookup('http://a/1') is None
+    assert cache.lookup('http://a/3') is not None
+
+
+def test_stale_page_is_revalidated_and_served_from_cache_on_304(article_servers, tmp_path):
+    servers = article_servers()
+    url = f"{servers.base_urls[0]}/article"
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    cache.store(url, ARTICLE_HTML, etag='"v1"')
+    servers.routes['/article'] = (304, b'', {})
+
+    articles = list(make_scraper(cache=cache).scrape(url))
+
+    assert len(articles) == 1
+    assert servers.log[-1].headers['If-None-Match'] == '"v1"'
+
+
+def test_fresh_page_and_offline_replay_send_no_requests(article_servers, tmp_path):
+    servers = article_servers()
+    cached, missing = f"{servers.base_urls[0]}/cached", f"{servers.base_urls[0]}/missing"
+    cache = ResponseCache(str(tmp_path))
+    cache.store(cached, ARTICLE_HTML)
+
+    assert len(list(make_scraper(cache=cache).scrape(cached))) == 1
+    replay = make_scraper(cache=cache, offline=True)
+    assert len(list(replay.scrape(cached))) == 1
+    assert list(replay.scrape(missing)) == []
+    assert servers.log == []
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from src.processing.cleaning import clean_dataset
+from src.processing.text import anonymize_text, clean_text, normalize_batch, normalize_text, remove_emojis
+
+TEXTS = [
+    "অসমীয়া ভাষা 😀 ১২ টকা, 100 টকা",
+    "ফোন কৰক 9876543210 বা +91 98765-43210",
+    "mail me at someone@example.com today",
+    "চাওক https://example.com/a?b=1 এতিয়া",
+    "keycaps #1 *2 and ©® symbols 👍🏽",
+    "  padded  ",
+    "ক্র decomposed é",
+    "",
+]
+
+
+def per_step(text, mask_pii=True, strip_emojis=False):
+    # The cleaner before the fused pass: one function per step
+    text = clean_text(text)
+    if mask_pii:
+        text = anonymize_text(text)
+    if strip_emojis:
+        text = remove_emojis(text)
+    return text.strip()
+
+
+@pytest.mark.parametrize('mask_pii', [True, False])
+@pytest.mark.parametrize('strip_emojis', [True, False])
+def test_fused_pass_matches_per_step_cleaner(mask_pii, strip_emojis):
+    expected = [per_step(t, mask_pii, strip_emojis) for t in TEXTS]
+
+    assert [normalize_text(t, mask_pii, strip_emojis) for t in TEXTS] == expected
+    assert normalize_batch(TEXTS, mask_pii, strip_emojis) == expected
+
+
+def test_emoji_removal_keeps_digits_and_ascii_symbols():
+    assert remove_emojis("১২ 100 #1 *😀") == "১২ 100 #1 *"
+    assert normalize_text("১২ 100 #1 *😀", strip_emojis=True) == "১২ 100 #1 *"
+
+
+def test_non_strings_become_empty():
+    assert normalize_batch([None, float('nan'), "ক"]) == ["", "", "ক"]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_clean_dataset_keeps_row_order_across_chunks(tmp_path, workers):
+    source = tmp_path / 'in.csv'
+    output = tmp_path / 'out.csv'
+    texts = [f"{i} টকা 😀 a{i}@example.com" for i in range(25)] + [" 😀 "]
+    pd.DataFrame({'id': range(len(texts)), 'text': texts}).to_csv(source, index=False)
+
+    stats = clean_dataset(str(source), str(output), strip_emojis=True, drop_empty=True,
+                          chunksize=4, workers=workers)
+
+    result = pd.read_csv(output)
+    assert result['id'].tolist() == list(range(25))
+    assert result['processed_text'].tolist() == [f"{i} টকা  <EMAIL>" for i in range(25)]
+    assert stats == {'total_rows': 26, 'empty_rows': 1, 'written_rows': 25}
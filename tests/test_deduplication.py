@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from src.processing.deduplication import (
+    deduplicate_dataset, find_near_duplicates, lsh_params, minhash_signatures, near_duplicate_clusters,
+)
+
+VARIANTS = ["খুব ভাল লাগিল 👍", "খুব ভাল  লাগিল👍👍", "খুব ভাল লাগিল"]
+OTHERS = ["আজি বৰষুণ দিছে", "কালি বজাৰলৈ যাম", "ধন্যবাদ সকলোকে"]
+
+
+def test_signatures_ignore_emoji_spacing_and_case():
+    signatures = minhash_signatures(VARIANTS + ["Good Morning", "good  morning 😀"])
+
+    assert (signatures[0] == signatures[1]).all() and (signatures[0] == signatures[2]).all()
+    assert (signatures[3] == signatures[4]).all()
+    assert (signatures[0] != signatures[3]).any()
+
+
+def test_batching_does_not_change_signatures():
+    texts = VARIANTS + OTHERS + ["ক" * 500, "", "ক"]
+
+    whole = minhash_signatures(texts)
+
+    assert (minhash_signatures(texts, batch_shingles=16) == whole).all()
+
+
+def test_near_duplicates_cluster_to_the_earliest_member():
+    texts = [OTHERS[0], VARIANTS[0], OTHERS[1], VARIANTS[1], "", VARIANTS[2], ""]
+
+    representatives = find_near_duplicates(texts, threshold=0.8)
+
+    # Empty texts stay singletons rather than clustering with each other
+    assert representatives.tolist() == [0, 1, 2, 1, 4, 1, 6]
+
+
+def test_every_similar_pair_sharing_a_bucket_is_linked():
+    # Few distinct values: many bucket collisions between dissimilar items
+    rng = np.random.RandomState(0)
+    signatures = rng.randint(0, 3, size=(120, 8)).astype(np.uint32)
+    threshold = 0.5
+    bands, rows = lsh_params(threshold, 8)
+
+    reps = near_duplicate_clusters(signatures, threshold=threshold)
+
+    for i, j in itertools.combinations(range(len(signatures)), 2):
+        shares_bucket = any((signatures[i, b * rows:(b + 1) * rows] == signatures[j, b * rows:(b + 1) * rows]).all()
+                            for b in range(bands))
+        if shares_bucket and (signatures[i] == signatures[j]).mean() >= threshold:
+            assert reps[i] == reps[j]
+    assert all(reps[r] == r and r <= i for i, r in enumerate(reps))
+
+
+def test_deduplicate_dataset_removes_exact_and_near_duplicates(tmp_path):
+    source, output = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    texts = [VARIANTS[0], OTHERS[0], VARIANTS[0], VARIANTS[1], OTHERS[1]]
+    pd.DataFrame({'processed_text': texts, 'n': range(5)}).to_csv(source, index=False)
+
+    stats = deduplicate_dataset(str(source), str(output), near_duplicates=True)
+
+    assert pd.read_csv(output)['n'].tolist() == [0, 1, 4]
+    assert stats['removed_count'] == 1
+    assert stats['near_duplicate_removed'] == 1
+    assert stats['largest_cluster'] == 2
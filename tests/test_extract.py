@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from benchmarks.bench_extraction import FIXTURE_DIR, load_pages
+from src.scrapers.extract import extract_bs4, extract_stream, get_extractor
+
+# Markup fragments that exercise html.parser's quirks: stray and void end
+# tags, text-skipping elements, CDATA, comments and odd character references
+FRAGMENTS = [
+    '<p>', '</p>', '<h1>', '</h1>', '<template>', '</template>', '<rt>', '</rt>', '<rp>', '</rp>',
+    '<script>', '</script>', '<style>', '</style>', '<b>', '</b>', '<div>', '</div>', '<table>',
+    '</table>', '<br>', '</br>', '<br/>', '<img src=x>', '<p/>', '<h1/>', '<![CDATA[ cd ]]>',
+    '<![CDATA[open', '<!-- c -->', '<!DOCTYPE html>', '<?pi x?>', '&amp;', '&#39;', '&#39abc',
+    '&#x9f;', '&#0;', '&nbsp;', '&bogus;', ' text ', 'অসমীয়া', '\n',
+    '<meta property="og:title" content="T">',
+]
+
+
+def random_page(seed):
+    rng = random.Random(seed)
+    return ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 30)))
+
+
+@pytest.mark.parametrize('name,page', sorted(load_pages(FIXTURE_DIR).items()))
+def test_stream_matches_bs4_on_recorded_pages(name, page):
+    assert extract_stream(page) == extract_bs4(page)
+
+
+@pytest.mark.parametrize('page', [
+    '<p>a<template>b<![CDATA[c]]>d</template>e</p>',
+    '<p><rp>x<![CDATA[c]]>y</rp></p>',
+    '<p><script><![CDATA[x]]></script>y</p>',
+    '<p>one<table><p>two</table>three',
+])
+def test_stream_matches_bs4_on_edge_cases(page):
+    assert extract_stream(page) == extract_bs4(page)
+
+
+def test_stream_matches_bs4_on_random_markup():
+    mismatches = [page for page in map(random_page, range(3000)) if extract_stream(page) != extract_bs4(page)]
+    assert mismatches == []
+
+
+def test_auto_resolves_to_stream():
+    assert get_extractor('auto') is extract_stream
+    with pytest.raises(ValueError):
+        get_extractor('regex')
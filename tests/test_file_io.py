@@ -0,0 +1,204 @@
+import csv
+import os
+
+import pandas as pd
+import pytest
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from src.utils.file_io import (CsvBatchWriter, JsonlIndex, JsonlWriter, TableWriter, iter_jsonl, iter_table,
+                               open_batch_writer, read_table, table_columns, write_table)
+
+# Parquet and zstd are optional extras; the other tests run without them
+needs_pyarrow = pytest.mark.skipif(pa is None, reason="pyarrow is not installed")
+
+CODECS = ['', '.gz', pytest.param('.zst', marks=pytest.mark.skipif(zstandard is None,
+                                                                     reason="zstandard is not installed"))]
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_batch_writer_flushes_in_batches(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    flushes = []
+    with CsvBatchWriter(path, batch_size=2, on_flush=lambda: flushes.append(read_rows(path))) as writer:
+        for i in range(5):
+            writer.write({'text': f't{i}', 'n': i})
+
+    assert [len(rows) for rows in flushes] == [2, 4, 5]
+    assert [row['text'] for row in read_rows(path)] == ['t0', 't1', 't2', 't3', 't4']
+    assert writer.count == 5
+    assert not os.path.exists(path + '.commit')
+
+
+def test_csv_batch_writer_appends_in_existing_column_order(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    with CsvBatchWriter(path) as writer:
+        writer.write({'a': 1, 'b': 2})
+    with CsvBatchWriter(path) as writer:
+        writer.write({'b': 4, 'a': 3, 'extra': 'dropped'})
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    # One BOM and one header, however many runs appended
+    assert raw.count(b'\xef\xbb\xbf') == 1
+    assert raw.count(b'a,b') == 1
+    assert read_rows(path) == [{'a': '1', 'b': '2'}, {'a': '3', 'b': '4'}]
+
+
+def test_csv_batch_writer_truncates_partial_batch_after_crash(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    writer = CsvBatchWriter(path, batch_size=2)
+    writer.write({'text': 'kept'})
+    writer.write({'text': 'kept too'})
+    # The process dies halfway through the next batch: no close(), sidecar left behind
+    writer._fh.write(b'half a ro')
+    writer._fh.flush()
+    assert os.path.exists(path + '.commit')
+
+    with CsvBatchWriter(path) as writer:
+        writer.write({'text': 'after restart'})
+
+    assert [row['text'] for row in read_rows(path)] == ['kept', 'kept too', 'after restart']
+
+
+def test_csv_batch_writer_recovers_crash_inside_first_batch(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    writer = CsvBatchWriter(path, batch_size=10)
+    writer._fh.write(b'\xef\xbb\xbftext\npartial')
+    writer._fh.flush()
+
+    with CsvBatchWriter(path) as writer:
+        writer.write({'text': 'fresh'})
+
+    assert read_rows(path) == [{'text': 'fresh'}]
+
+
+@needs_pyarrow
+def test_parquet_table_round_trip_with_projection(tmp_path):
+    path = str(tmp_path / 'table.parquet')
+    df = pd.DataFrame({'text': ['ক', 'খ', None], 'source': ['news', 'news', 'youtube'], 'n': [1, 2, 3]})
+    write_table(df, path)
+
+    assert table_columns(path) == ['text', 'source', 'n']
+    back = read_table(path, columns=['source', 'n'])
+    assert list(back.columns) == ['source', 'n']
+    assert back['source'].tolist() == ['news', 'news', 'youtube']
+    assert back['n'].tolist() == [1, 2, 3]
+    assert read_table(path)['text'].tolist()[:2] == ['ক', 'খ']
+
+
+@needs_pyarrow
+def test_iter_table_streams_parquet_in_chunks(tmp_path):
+    path = str(tmp_path / 'table.parquet')
+    with TableWriter(path) as writer:
+        for start in range(0, 10, 4):
+            writer.write(pd.DataFrame({'n': range(start, min(start + 4, 10))}))
+
+    chunks = list(iter_table(path, chunksize=3))
+
+    assert all(len(chunk) <= 3 for chunk in chunks)
+    assert pd.concat(chunks)['n'].tolist() == list(range(10))
+
+
+@needs_pyarrow
+def test_table_writer_widens_columns_when_a_later_chunk_does_not_fit(tmp_path):
+    path = str(tmp_path / 'table.parquet')
+    with TableWriter(path) as writer:
+        writer.write(pd.DataFrame({'likes': [1, 2], 'score': [3, 4]}))
+        writer.write(pd.DataFrame({'likes': ['1.2K'], 'score': [0.5]}))
+
+    schema = pq.read_schema(path)
+    assert schema.field('likes').type == pa.string()
+    assert schema.field('score').type == pa.float64()
+    back = read_table(path)
+    assert back['likes'].tolist() == ['1', '2', '1.2K']
+    assert back['score'].tolist() == [3.0, 4.0, 0.5]
+    assert not os.path.exists(path + '.widen')
+
+
+@needs_pyarrow
+def test_parquet_batch_writer_continues_part_numbering(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    with open_batch_writer(path, batch_size=2) as writer:
+        for i in range(3):
+            writer.write({'text': f't{i}', 'likes': i})
+    # A crash mid-write leaves only a temporary file, which the next writer drops
+    open(os.path.join(path, 'part-00099.parquet.tmp'), 'wb').close()
+    with open_batch_writer(path) as writer:
+        writer.write({'likes': 7, 'text': 't3'})
+
+    assert sorted(os.listdir(path)) == ['part-00000.parquet', 'part-00001.parquet', 'part-00002.parquet']
+    back = read_table(path)
+    assert back['text'].tolist() == ['t0', 't1', 't2', 't3']
+    assert back['likes'].tolist() == ['0', '1', '2', '7']
+
+
+
+def records(n):
+    return [{'id': i, 'text': f'অসমীয়া {i}'} for i in range(n)]
+
+
+def write_jsonl(path, rows, batch_size=7, **kwargs):
+    with JsonlWriter(path, batch_size=batch_size, **kwargs) as writer:
+        for row in rows:
+            writer.write(row)
+
+
+@pytest.mark.parametrize('suffix', CODECS)
+def test_jsonl_round_trip(tmp_path, suffix):
+    path = str(tmp_path / f'data.jsonl{suffix}')
+    write_jsonl(path, records(20))
+    write_jsonl(path, records(25)[20:])
+
+    assert list(iter_jsonl(path)) == records(25)
+
+
+@pytest.mark.parametrize('suffix', CODECS)
+def test_jsonl_index_random_access_and_ranges(tmp_path, suffix):
+    path = str(tmp_path / f'data.jsonl{suffix}')
+    write_jsonl(path, records(30))
+    index = JsonlIndex(path)
+
+    assert len(index) == 30
+    assert [index[n]['id'] for n in (0, 6, 7, 29)] == [0, 6, 7, 29]
+    assert [r['id'] for r in index.iter_range(5, 16)] == list(range(5, 16))
+    assert [r['id'] for r in iter_jsonl(path, start=25)] == list(range(25, 30))
+    assert list(index.iter_range(10, 10)) == []
+
+
+@pytest.mark.parametrize('suffix', CODECS)
+def test_jsonl_index_is_rebuilt_when_missing(tmp_path, suffix):
+    path = str(tmp_path / f'data.jsonl{suffix}')
+    write_jsonl(path, records(12), index=False)
+    assert not os.path.exists(path + '.idx')
+
+    index = JsonlIndex(path)
+
+    assert len(index) == 12
+    assert index[9]['id'] == 9
+
+
+@pytest.mark.parametrize('suffix', CODECS)
+def test_jsonl_split_covers_every_record_once(tmp_path, suffix):
+    path = str(tmp_path / f'data.jsonl{suffix}')
+    write_jsonl(path, records(100), batch_size=10)
+    index = JsonlIndex(path)
+
+    ranges = index.split(4)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == 100
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert [r['id'] for start, stop in ranges for r in index.iter_range(start, stop)] == list(range(100))
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from src.processing.filtering import filter_dataset, reject_reasons, row_thresholds, source_key
+from src.processing.linguistic import LinguisticValidator
+
+ASSAMESE = "অসমীয়া ভাষা ধুনীয়া"
+BENGALI = "আমার বাংলা ভাষা"
+# Roughly half Indic: passes the YouTube threshold, fails the news one
+MIXED = "অসমীয়া ভাষা hello world"
+
+
+def test_source_key_and_row_thresholds():
+    assert [source_key(s) for s in ('news_article', 'youtube_comment', 'News.csv', 'blog')] == \
+        ['news', 'youtube', 'news', 'blog']
+    assert row_thresholds(['news_article', 'youtube_comment', 'blog'], default=0.3).tolist() == [0.6, 0.4, 0.3]
+
+
+def test_reject_reasons_agree_with_is_assamese_script():
+    texts = [ASSAMESE, BENGALI, MIXED, "english", "", None, "১২৩ অসমীয়া"]
+    for threshold in (0.4, 0.6):
+        reasons, _ = reject_reasons(texts, threshold)
+        expected = [LinguisticValidator.is_assamese_script(t, threshold) if isinstance(t, str) else False
+                    for t in texts]
+        assert (reasons == '').tolist() == expected
+
+    reasons, ratios = reject_reasons(texts, 0.4)
+    assert reasons.tolist()[:6] == ['', 'bengali_characters', '', 'low_indic_ratio', 'empty', 'empty']
+    assert ratios[0] > 0.6 > ratios[2] > 0.4 > ratios[3]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_filter_dataset_uses_per_source_thresholds(tmp_path, workers):
+    source = tmp_path / 'corpus.csv'
+    df = pd.DataFrame({'processed_text': [ASSAMESE, MIXED, MIXED, BENGALI, ""],
+                       'source_type': ['news_article', 'news_article', 'youtube_comment', 'youtube_comment',
+                                       'youtube_comment']})
+    df.to_csv(source, index=False)
+    accepted_path, rejected_path = str(tmp_path / 'ok.csv'), str(tmp_path / 'rejected.csv')
+
+    summary = filter_dataset(str(source), accepted_path, rejected_path, chunksize=2, workers=workers)
+
+    accepted = pd.read_csv(accepted_path)
+    rejected = pd.read_csv(rejected_path, keep_default_na=False)
+    assert accepted['processed_text'].tolist() == [ASSAMESE, MIXED]
+    assert accepted['source_type'].tolist() == ['news_article', 'youtube_comment']
+    assert rejected['reject_reason'].tolist() == ['low_indic_ratio', 'bengali_characters', 'empty']
+    assert summary['reject_reasons'] == {'low_indic_ratio': 1, 'bengali_characters': 1, 'empty': 1}
+    assert summary['by_source'] == {'news': {'accepted': 1, 'rejected': 1},
+                                    'youtube': {'accepted': 1, 'rejected': 2}}
+
+
+def test_filter_dataset_thresholds_by_file_name_without_source_column(tmp_path):
+    source = tmp_path / 'news_articles.csv'
+    pd.DataFrame({'text': [ASSAMESE, MIXED]}).to_csv(source, index=False)
+
+    summary = filter_dataset(str(source), str(tmp_path / 'ok.csv'), workers=1,
+                             thresholds={'news': 0.3})
+
+    assert summary['accepted_count'] == 2
+    assert summary['by_source'] == {'news': {'accepted': 2, 'rejected': 0}}
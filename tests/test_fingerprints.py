@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.deduplication import deduplicate_files
+from src.processing.fingerprints import FingerprintSet, FirstOccurrences, text_fingerprints
+
+
+def random_fingerprints(n, distinct, bits=64, seed=0):
+    rng = np.random.RandomState(seed)
+    pool = text_fingerprints([f"text {i}" for i in range(distinct)], bits=bits)
+    return pool[rng.randint(0, distinct, size=n)]
+
+
+@pytest.mark.parametrize('bits', [64, 128])
+def test_fingerprint_set_keeps_first_occurrences_while_growing(bits):
+    fps = random_fingerprints(5000, 1500, bits=bits)
+    expected = ~pd.Series([tuple(row) for row in fps]).duplicated().to_numpy()
+    fingerprint_set = FingerprintSet(bits=bits, capacity=16)
+
+    kept = np.concatenate([fingerprint_set.add(fps[i:i + 700]) for i in range(0, len(fps), 700)])
+
+    assert (kept == expected).all()
+    assert len(fingerprint_set) == expected.sum()
+    assert fingerprint_set.contains(fps).all()
+    assert not fingerprint_set.contains(text_fingerprints(["never added"], bits=bits)).any()
+
+
+def test_text_fingerprints_treat_missing_values_alike():
+    fps = text_fingerprints(pd.Series(["a", None, np.nan, "a"]))
+
+    assert (fps[1] == fps[2]).all() and (fps[0] == fps[3]).all()
+    assert (fps != 0).any(axis=1).all()
+
+
+@pytest.mark.parametrize('bits', [64, 128])
+def test_spilled_first_occurrences_match_in_memory(tmp_path, bits):
+    fps = random_fingerprints(20_000, 4000, bits=bits, seed=1)
+    batches = [fps[i:i + 1000] for i in range(0, len(fps), 1000)]
+    in_memory = FirstOccurrences(bits=bits)
+    # A budget far below the set's size forces a spill after the first batches
+    spilling = FirstOccurrences(bits=bits, memory_bytes=64 * 1024, spill_dir=str(tmp_path), partitions=8)
+    for batch in batches:
+        in_memory.add(batch)
+        spilling.add(batch)
+
+    expected = in_memory.keep_mask()
+    assert spilling.spilled and not in_memory.spilled
+    assert (spilling.keep_mask() == expected).all()
+    assert expected.sum() == len(np.unique(fps, axis=0))
+    # Spill files are removed once resolved
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_deduplicate_files_keeps_first_occurrence_across_files(tmp_path):
+    first, second, output = tmp_path / 'a.csv', tmp_path / 'b.csv', tmp_path / 'out.csv'
+    pd.DataFrame({'processed_text': ['x', 'y', 'x', None], 'n': [0, 1, 2, 3]}).to_csv(first, index=False)
+    pd.DataFrame({'processed_text': ['y', 'z', None, 'z'], 'n': [4, 5, 6, 7]}).to_csv(second, index=False)
+
+    stats = deduplicate_files([str(first), str(second)], str(output), chunksize=3)
+
+    assert pd.read_csv(output)['n'].tolist() == [0, 1, 3, 5]
+    assert stats['removed_count'] == 4
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.processing.linguistic import LinguisticValidator
+
+TEXTS = [
+    "অসমীয়া ভাষা ব্ৰহ্মপুত্ৰ উপত্যকাৰ",
+    "বাংলা ভাষার বর্ণমালা",
+    "ধন্যবাদ",
+    "plain English text",
+    "mixed অসম text 😀 with emoji",
+    "",
+    "ৱ",
+    "😀😀😀",
+]
+
+
+@pytest.mark.parametrize('threshold', [0.1, 0.4, 0.6])
+def test_batch_matches_scalar(threshold):
+    expected = [LinguisticValidator.is_assamese_script(t, threshold=threshold) for t in TEXTS]
+
+    assert LinguisticValidator.is_assamese_script_batch(TEXTS, threshold=threshold).tolist() == expected
+
+
+def test_batch_stats_match_scalar_stats():
+    stats = LinguisticValidator.get_script_stats_batch(pd.Series(TEXTS))
+
+    for i, text in enumerate(TEXTS):
+        scalar = LinguisticValidator.get_script_stats(text)
+        assert stats['indic_ratio'][i] == pytest.approx(scalar['indic_ratio'])
+        assert stats['has_assamese_unique'][i] == scalar['has_assamese_unique']
+        assert stats['has_bengali_unique'][i] == scalar['has_bengali_unique']
+
+
+def test_non_strings_count_as_empty():
+    result = LinguisticValidator.is_assamese_script_batch(pd.Series([np.nan, None, "অসমীয়া"]), threshold=0.4)
+
+    assert result.tolist() == [False, False, True]
+
+
+def test_counts_do_not_leak_across_chunks(monkeypatch):
+    monkeypatch.setattr(LinguisticValidator, 'BATCH_CHUNK', 3)
+    texts = TEXTS * 5
+
+    expected = [LinguisticValidator.is_assamese_script(t, threshold=0.4) for t in texts]
+
+    assert LinguisticValidator.is_assamese_script_batch(texts, threshold=0.4).tolist() == expected
@@ -0,0 +1,38 @@
+from src.utils.manifest import JobManifest
+
+
+def test_staged_updates_are_durable_only_after_commit(tmp_path):
+    path = str(tmp_path / 'job.manifest')
+    manifest = JobManifest(path)
+    manifest.stage('v1', 'youtube', JobManifest.PARTIAL, 3)
+    assert manifest.get('v1') is None
+
+    manifest.commit()
+    manifest.conn.close()
+
+    entry = JobManifest(path).get('v1')
+    assert entry['status'] == JobManifest.PARTIAL
+    assert entry['record_count'] == 3
+
+
+def test_items_are_kept_until_target_is_done(tmp_path):
+    with JobManifest(str(tmp_path / 'job.manifest')) as manifest:
+        manifest.stage_items('v1', ['a', 'b'])
+        manifest.stage('v1', 'youtube', JobManifest.PARTIAL, 2)
+        manifest.commit()
+        assert manifest.seen_items('v1') == {'a', 'b'}
+
+        manifest.stage('v1', 'youtube', JobManifest.DONE, 2)
+        manifest.commit()
+        assert manifest.seen_items('v1') == set()
+        assert manifest.is_done('v1')
+
+
+def test_only_done_and_skipped_targets_are_final(tmp_path):
+    with JobManifest(str(tmp_path / 'job.manifest')) as manifest:
+        for target, status in [('d', JobManifest.DONE), ('s', JobManifest.SKIPPED),
+                               ('f', JobManifest.FAILED), ('p', JobManifest.PARTIAL)]:
+            manifest.stage(target, 'news', status, 0)
+        manifest.commit()
+
+        assert [t for t in 'dsfpx' if manifest.is_final(t)] == ['d', 's']
@@ -0,0 +1,113 @@
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from src.utils import metrics
+from src.utils.metrics import Metrics, peak_rss_bytes, profiled
+
+
+def test_counters_and_timings_are_thread_safe():
+    registry = Metrics()
+
+    def work():
+        for _ in range(1000):
+            registry.incr('fetch_total', host='a')
+            registry.observe('fetch_seconds', 0.001, host='a')
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = registry.summary()
+    assert summary['counters']['fetch_total'] == {'host=a': 4000}
+    assert summary['timings']['fetch_seconds']['host=a']['count'] == 4000
+
+
+def test_instrument_stage_excludes_time_blocked_on_input():
+    registry = Metrics()
+
+    def slow_source():
+        for i in range(3):
+            time.sleep(0.05)
+            yield [i] * 10
+
+    def passthrough(chunks):
+        for chunk in chunks:
+            yield chunk
+
+    out = list(registry.instrument_stage('clean', passthrough)(slow_source()))
+
+    assert len(out) == 3
+    stage = registry.summary()['stages']['clean']
+    assert stage['records'] == 30
+    assert stage['seconds'] < 0.05
+
+
+def test_summary_derives_records_per_second_from_stage_time():
+    registry = Metrics()
+    registry.observe('stage_seconds', 2.0, stage='filter')
+    registry.records('filter', 500)
+    registry.records('combine', 10)
+
+    stages = registry.summary()['stages']
+
+    assert stages['filter'] == {'seconds': 2.0, 'records': 500, 'records_per_sec': 250.0}
+    assert stages['combine'] == {'seconds': None, 'records': 10, 'records_per_sec': None}
+
+
+def test_prometheus_and_json_exports(tmp_path):
+    registry = Metrics()
+    registry.incr('records_rejected_total', 2, stage='validate', reason='low "ratio"')
+    registry.observe('fetch_seconds', 0.5, host='x')
+    registry.set_gauge('queue_depth', 4)
+
+    text = registry.prometheus_text()
+    registry.write_json(str(tmp_path / 'metrics.json'))
+
+    assert '# TYPE assamese_pipeline_records_rejected_total counter' in text
+    assert 'assamese_pipeline_records_rejected_total{reason="low \\"ratio\\"",stage="validate"} 2' in text
+    assert 'assamese_pipeline_fetch_seconds_count{host="x"} 1' in text
+    assert 'assamese_pipeline_fetch_seconds_max{host="x"} 0.5' in text
+    assert 'assamese_pipeline_queue_depth 4' in text
+    with open(tmp_path / 'metrics.json', encoding='utf-8') as f:
+        assert json.load(f)['gauges'] == {'queue_depth': {'all': 4}}
+
+
+@pytest.mark.skipif(metrics.resource is None, reason="no resource module on this platform")
+def test_peak_rss_reports_the_process_and_its_largest_child_separately():
+    # A child holding 200 MB is reported as the children peak, never added to this process's
+    subprocess.run([sys.executable, '-c', "x = bytearray(200 * 2**20); x[::4096] = b'1' * len(x[::4096])"],
+                   check=True)
+
+    rss = peak_rss_bytes()
+    summary = Metrics().summary()
+    text = Metrics().prometheus_text()
+
+    assert set(rss) == {'peak_rss_self', 'peak_rss_children_max'}
+    assert rss['peak_rss_children_max'] >= 200 * 2**20
+    assert summary['peak_rss_children_max_mb'] >= 200
+    assert summary['peak_rss_self_mb'] == pytest.approx(rss['peak_rss_self'] / 2**20, abs=1)
+    assert '# TYPE assamese_pipeline_peak_rss_self_bytes gauge' in text
+    assert '# TYPE assamese_pipeline_peak_rss_children_max_bytes gauge' in text
+
+
+def test_profiled_writes_both_profile_formats(tmp_path):
+    def busy():
+        return sum(i * i for i in range(200_000))
+
+    with profiled(str(tmp_path / 'run.prof')):
+        busy()
+    with profiled(str(tmp_path / 'run.folded'), mode='sample', interval=0.001):
+        worker = threading.Thread(target=lambda: [busy() for _ in range(5)], name='worker')
+        worker.start()
+        worker.join()
+
+    assert (tmp_path / 'run.prof').stat().st_size > 0
+    stacks = (tmp_path / 'run.folded').read_text(encoding='utf-8').splitlines()
+    assert any(line.startswith('worker;') for line in stacks)
@@ -0,0 +1,95 @@
+from collections import Counter
+
+from src.scrapers.news import NewsScraper
+from tests.conftest import ASSAMESE_PARAGRAPH, ENGLISH_HTML
+
+
+def make_scraper(**kwargs):
+    kwargs.setdefault('delay', 0.0)
+    kwargs.setdefault('respect_robots', False)
+    scraper = NewsScraper(**kwargs)
+    # No politeness pause between requests; the servers answer instantly
+    scraper.throttle.jitter = (0.0, 0.0)
+    return scraper
+
+
+def test_scrape_extracts_assamese_paragraphs(article_servers):
+    servers = article_servers()
+    url = f"{servers.base_urls[0]}/article/1"
+
+    articles = list(make_scraper().scrape(url))
+
+    assert len(articles) == 1
+    assert articles[0]['text'] == ASSAMESE_PARAGRAPH
+    assert articles[0]['source_url'] == url
+
+
+def test_scrape_many_yields_every_url_once(article_servers):
+    servers = article_servers(hosts=3)
+    urls = [f"{base}/article/{i}" for base in servers.base_urls for i in range(5)]
+
+    results = list(make_scraper(max_per_host=2).scrape_many(urls, max_workers=4))
+
+    assert Counter(url for url, _, _ in results) == Counter(urls)
+    assert all(len(articles) == 1 for _, articles, _ in results)
+    assert len(servers.log) == len(urls)
+
+
+def test_scrape_many_caps_requests_in_flight_per_host(article_servers):
+    servers = article_servers(hosts=2, latency=0.05)
+    urls = [f"{base}/article/{i}" for base in servers.base_urls for i in range(6)]
+
+    list(make_scraper(max_per_host=2).scrape_many(urls, max_workers=8))
+
+    # Enough workers to overrun a host, but each one sees at most two requests at a time
+    assert set(servers.max_in_flight.values()) == {2}
+
+
+def test_scrape_many_round_robins_across_hosts(article_servers):
+    servers = article_servers(hosts=3, latency=0.05)
+    # Grouped by host: a FIFO dispatcher would send the first host's URLs first
+    urls = [f"{base}/article/{i}" for base in servers.base_urls for i in range(4)]
+
+    list(make_scraper(max_per_host=2).scrape_many(urls, max_workers=3))
+
+    # Each host could take two of the three workers, yet the first wave covers all three
+    first = sorted(servers.log, key=lambda hit: hit.start)[:3]
+    assert {hit.port for hit in first} == set(servers.ports)
+
+
+def test_scrape_many_yields_skip_reasons(article_servers):
+    servers = article_servers()
+    servers.routes['/english'] = (200, ENGLISH_HTML, {})
+    base = servers.base_urls[0]
+    scraper = make_scraper()
+
+    results = {url: reason for url, _, reason in scraper.scrape_many([f"{base}/english", f"{base}/ok"])}
+
+    assert results == {f"{base}/english": 'no_assamese_text', f"{base}/ok": None}
+
+
+def test_scrape_page_returns_the_skip_reason_with_the_articles(article_servers):
+    servers = article_servers()
+    servers.routes['/english'] = (200, ENGLISH_HTML, {})
+    base = servers.base_urls[0]
+    scraper = make_scraper()
+
+    assert scraper.scrape_page(f"{base}/english") == ([], 'no_assamese_text')
+    articles, reason = scraper.scrape_page(f"{base}/ok")
+    assert len(articles) == 1 and reason is None
+    # scrape() keeps the BaseScraper contract and drops the reason
+    assert list(scraper.scrape(f"{base}/english")) == []
+
+
+def test_scrape_page_reports_robots_txt_skips(article_servers, no_jitter):
+    polite = article_servers()
+    polite.routes['/robots.txt'] = (200, b"User-agent: *\nDisallow: /private/\n", {})
+    down = article_servers()
+    down.routes['/robots.txt'] = (503, b'', {})
+    scraper = make_scraper(respect_robots=True, retries=0)
+
+    assert scraper.scrape_page(f"{polite.base_urls[0]}/private/1") == ([], 'robots_disallowed')
+    assert scraper.scrape_page(f"{down.base_urls[0]}/article") == ([], 'robots_unavailable')
+    assert len(scraper.scrape_page(f"{polite.base_urls[0]}/article")[0]) == 1
+    # Neither site saw a request for a page it did not allow
+    assert [hit.path for hit in polite.log + down.log if hit.path != '/robots.txt'] == ['/article']
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.parallel import ordered_map, pipeline
+
+
+def square(x):
+    return x * x
+
+
+def slow_square(x):
+    # Later items finish first, results must still come back in order
+    time.sleep(0.01 * (5 - x % 5))
+    return x * x
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_ordered_map_keeps_input_order(workers):
+    assert list(ordered_map(slow_square, range(12), workers=workers)) == [x * x for x in range(12)]
+
+
+def test_ordered_map_consumes_input_lazily():
+    pulled = []
+
+    def items():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    results = ordered_map(square, items(), workers=2, max_pending=3)
+    assert next(results) == 0
+    assert len(pulled) <= 4
+    results.close()
+
+
+def add(n):
+    def stage(items):
+        for item in items:
+            yield item + n
+    return stage
+
+
+def test_pipeline_chains_stages_in_order():
+    assert list(pipeline(range(50), [add(1), add(10)], queue_size=2)) == [i + 11 for i in range(50)]
+
+
+def test_pipeline_reraises_a_stage_error_and_stops_every_thread():
+    def explode(items):
+        for item in items:
+            if item == 5:
+                raise ValueError('bad record')
+            yield item
+
+    before = threading.active_count()
+    with pytest.raises(ValueError, match='bad record'):
+        list(pipeline(iter(range(10_000)), [add(1), explode, add(1)], queue_size=2))
+    assert threading.active_count() == before
+
+
+def test_closing_the_consumer_stops_upstream_stages():
+    produced = []
+
+    def source():
+        for i in range(10_000):
+            produced.append(i)
+            yield i
+
+    before = threading.active_count()
+    results = pipeline(source(), [add(1)], queue_size=2)
+    assert next(results) == 1
+    results.close()
+
+    assert threading.active_count() == before
+    # Bounded queues: the source got at most a few items ahead
+    assert len(produced) < 20
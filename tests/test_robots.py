@@ -0,0 +1,85 @@
+from src.scrapers.robots import RobotsCache, parse_crawl_delays
+
+AGENT = 'Mozilla/5.0 (Research Pipeline; Assamese Sentiment Project) requests/2.31'
+
+ROBOTS = """
+User-agent: BadBot
+Disallow: /
+
+User-agent: Mozilla
+User-agent: other
+Crawl-delay: 0.5
+Disallow: /private/
+
+User-agent: *
+Crawl-delay: 2  # seconds
+Request-rate: 1/10
+Disallow: /search
+"""
+
+
+class FakeFetch:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_parse_crawl_delays_groups_agents():
+    assert parse_crawl_delays(ROBOTS.splitlines()) == {'mozilla': 0.5, 'other': 0.5, '*': 2.0}
+
+
+def test_rules_apply_disallow_and_crawl_delay_of_the_matching_group():
+    fetch = FakeFetch((200, ROBOTS))
+    rules = RobotsCache(fetch, AGENT).rules('https://news.example/a')
+
+    assert not rules.can_fetch('https://news.example/private/x')
+    assert rules.can_fetch('https://news.example/search')
+    assert rules.crawl_delay == 0.5
+    assert not rules.unavailable
+
+
+def test_request_rate_counts_when_larger_than_crawl_delay():
+    rules = RobotsCache(FakeFetch((200, ROBOTS)), 'SomeCrawler/1.0').rules('https://news.example/')
+
+    assert not rules.can_fetch('https://news.example/search')
+    assert rules.crawl_delay == 10.0
+
+
+def test_rules_are_fetched_once_per_host():
+    fetch = FakeFetch((200, ROBOTS))
+    cache = RobotsCache(fetch, AGENT)
+
+    for path in ('/a', '/b', '/c'):
+        cache.rules(f'https://news.example{path}')
+    cache.rules('https://other.example/a')
+
+    assert fetch.calls == ['https://news.example/robots.txt', 'https://other.example/robots.txt']
+
+
+def test_missing_robots_allows_everything():
+    rules = RobotsCache(FakeFetch((404, '')), AGENT).rules('https://news.example/')
+
+    assert rules.can_fetch('https://news.example/anything')
+    assert not rules.unavailable
+
+
+def test_unavailable_robots_blocks_the_host_only_until_error_ttl():
+    fetch = FakeFetch(ConnectionError('refused'), (503, ''), (200, ROBOTS))
+    cache = RobotsCache(fetch, AGENT, error_ttl=0)
+
+    for _ in range(2):
+        rules = cache.rules('https://news.example/a')
+        assert rules.unavailable
+        assert not rules.can_fetch('https://news.example/a')
+
+    rules = cache.rules('https://news.example/a')
+    assert not rules.unavailable
+    assert rules.can_fetch('https://news.example/a')
+    assert len(fetch.calls) == 3
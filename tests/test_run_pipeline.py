@@ -0,0 +1,168 @@
+import csv
+import os
+import socket
+from functools import partial
+
+import pandas as pd
+import pytest
+
+from run_pipeline import run_news_extraction, run_scraping_job
+from src.processing.seen_index import SeenIndex
+from src.scrapers import youtube
+from src.utils.manifest import JobManifest
+from tests.conftest import ASSAMESE_PARAGRAPH, ENGLISH_HTML
+from tests.test_youtube import FakeDownloader, FakeScraper, youtube_scraper
+
+
+@pytest.fixture
+def news_site(article_servers, no_jitter):
+    servers = article_servers()
+    servers.routes['/robots.txt'] = (200, b"User-agent: *\nDisallow: /private/\n", {})
+    servers.routes['/english'] = (200, ENGLISH_HTML, {})
+    servers.routes['/gone'] = (404, b'', {})
+    return servers
+
+
+def scrape_news(urls, tmp_path, **kwargs):
+    output = str(tmp_path / 'news.csv')
+    manifest = str(tmp_path / 'news.manifest')
+    run_news_extraction(urls, output, workers=2, batch_size=10, manifest_path=manifest, cache=None,
+                        replay=False, delay=0.0, **kwargs)
+    rows = []
+    if os.path.exists(output) and os.path.getsize(output):
+        with open(output, encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+    return rows, JobManifest(manifest)
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_news_extraction_records_each_outcome_in_the_manifest(news_site, tmp_path):
+    base = news_site.base_urls[0]
+    urls = [f"{base}/article", f"{base}/private/article", f"{base}/english", f"{base}/gone"]
+
+    rows, manifest = scrape_news(urls, tmp_path)
+
+    assert [row['source_url'] for row in rows] == [f"{base}/article"]
+    assert [manifest.status(url) for url in urls] == [JobManifest.DONE, JobManifest.SKIPPED,
+                                                     JobManifest.SKIPPED, JobManifest.FAILED]
+
+
+def test_news_extraction_resumes_only_unfinished_urls(news_site, tmp_path):
+    base = news_site.base_urls[0]
+    urls = [f"{base}/article", f"{base}/english", f"{base}/gone"]
+    scrape_news(urls, tmp_path)
+    news_site.routes['/gone'] = news_site.routes.pop('/english')
+    fetched = len(news_site.log)
+
+    rows, manifest = scrape_news(urls, tmp_path)
+
+    # Only the failed URL is fetched again; done and skipped ones are final
+    assert [hit.path for hit in news_site.log[fetched:] if hit.path != '/robots.txt'] == ['/gone']
+    assert len(rows) == 1
+    assert manifest.status(f"{base}/gone") == JobManifest.SKIPPED
+
+
+def test_unavailable_robots_txt_leaves_urls_to_retry(news_site, tmp_path):
+    base = news_site.base_urls[0]
+    urls = [f"{base}/article", f"{base}/other"]
+    news_site.routes['/robots.txt'] = (503, b'', {})
+
+    rows, manifest = scrape_news(urls, tmp_path, retries=0)
+
+    assert rows == []
+    assert [manifest.status(url) for url in urls] == [JobManifest.FAILED, JobManifest.FAILED]
+
+    # robots.txt is back: the next run fetches both pages
+    news_site.routes['/robots.txt'] = (404, b'', {})
+    rows, manifest = scrape_news(urls, tmp_path, retries=0)
+
+    assert sorted(row['source_url'] for row in rows) == urls
+    assert [manifest.status(url) for url in urls] == [JobManifest.DONE, JobManifest.DONE]
+
+
+def test_unreachable_host_leaves_urls_to_retry(no_jitter, tmp_path):
+    base = f"http://127.0.0.1:{closed_port()}"
+    urls = [f"{base}/a", f"{base}/b"]
+
+    rows, manifest = scrape_news(urls, tmp_path, retries=0)
+
+    assert rows == []
+    assert [manifest.status(url) for url in urls] == [JobManifest.FAILED, JobManifest.FAILED]
+
+
+def fake_youtube(monkeypatch, comments):
+    harvest = partial(youtube.harvest_videos, scraper_factory=lambda: FakeScraper(comments))
+    monkeypatch.setattr(youtube, 'harvest_videos', harvest)
+
+
+def scrape_youtube(videos, tmp_path, name='comments', **kwargs):
+    seeds = tmp_path / f'{name}_seeds.csv'
+    pd.DataFrame({'Video Links': [f"https://www.youtube.com/watch?v={v}" for v in videos]}).to_csv(seeds, index=False)
+    output = tmp_path / f'{name}.csv'
+    run_scraping_job(str(seeds), str(output), **kwargs)
+    if not output.exists() or not output.stat().st_size:
+        return []
+    return pd.read_csv(output)['processed_text'].tolist()
+
+
+def test_capped_first_harvest_stays_partial_until_a_full_run(monkeypatch, tmp_path):
+    def downloader():
+        fake = FakeDownloader(12)
+        for i, comment in enumerate(fake.comments):
+            comment['text'] = f"{ASSAMESE_PARAGRAPH} {i}"
+        return fake
+    harvest = partial(youtube.harvest_videos, scraper_factory=lambda: youtube_scraper(downloader()))
+    monkeypatch.setattr(youtube, 'harvest_videos', harvest)
+    manifest_path = str(tmp_path / 'comments.manifest')
+
+    first = scrape_youtube(['v1'], tmp_path, manifest_path=manifest_path, max_comments=5)
+    manifest = JobManifest(manifest_path)
+    assert len(first) == 5
+    assert manifest.status('v1') == JobManifest.PARTIAL
+    assert manifest.watermark('v1') is None
+    manifest.close()
+
+    # Without the cap the video is finished, without writing the first five again
+    second = scrape_youtube(['v1'], tmp_path, manifest_path=manifest_path)
+    manifest = JobManifest(manifest_path)
+    assert len(second) == 12
+    assert len(set(second)) == 12
+    assert manifest.status('v1') == JobManifest.DONE
+    assert manifest.watermark('v1')['item_ids'][0] == 'youtube_c000000000'
+
+
+def test_rejected_comments_are_not_recorded_in_the_seen_index(monkeypatch, tmp_path):
+    seen = str(tmp_path / 'seen.db')
+    fake_youtube(monkeypatch, {'v1': [ASSAMESE_PARAGRAPH, "english only", ASSAMESE_PARAGRAPH],
+                               'v2': [ASSAMESE_PARAGRAPH, "english only"]})
+
+    first = scrape_youtube(['v1'], tmp_path, name='first', seen_index=seen)
+    second = scrape_youtube(['v2'], tmp_path, name='second', seen_index=seen)
+
+    assert first == [ASSAMESE_PARAGRAPH]
+    assert second == []
+    with SeenIndex(seen) as index:
+        assert len(index) == 1
+
+
+def test_rejected_news_articles_are_not_recorded_in_the_seen_index(news_site, tmp_path):
+    base = news_site.base_urls[0]
+    # Passes the scraper's paragraph filter, fails the stricter article threshold
+    mostly_latin = f"<p>অসমীয়া {'x' * 40}</p>".encode('utf-8')
+    news_site.routes['/mixed'] = (200, mostly_latin, {})
+    seen = str(tmp_path / 'seen.db')
+    output = str(tmp_path / 'news.csv')
+
+    run_news_extraction([f"{base}/mixed", f"{base}/article"], output, workers=1, batch_size=10,
+                        manifest_path=str(tmp_path / 'news.manifest'), cache=None, replay=False,
+                        delay=0.0, seen_index=seen)
+
+    assert pd.read_csv(output)['source_url'].tolist() == [f"{base}/article"]
+    with SeenIndex(seen) as index:
+        assert index.filter_new([ASSAMESE_PARAGRAPH]).tolist() == [False]
+        assert len(index) == 1
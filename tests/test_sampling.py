@@ -0,0 +1,70 @@
+from collections import Counter
+
+import pandas as pd
+
+from src.processing.sampling import sample_ids, stratified_sample
+
+
+def corpus(tmp_path, sizes=None):
+    sizes = sizes or {('news_article', 'Assam'): 50, ('youtube_comment', 'Music'): 5,
+                      ('youtube_comment', None): 20}
+    rows = [{'sentence_no_emoji': f"{source} {category} বাক্য {i}", 'source_type': source,
+             'channel_category': category}
+            for (source, category), n in sizes.items() for i in range(n)]
+    path = tmp_path / 'sentences.csv'
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+def test_draws_up_to_k_rows_per_stratum(tmp_path):
+    summary = stratified_sample([corpus(tmp_path)], str(tmp_path / 'sample.csv'), per_stratum=10, chunksize=7)
+
+    assert summary['strata'] == {
+        'news_article / Assam': {'population': 50, 'sampled': 10},
+        'youtube_comment / Music': {'population': 5, 'sampled': 5},
+        'youtube_comment / unknown': {'population': 20, 'sampled': 10},
+    }
+    sample = pd.read_csv(tmp_path / 'sample.csv')
+    assert len(sample) == 25
+    assert sample['sample_id'].is_unique
+    assert sample['sample_id'].tolist() == sample_ids(sample['sentence_no_emoji'])
+
+
+def test_sample_depends_only_on_seed_not_on_chunk_size(tmp_path):
+    path = corpus(tmp_path)
+
+    def draw(seed, chunksize):
+        out = str(tmp_path / f'sample-{seed}-{chunksize}.csv')
+        stratified_sample([path], out, per_stratum=4, seed=seed, chunksize=chunksize)
+        return pd.read_csv(out)['sample_id'].tolist()
+
+    assert draw(1, 3) == draw(1, 1000) == draw(1, 17)
+    assert draw(1, 3) != draw(2, 3)
+
+
+def test_excluded_ids_are_never_drawn(tmp_path):
+    path = corpus(tmp_path)
+    first = str(tmp_path / 'batch1.csv')
+    stratified_sample([path], first, per_stratum=10, seed=0)
+
+    summary = stratified_sample([path], str(tmp_path / 'batch2.csv'), per_stratum=10, seed=0, exclude=[first])
+
+    batch1 = set(pd.read_csv(first)['sample_id'])
+    batch2 = set(pd.read_csv(tmp_path / 'batch2.csv')['sample_id'])
+    assert not batch1 & batch2
+    assert summary['rows_excluded'] == 25
+    # The small stratum was taken whole the first time
+    assert 'youtube_comment / Music' not in summary['strata']
+
+
+def test_every_row_is_equally_likely(tmp_path):
+    path = corpus(tmp_path, {('news_article', 'Assam'): 20})
+    hits = Counter()
+    for seed in range(40):
+        out = str(tmp_path / 'sample.csv')
+        stratified_sample([path], out, per_stratum=5, seed=seed, chunksize=6)
+        hits.update(pd.read_csv(out)['sentence_no_emoji'])
+
+    # 10 expected draws per row
+    assert len(hits) == 20
+    assert all(2 <= n <= 20 for n in hits.values())
@@ -0,0 +1,47 @@
+from src.processing.seen_index import SeenIndex, normalize_key
+
+
+def test_filter_new_keeps_first_occurrence_and_stages_it(tmp_path):
+    with SeenIndex(str(tmp_path / 'seen.db')) as index:
+        assert index.filter_new(["ক খ", "গ", "ক  খ ", "", ""]).tolist() == [True, True, False, True, True]
+        # Staged texts already count within the run
+        assert index.filter_new(["গ", "ঘ"]).tolist() == [False, True]
+        assert len(index) == 3
+
+
+def test_texts_persist_across_runs_only_once_committed(tmp_path):
+    path = str(tmp_path / 'seen.db')
+    first = SeenIndex(path)
+    first.filter_new(["ক", "খ"])
+    first.commit()
+    first.filter_new(["গ"])
+    first.discard_staged()
+    first.close()
+
+    with SeenIndex(path) as second:
+        assert second.filter_new(["ক", "খ", "গ"]).tolist() == [False, False, True]
+
+
+def test_add_texts_skips_empty_texts(tmp_path):
+    with SeenIndex(str(tmp_path / 'seen.db')) as index:
+        index.add_texts(["ক", " ", None])
+        assert len(index) == 1
+
+
+def test_compact_forgets_old_entries(tmp_path):
+    with SeenIndex(str(tmp_path / 'seen.db')) as index:
+        index.filter_new(["ক", "খ"])
+        index.commit()
+        index.conn.execute("UPDATE seen SET added_at = 0")
+        index.conn.commit()
+        index.filter_new(["গ"])
+
+        stats = index.compact(max_age_days=1)
+
+        assert stats['removed'] == 2
+        assert len(index) == 1
+
+
+def test_normalize_key_collapses_whitespace():
+    assert normalize_key("  ক\n\tখ  ") == "ক খ"
+    assert normalize_key(None) == ""
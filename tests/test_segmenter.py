@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from src.processing import segmenter
+from src.processing.segmenter import count_batch, segment, split_batch, split_sentences
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("মই ভাত খাইছোঁ। তুমি খালানে?", ["মই ভাত খাইছোঁ।", "তুমি খালানে?"]),
+    ("কিয়??! বাৰু।।", ["কিয়??!", "বাৰু।।"]),
+    ("দাম ১২.৫ টকা. মূল্য 3.5 kg", ["দাম ১২.৫ টকা.", "মূল্য 3.5 kg"]),
+    ("see www.example.com/a.b now", ["see www.example.com/a.b now"]),
+    ("A. K. Sarma আহিল. তেওঁ গ'ল", ["A. K. Sarma আহিল.", "তেওঁ গ'ল"]),
+    ("ৰ'বা... চাওঁ… হয়", ["ৰ'বা... চাওঁ… হয়"]),
+    ('তেওঁ ক\'লে "আহা।" তাৰ পিছত (ঠিক।) শেষ', ['তেওঁ ক\'লে "আহা।"', 'তাৰ পিছত (ঠিক।)', 'শেষ']),
+    ("ভাল | বেয়া॥ মাজ", ["ভাল |", "বেয়া॥", "মাজ"]),
+    ("  ।  ... ?  ", []),
+    (" শেষ　", ["শেষ"]),
+    ("emoji 👍👍। next", ["emoji 👍👍।", "next"]),
+])
+def test_split_sentences(text, expected):
+    assert split_sentences(text) == expected
+
+
+def test_spans_index_into_the_original_text():
+    text = "  প্ৰথম।   দ্বিতীয়!  "
+    assert [text[s:e] for s, e in segment(text)] == ["প্ৰথম।", "দ্বিতীয়!"]
+
+
+def test_batches_keep_documents_apart():
+    texts = ["এক।", "", None, "দুই", "তিনি। চাৰি", "   "]
+
+    doc, sentences = split_batch(texts)
+
+    # No sentence runs across documents, even without a terminator at the end
+    assert doc.tolist() == [0, 3, 4, 4]
+    assert sentences == ["এক।", "দুই", "তিনি।", "চাৰি"]
+    assert count_batch(texts).tolist() == [1, 0, 0, 1, 2, 0]
+
+
+def test_batch_matches_one_document_at_a_time_across_chunk_boundaries(monkeypatch):
+    monkeypatch.setattr(segmenter, 'BATCH_CHUNK', 7)
+    rng = np.random.default_rng(0)
+    pieces = ["অসম", "ভাষা", "।", "?", "!", ".", " ", "  ", "3.5", "…", '"', ")", "A.", "", "👍"]
+    texts = ["".join(rng.choice(pieces, size=rng.integers(0, 12))) for _ in range(500)]
+
+    doc, sentences = split_batch(texts)
+
+    expected = [(i, s) for i, t in enumerate(texts) for s in split_sentences(t)]
+    assert list(zip(doc.tolist(), sentences)) == expected
+    assert count_batch(texts).tolist() == np.bincount(doc, minlength=len(texts)).tolist()
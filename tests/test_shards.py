@@ -0,0 +1,103 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from src.utils.shards import MANIFEST, ShardedCorpus, ShardWriter, export_shards
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def sentences(n):
+    return pd.DataFrame({'sentence_no_emoji': [f"বাক্য {i} " + "অ" * (i % 5) for i in range(n)],
+                         'source_type': ['news' if i % 3 else 'youtube' for i in range(n)],
+                         'n': range(n)})
+
+
+@pytest.mark.parametrize('meta_format', [
+    pytest.param('parquet', marks=pytest.mark.skipif(pyarrow is None, reason="pyarrow is not installed")), 'csv'])
+def test_round_trip_across_shard_and_chunk_boundaries(tmp_path, meta_format):
+    df = sentences(25)
+    with ShardWriter(str(tmp_path), shard_size=7, meta_format=meta_format) as writer:
+        for start in range(0, 25, 4):
+            writer.write(df.iloc[start:start + 4])
+
+    corpus = ShardedCorpus(str(tmp_path))
+
+    assert len(corpus) == 25
+    assert [shard['rows'] for shard in corpus.shards] == [7, 7, 7, 4]
+    assert list(corpus) == df['sentence_no_emoji'].tolist()
+    assert corpus[8] == df['sentence_no_emoji'][8]
+    assert corpus[-1] == df['sentence_no_emoji'][24]
+    assert corpus.get_batch([24, 0, 13, 13, -2]) == df['sentence_no_emoji'][[24, 0, 13, 13, 23]].tolist()
+    assert corpus.metadata(15) == {'source_type': df['source_type'][15], 'n': 15}
+    assert sorted(os.listdir(tmp_path)) == sorted([MANIFEST] + [name for shard in corpus.shards
+                                                                for name in shard['files'].values()])
+
+
+def test_out_of_range_indices_raise(tmp_path):
+    with ShardWriter(str(tmp_path), shard_size=4, meta_format='csv') as writer:
+        writer.write(sentences(5))
+    corpus = ShardedCorpus(str(tmp_path))
+
+    with pytest.raises(IndexError):
+        corpus[5]
+    with pytest.raises(IndexError):
+        corpus.get_batch([0, -6])
+
+
+def test_empty_texts_and_empty_corpus(tmp_path):
+    with ShardWriter(str(tmp_path / 'a'), shard_size=2, meta_format='csv') as writer:
+        writer.write(pd.DataFrame({'sentence_no_emoji': ['', None, 'ক']}))
+    with ShardWriter(str(tmp_path / 'b'), meta_format='csv'):
+        pass
+
+    assert list(ShardedCorpus(str(tmp_path / 'a'))) == ['', '', 'ক']
+    assert len(ShardedCorpus(str(tmp_path / 'b'))) == 0
+
+
+def test_corpus_pickles_without_its_maps(tmp_path):
+    with ShardWriter(str(tmp_path), shard_size=3, meta_format='csv') as writer:
+        writer.write(sentences(6))
+    corpus = ShardedCorpus(str(tmp_path))
+    corpus[4]
+
+    copy = pickle.loads(pickle.dumps(corpus))
+
+    assert copy._maps == {}
+    assert copy[4] == corpus[4]
+
+
+def test_export_replaces_a_previous_corpus(tmp_path):
+    source = tmp_path / 'sentences.csv'
+    out = str(tmp_path / 'shards')
+    sentences(10).to_csv(source, index=False)
+    export_shards([str(source)], out, shard_size=3, meta_format='csv', chunksize=4)
+    sentences(4).to_csv(source, index=False)
+
+    assert export_shards([str(source)], out, shard_size=3, columns=['n'], meta_format='csv') == 4
+
+    corpus = ShardedCorpus(out)
+    assert len(corpus.shards) == 2
+    assert corpus.metadata_columns == ['n']
+    assert sorted(name for name in os.listdir(out) if name.endswith('.txt')) == \
+        sorted(shard['files']['text'] for shard in corpus.shards)
+    assert list(corpus) == sentences(4)['sentence_no_emoji'].tolist()
+
+
+def test_export_failing_midway_keeps_the_previous_corpus(tmp_path):
+    with ShardWriter(str(tmp_path), shard_size=3, meta_format='csv') as writer:
+        writer.write(sentences(5))
+    before = sorted(os.listdir(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        with ShardWriter(str(tmp_path), shard_size=3, meta_format='csv') as writer:
+            writer.write(sentences(10))
+            raise RuntimeError("input went away")
+
+    assert sorted(os.listdir(tmp_path)) == before
+    assert list(ShardedCorpus(str(tmp_path))) == sentences(5)['sentence_no_emoji'].tolist()
@@ -0,0 +1,60 @@
+from collections import Counter
+
+import numpy as np
+
+from src.utils.sketches import CountMinSketch, HyperLogLog, SpaceSaving, hash_items
+
+
+def words(n, prefix='w'):
+    return np.array([f'{prefix}{i}' for i in range(n)], dtype=object)
+
+
+def test_hyperloglog_merge_matches_single_pass():
+    left, right, single = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    a, b = hash_items(words(30_000)), hash_items(words(30_000, prefix='v'))
+    left.add_hashes(a)
+    right.add_hashes(b)
+    single.add_hashes(np.concatenate([a, b]))
+
+    left.merge(right)
+
+    assert np.array_equal(left.registers, single.registers)
+    assert abs(left.count() - 60_000) / 60_000 < 0.03
+
+
+def test_count_min_never_undercounts_and_merges_by_adding():
+    items = words(5000)
+    counts = np.arange(1, 5001)
+    left, right = CountMinSketch(width=1 << 10), CountMinSketch(width=1 << 10)
+    left.add_hashes(hash_items(items), counts)
+    right.add_hashes(hash_items(items[:10]), np.full(10, 7))
+
+    left.merge(right)
+    estimates = left.estimate(hash_items(items))
+
+    expected = counts.copy()
+    expected[:10] += 7
+    assert np.all(estimates >= expected)
+
+
+def check_space_saving(summary, true_counts):
+    for item, count in summary.counts.items():
+        assert count <= true_counts[item] <= count + summary.error
+    for item, count in true_counts.items():
+        if count > summary.error:
+            assert item in summary.counts
+
+
+def test_space_saving_bounds_hold_across_updates_and_merges():
+    rng = np.random.default_rng(3)
+    batches = [Counter(f'w{i}' for i in rng.zipf(1.5, 300) if i < 200) for _ in range(20)]
+    parts = [SpaceSaving(capacity=20) for _ in range(4)]
+    for n, batch in enumerate(batches):
+        parts[n % 4].update(batch)
+
+    total = parts[0]
+    for part in parts[1:]:
+        total.merge(part)
+
+    assert len(total.counts) <= 20
+    check_space_saving(total, sum(batches, Counter()))
@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import HEAVY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports run_pipeline (no arguments) or runs its CLI, then prints the heavy modules it pulled in
+PROBE = f"""
+import json, os, runpy, sys
+args = sys.argv[1:]
+sys.path.insert(0, os.getcwd())
+sys.stdout = open(os.devnull, 'w')
+try:
+    if args:
+        sys.argv = ['run_pipeline.py'] + args
+        runpy.run_path('run_pipeline.py', run_name='__main__')
+    else:
+        import run_pipeline
+except SystemExit:
+    pass
+sys.stdout = sys.__stdout__
+print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))
+"""
+
+
+@pytest.mark.parametrize('args', [[], ['--help'], ['scrape', '--help'], ['run', '--help'], ['stats', '--help']])
+def test_start_up_loads_no_heavy_module(args):
+    out = subprocess.run([sys.executable, '-c', PROBE, *args], capture_output=True, text=True, check=True, cwd=ROOT)
+    assert json.loads(out.stdout) == []
@@ -0,0 +1,41 @@
+from collections import Counter
+
+import pandas as pd
+
+from src.utils.sketches import SpaceSaving
+from src.utils.stats import StatsPartial, generate_stats
+from tests.test_sketches import check_space_saving
+
+
+def chunk(texts, source='news'):
+    return pd.Series(texts), pd.Series([source] * len(texts))
+
+
+def test_approximate_stats_match_exact_ones(tmp_path):
+    path = tmp_path / 'corpus.csv'
+    texts = [f"অসমীয়া ভাষা {i % 7}। দ্বিতীয় বাক্য।" for i in range(300)]
+    pd.DataFrame({'processed_text': texts, 'source_type': ['news', 'youtube'] * 150}).to_csv(path, index=False)
+
+    exact = generate_stats([str(path)], chunksize=40, top_k=3)
+    approx = generate_stats([str(path)], chunksize=40, top_k=3, approximate=True)
+
+    for key in ('Total Documents', 'Total Words', 'Total Sentences (approx)', 'By Source', 'Top Words'):
+        assert approx[key] == exact[key]
+    assert approx['Vocabulary Size'] == exact['Vocabulary Size'] == 11
+
+
+def test_words_left_out_of_each_chunk_are_carried_into_the_error():
+    stats = StatsPartial(approximate=True)
+    stats.heavy = SpaceSaving(capacity=3)
+    true_counts = Counter()
+    for i in range(10):
+        # 'rare' never makes a chunk's top three, but adds up across chunks
+        texts = ["ক খ গ"] * 5 + [f"rare{i % 2} rare"]
+        true_counts.update(word for text in texts for word in text.split())
+        partial = StatsPartial(approximate=True)
+        partial.heavy = SpaceSaving(capacity=3)
+        partial.add_chunk(*chunk(texts))
+        stats.merge(partial)
+
+    check_space_saving(stats.heavy, true_counts)
+    assert stats.heavy.error >= true_counts['rare']
@@ -0,0 +1,77 @@
+import json
+
+import pandas as pd
+
+from run_pipeline import news_records, run_fused_pipeline
+from src.processing import streaming
+from src.processing.seen_index import SeenIndex
+from src.utils.file_io import read_table
+from tests.conftest import ASSAMESE_PARAGRAPH
+
+ASSAMESE = "অসমীয়া ভাষা ধুনীয়া। মই গান ভাল পাওঁ।"
+OTHER = "আজি বৰষুণ দিছে।"
+
+
+def test_batch_records_groups_dicts_and_passes_frames_through():
+    frame = pd.DataFrame({'text': ['x']})
+
+    chunks = list(streaming.batch_records([{'text': str(i)} for i in range(5)], batch_size=2))
+
+    assert [chunk['text'].tolist() for chunk in chunks] == [['0', '1'], ['2', '3'], ['4']]
+    assert next(streaming.batch_records([frame])) is frame
+
+
+def test_clean_validate_and_dedup_stages():
+    chunks = [pd.DataFrame({'text': [ASSAMESE, "plain english text here", ASSAMESE + "  "],
+                            'source_type': ['news', 'news', 'youtube_comment']}),
+              pd.DataFrame({'text': [ASSAMESE, OTHER], 'source_type': ['news', 'news']})]
+
+    out = list(streaming.dedup_stage(streaming.validate_stage(streaming.clean_stage(iter(chunks)))))
+
+    assert [chunk['processed_text'].tolist() for chunk in out] == [[ASSAMESE], [OTHER]]
+    assert all(chunk['is_assamese'].all() for chunk in out)
+
+
+def test_dedup_stage_drops_texts_seen_by_earlier_runs(tmp_path):
+    chunk = lambda: pd.DataFrame({'processed_text': [ASSAMESE, OTHER]})
+    with SeenIndex(str(tmp_path / 'seen.db')) as seen:
+        list(streaming.dedup_stage([chunk()], seen_index=seen))
+        seen.commit()
+    with SeenIndex(str(tmp_path / 'seen.db')) as seen:
+        assert list(streaming.dedup_stage([chunk()], seen_index=seen)) == []
+
+
+def test_fused_pipeline_from_files(tmp_path):
+    source = tmp_path / 'comments.csv'
+    pd.DataFrame({'text': [ASSAMESE, "only english words", ASSAMESE, OTHER, "মই গান ভাল পাওঁ।"],
+                  'source_type': ['youtube_comment'] * 5}).to_csv(source, index=False)
+    output = str(tmp_path / 'sentences.csv')
+    tapped = str(tmp_path / 'validated.csv')
+
+    stats = run_fused_pipeline('files', output, inputs=[str(source)], chunksize=2, batch_size=2, queue_size=1,
+                               taps={'validate': tapped}, stats_output=str(tmp_path / 'stats.json'))
+
+    sentences = read_table(output)
+    assert sentences['sentence_original'].tolist() == ["অসমীয়া ভাষা ধুনীয়া।", "মই গান ভাল পাওঁ।", OTHER]
+    assert set(sentences['source_type']) == {'social_media'}
+    # The tap sees validated rows before dedup
+    assert len(pd.read_csv(tapped)) == 4
+    assert stats['Total Documents'] == 3
+    with open(tmp_path / 'stats.json', encoding='utf-8') as f:
+        assert json.load(f) == json.loads(json.dumps(stats))
+
+
+def test_news_records_yields_one_record_per_article(article_servers, no_jitter, tmp_path):
+    servers = article_servers(hosts=2)
+    seeds = tmp_path / 'seeds.csv'
+    urls = [f"{base}/article" for base in servers.base_urls]
+    pd.DataFrame({'URL': urls}).to_csv(seeds, index=False)
+
+    records = list(news_records(str(seeds), workers=2))
+
+    assert sorted(record['source_url'] for record in records) == sorted(urls)
+    assert all(record['text'] == ASSAMESE_PARAGRAPH for record in records)
+
+
+def test_fused_pipeline_rejects_unknown_taps(tmp_path):
+    assert run_fused_pipeline('files', str(tmp_path / 'out.csv'), inputs=[], taps={'split': 'x.csv'}) is None
@@ -0,0 +1,91 @@
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+from src.scrapers.throttle import HostThrottle, host_of, parse_retry_after
+
+
+def test_host_of_lower_cases_the_netloc():
+    assert host_of('https://News.Example.com:8080/a?b=1') == 'news.example.com:8080'
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert 25 < parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(formatdate(time.time() - 30, usegmt=True)) == 0.0
+
+
+def test_reserve_spaces_requests_by_the_host_delay():
+    throttle = HostThrottle(delay=1.0, jitter=(0.0, 0.0))
+
+    waits = [throttle.reserve('a') for _ in range(3)]
+
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(1.0, abs=0.01)
+    assert waits[2] == pytest.approx(2.0, abs=0.01)
+    # Other hosts keep their own schedule
+    assert throttle.reserve('b') == 0.0
+
+
+def test_backoff_slows_down_and_success_recovers_to_the_floor():
+    throttle = HostThrottle(delay=1.0, min_delay=0.5, jitter=(0.0, 0.0), recovery=0.5, max_delay=3.0)
+
+    throttle.backoff('a')
+    assert throttle.current_delay('a') == 2.0
+    # A second failure within the current delay is the same signal, not a new one
+    throttle.backoff('a')
+    assert throttle.current_delay('a') == 2.0
+    throttle._last_backoff['a'] -= 10
+    throttle.backoff('a')
+    assert throttle.current_delay('a') == 3.0
+
+    for _ in range(5):
+        throttle.success('a')
+    assert throttle.current_delay('a') == 0.5
+
+
+def test_crawl_delay_raises_the_floor():
+    throttle = HostThrottle(delay=1.0, min_delay=0.1, jitter=(0.0, 0.0), recovery=0.1)
+
+    throttle.set_crawl_delay('a', 4.0)
+    assert throttle.current_delay('a') == 4.0
+    throttle.success('a')
+    assert throttle.current_delay('a') == 4.0
+    throttle.set_crawl_delay('a', None)
+    throttle.success('a')
+    assert throttle.current_delay('a') == 0.4
+
+
+def test_retry_after_holds_the_host_back_up_to_the_cap():
+    throttle = HostThrottle(delay=0.0, jitter=(0.0, 0.0), max_retry_after=30.0)
+
+    assert throttle.backoff('a', retry_after=10.0) == pytest.approx(10.0, abs=0.01)
+    assert throttle.reserve('a') == pytest.approx(10.0, abs=0.01)
+    assert throttle.backoff('b', retry_after=3600.0) == pytest.approx(30.0, abs=0.01)
+
+
+def test_slot_caps_requests_in_flight_per_host():
+    throttle = HostThrottle(delay=0.0, jitter=(0.0, 0.0), max_per_host=2)
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def request():
+        with throttle.slot('http://a/'):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
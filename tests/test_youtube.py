@@ -0,0 +1,213 @@
+import threading
+import time
+
+import pytest
+
+from src.scrapers import youtube
+from src.scrapers.youtube import harvest_videos
+
+
+class FakeScraper:
+    """
+    Stands in for YoutubeScraper: serves `comments[video_id]`, raising after
+    the first `fail_after[video_id]` comments on each of the first
+    `failures[video_id]` attempts.
+    """
+
+    def __init__(self, comments, failures=None, fail_after=None, latency=0.0, tracker=None):
+        self.comments = comments
+        self.failures = dict(failures or {})
+        self.fail_after = fail_after or {}
+        self.latency = latency
+        self.tracker = tracker
+        self.watermark = None
+        self.stop_reason = None
+
+    def scrape(self, video_id, raise_errors=False, since=None, max_comments=None, time_budget=None):
+        if self.tracker:
+            self.tracker.enter()
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            for i, text in enumerate(self.comments[video_id]):
+                if self.failures.get(video_id) and i == self.fail_after.get(video_id, 0):
+                    self.failures[video_id] -= 1
+                    raise ConnectionError(f"lost {video_id}")
+                yield {'text': text, 'source_item_id': f'youtube_{video_id}{i}'}
+        finally:
+            if self.tracker:
+                self.tracker.leave()
+        self.watermark = {'item_ids': [f'youtube_{video_id}0'], 'newest': None}
+        self.stop_reason = 'complete'
+
+
+class Tracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def leave(self):
+        with self.lock:
+            self.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    real_sleep = time.sleep
+    # Retry backoff sleeps 2**n seconds; FakeScraper latency still sleeps for real
+    monkeypatch.setattr(youtube.time, 'sleep', lambda s: real_sleep(min(s, 0.01)))
+
+
+def events(results):
+    by_event = {}
+    for event, job, payload in results:
+        by_event.setdefault(event, []).append((job['video_id'], payload))
+    return by_event
+
+
+def test_harvest_videos_yields_all_comments_and_one_done_per_video():
+    comments = {f'v{i}': [f'comment {i}.{j}' for j in range(3)] for i in range(5)}
+    jobs = [{'video_id': vid} for vid in comments]
+
+    result = events(harvest_videos(jobs, workers=3, scraper_factory=lambda: FakeScraper(comments)))
+
+    assert sorted(c['text'] for _, c in result['comment']) == sorted(t for ts in comments.values() for t in ts)
+    assert sorted(vid for vid, _ in result['done']) == sorted(comments)
+    assert all(count == 3 for _, count in result['done'])
+    assert all(job['stop_reason'] == 'complete' for job in jobs)
+
+
+def test_harvest_videos_runs_videos_concurrently():
+    comments = {f'v{i}': ['x'] for i in range(6)}
+    tracker = Tracker()
+    factory = lambda: FakeScraper(comments, latency=0.05, tracker=tracker)
+
+    list(harvest_videos([{'video_id': vid} for vid in comments], workers=3, scraper_factory=factory))
+
+    assert tracker.peak == 3
+
+
+def test_retry_skips_comments_yielded_by_the_failed_attempt():
+    comments = {'v1': ['a', 'b', 'c']}
+    factory = lambda: FakeScraper(comments, failures={'v1': 1}, fail_after={'v1': 2})
+
+    result = events(harvest_videos([{'video_id': 'v1'}], workers=1, max_failures=2, scraper_factory=factory))
+
+    assert [c['text'] for _, c in result['comment']] == ['a', 'b', 'c']
+    assert result['done'] == [('v1', 3)]
+
+
+def test_video_is_failed_once_its_budget_is_used_up():
+    comments = {'bad': ['a'], 'good': ['b']}
+    factory = lambda: FakeScraper(comments, failures={'bad': 10})
+
+    result = events(harvest_videos([{'video_id': 'bad'}, {'video_id': 'good'}], workers=2,
+                                   max_failures=2, scraper_factory=factory))
+
+    assert [vid for vid, _ in result['failed']] == ['bad']
+    assert isinstance(result['failed'][0][1], ConnectionError)
+    assert result['done'] == [('good', 1)]
+
+
+class FakeDownloader:
+    """Serves top-level comments c0 (newest) .. c{n-1}, `spacing` seconds apart, as the real downloader would."""
+
+    def __init__(self, n, now=1_700_000_000.0, spacing=3600):
+        self.comments = [{'cid': f'c{i:09d}', 'text': f'comment {i}', 'time_parsed': now - spacing * i,
+                          'reply': False} for i in range(n)]
+        self.fetched = 0
+
+    def get_comments_from_url(self, url, sort_by=None):
+        for comment in self.comments:
+            self.fetched += 1
+            yield dict(comment)
+
+
+def youtube_scraper(downloader):
+    scraper = youtube.YoutubeScraper()
+    scraper.downloader = downloader
+    return scraper
+
+
+def test_complete_harvest_stores_the_newest_comments_as_watermark():
+    # Six hours apart, so only the newest nine fall inside the slack window
+    scraper = youtube_scraper(FakeDownloader(30, spacing=6 * 3600))
+
+    comments = list(scraper.scrape('v1'))
+
+    assert len(comments) == 30
+    assert scraper.stop_reason == 'complete'
+    assert scraper.watermark['item_ids'] == [f'youtube_c{i:09d}' for i in range(youtube.WATERMARK_SIZE)]
+    assert scraper.watermark['newest'] == 1_700_000_000.0
+
+
+def test_watermark_keeps_every_comment_inside_the_slack_window():
+    first = youtube_scraper(FakeDownloader(30, spacing=600))
+    list(first.scrape('v1'))
+    assert len(first.watermark['item_ids']) == 30
+    downloader = FakeDownloader(30, spacing=600)
+    downloader.comments = [{'cid': f'n{i:09d}', 'text': f'new {i}', 'time_parsed': None, 'reply': False}
+                           for i in range(2)] + downloader.comments
+    scraper = youtube_scraper(downloader)
+
+    comments = list(scraper.scrape('v1', since=first.watermark, stop_after=100))
+
+    assert [c['text'] for c in comments] == ['new 0', 'new 1']
+    assert scraper.stop_reason == 'complete'
+
+
+def test_harvest_of_exactly_max_comments_is_complete():
+    scraper = youtube_scraper(FakeDownloader(5))
+
+    assert len(list(scraper.scrape('v1', max_comments=5))) == 5
+    assert scraper.stop_reason == 'complete'
+    assert scraper.watermark['newest'] == 1_700_000_000.0
+
+
+def test_capped_first_harvest_leaves_no_watermark():
+    scraper = youtube_scraper(FakeDownloader(30))
+
+    assert len(list(scraper.scrape('v1', max_comments=5))) == 5
+    assert scraper.stop_reason == 'max_comments'
+    assert scraper.watermark is None
+
+    list(scraper.scrape('v1', time_budget=-1))
+    assert scraper.stop_reason == 'time_budget'
+    assert scraper.watermark is None
+
+
+def test_delta_harvest_yields_only_new_comments_and_stops_early():
+    first = youtube_scraper(FakeDownloader(30))
+    list(first.scrape('v1'))
+    downloader = FakeDownloader(30)
+    # Three comments posted since
+    downloader.comments = [{'cid': f'n{i:09d}', 'text': f'new {i}', 'time_parsed': None, 'reply': False}
+                           for i in range(3)] + downloader.comments
+    scraper = youtube_scraper(downloader)
+
+    comments = list(scraper.scrape('v1', since=first.watermark))
+
+    assert [c['text'] for c in comments] == ['new 0', 'new 1', 'new 2']
+    assert scraper.stop_reason == 'caught_up'
+    assert downloader.fetched == 6
+    assert scraper.watermark['item_ids'][:4] == ['youtube_n000000000', 'youtube_n000000001',
+                                                 'youtube_n000000002', 'youtube_c000000000']
+
+
+def test_capped_delta_harvest_keeps_the_old_watermark():
+    first = youtube_scraper(FakeDownloader(30))
+    list(first.scrape('v1'))
+    downloader = FakeDownloader(30)
+    downloader.comments = [{'cid': f'n{i:09d}', 'text': f'new {i}', 'time_parsed': None, 'reply': False}
+                           for i in range(10)] + downloader.comments
+    scraper = youtube_scraper(downloader)
+
+    assert len(list(scraper.scrape('v1', since=first.watermark, max_comments=4))) == 4
+    assert scraper.stop_reason == 'max_comments'
+    assert scraper.watermark == first.watermark